@@ -1,13 +1,19 @@
 """
 (READ-ONLY file)
 
-Check that every repetition folder (rep-X) for each sign contains exactly 32 frame-XX.npy files.
+Check that every repetition folder (rep-X) for each sign contains exactly 32 frames
+(either one packed landmarks.npy of shape (32, 1662) or 32 legacy frame-XX.npy files).
 Reports any folders with missing or extra frames.
 """
 
 import os
+import sys
 from pathlib import Path
 
+# landmark file format is defined by the video-collector
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'video-collector'))
+from mod06_landmark_io import frame_count
+
 # Path to the newly reorganized data folder
 DATA_DIR = Path('../../data')
 
@@ -26,9 +32,8 @@ def check_frame_counts():
             if not rep_dir.is_dir() or not rep_dir.name.startswith('rep-'):
                 continue
             
-            # Find all .npy files in this rep folder
-            npy_files = list(rep_dir.glob('frame-*.npy'))
-            count = len(npy_files)
+            # Packed landmarks.npy (header only) or legacy frame-XX.npy files
+            count = frame_count(rep_dir)
             
             if count == 32:
                 print(f"  {rep_dir.name}: {count} frames -> OK")
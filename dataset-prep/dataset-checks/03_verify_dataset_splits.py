@@ -5,9 +5,17 @@ This script inspects the train/validation/test dataset splits and reports:
 - Total number of repetition folders in each split
 - Whether all expected signs are present in each split
 - Per-sign repetition counts for every split
+- Repetitions listed in more than one split, and listed repetitions whose folder is missing
+
+Splits are read from data/splits.json (step02_train_val_test_split.py), or from the physical
+data/train|validation|test folders of older trees.
 """
 
-import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from split_manifest import load_splits, split_rep_dirs
 
 # Post-Splitting dataset location at the root level
 DATA_ROOT = "../../data"
@@ -25,30 +33,36 @@ DEFAULT_SIGNS = ['assalomu_alaykum', 'bahor', 'birga', "bo'sh", 'bosh_kiyim', 'b
 
 
 print("\n=== DATASET SPLIT VERIFICATION (READ-ONLY) ===\n")
+manifest = load_splits(DATA_ROOT)
+if manifest is not None:
+    print(f"Source: {DATA_ROOT}/splits.json (seed={manifest['seed']}, ratios={manifest['ratios']})")
+else:
+    print(f"Source: {DATA_ROOT}/{{split}} folders (no splits.json)")
 
 total_reps_per_split = {}
 missing_signs = {split: [] for split in SPLITS}
+missing_folders = []
+seen_in = {}
 
 for split in SPLITS:
-    split_path = os.path.join(DATA_ROOT, split)
+    reps_per_sign = {}
+    for sign, rep_dir in split_rep_dirs(DATA_ROOT, split):
+        reps_per_sign[sign] = reps_per_sign.get(sign, 0) + 1
+        key = f"{sign}/{rep_dir.name}" if manifest is None else str(rep_dir)
+        seen_in.setdefault(key, []).append(split)
+        if manifest is not None and not rep_dir.is_dir():
+            missing_folders.append(rep_dir)
     total_reps = 0
 
     print(f"\n--- {split.upper()} ---")
 
     for sign in DEFAULT_SIGNS:
-        sign_path = os.path.join(split_path, sign)
-
-        if not os.path.isdir(sign_path):
+        if sign not in reps_per_sign:
             missing_signs[split].append(sign)
             print(f"  [MISSING] {sign}")
             continue
 
-        reps = [
-            d for d in os.listdir(sign_path)
-            if os.path.isdir(os.path.join(sign_path, d)) and d.startswith("rep-")
-        ]
-
-        rep_count = len(reps)
+        rep_count = reps_per_sign[sign]
         total_reps += rep_count
 
         print(f"  {sign:<25} -> {rep_count} reps")
@@ -67,4 +81,13 @@ for split in SPLITS:
         for sign in missing_signs[split]:
             print(f"    - {sign}")
 
+overlap = {key: splits for key, splits in seen_in.items() if len(splits) > 1}
+print(f"\nRepetitions in more than one split: {len(overlap)}")
+for key, splits in sorted(overlap.items()):
+    print(f"    - {key}: {', '.join(splits)}")
+if manifest is not None:
+    print(f"Listed repetitions without a folder: {len(missing_folders)}")
+    for rep_dir in missing_folders:
+        print(f"    - {rep_dir}")
+
 print("\nVerification completed. No files were modified.")
@@ -2,13 +2,21 @@
 (READ-ONLY file)
 
 This script scans all dataset splits (train, validation, test), signs, and repetitions,
-and counts the number of frame-XX.npy files in each rep-XX folder.
-It prints the counts for all folders and flags any rep-XX that do not contain exactly 32 files.
+and counts the number of frames in each rep-XX folder (packed landmarks.npy or legacy frame-XX.npy files).
+It prints the counts for all folders and flags any rep-XX that do not contain exactly 32 frames.
+The repetitions of each split come from data/splits.json, or from the data/{split} folders of older trees.
 """
 
 import os
+import sys
 from pathlib import Path
 
+# landmark file format is defined by the video-collector
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'video-collector'))
+from mod06_landmark_io import frame_count
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from split_manifest import split_rep_dirs
+
 # Post-Splitting dataset location at the root level
 DATA_DIR = Path('../../data')
 
@@ -20,26 +28,23 @@ def check_frame_counts():
     all_good = True
     
     for split in SPLITS:
-        split_dir = DATA_DIR / split
-        if not split_dir.exists():
-            print(f"Warning: Split folder not found: {split_dir}")
+        reps = split_rep_dirs(DATA_DIR, split)
+        if not reps:
+            print(f"Warning: No repetitions found for split: {split}")
             continue
         
         print(f"\nSplit: {split}")
         
-        for sign_dir in sorted(split_dir.iterdir()):
-            if not sign_dir.is_dir():
-                continue
-            
-            print(f" Sign: {sign_dir.name}")
+        by_sign = {}
+        for sign, rep_dir in reps:
+            by_sign.setdefault(sign, []).append(rep_dir)
+        
+        for sign in sorted(by_sign):
+            print(f" Sign: {sign}")
             
-            for rep_dir in sorted(sign_dir.iterdir()):
-                if not rep_dir.is_dir() or not rep_dir.name.startswith('rep-'):
-                    continue
-                
-                # Find all .npy files in this rep folder
-                npy_files = list(rep_dir.glob('frame-*.npy'))
-                count = len(npy_files)
+            for rep_dir in by_sign[sign]:
+                # Packed landmarks.npy (header only) or legacy frame-XX.npy files
+                count = frame_count(rep_dir)
                 
                 if count == 32:
                     print(f"  {rep_dir.name}: {count} frames -> OK")
@@ -0,0 +1,66 @@
+"""
+(READ-ONLY file)
+
+This script computes the summary statistics of the EDA notebook (01_ak_exploratory_analysis.ipynb,
+section 3.3) for the whole dataset: per part (face, pose, right/left hand) and per axis
+median/mean/std/min/max, NaN/Inf counts, and how often the face or a hand was not detected.
+
+The landmarks are streamed through uzslr.stats in fixed-size accumulators, so memory stays
+constant however large the dataset is, and the repetitions are spread over worker processes.
+The repetitions of each split come from data/splits.json, or from the data/{split} folders of older trees.
+
+Usage:
+    python 05_dataset_statistics.py                          # all splits together
+    python 05_dataset_statistics.py --split train --detected-only
+    python 05_dataset_statistics.py --json stats.json        # + per split and per landmark values
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'preprocessing'))
+from split_manifest import SPLITS, split_rep_dirs
+from uzslr.stats import compute_stats, format_summary
+
+# Post-Splitting dataset location at the root level
+DATA_DIR = Path('../../data')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming landmark statistics of the dataset splits.")
+    parser.add_argument("--split", choices=SPLITS, action="append", help="only these splits (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--detected-only", action="store_true",
+                        help="leave undetected (all-zero) face / hands out of the value statistics")
+    parser.add_argument("--json", default=None, help="also write the statistics to this JSON file")
+    args = parser.parse_args()
+
+    if not DATA_DIR.exists():
+        print(f"Error: '{DATA_DIR}' folder not found.")
+        sys.exit(1)
+
+    total, per_split = None, {}
+    for split in args.split or SPLITS:
+        reps = [rep_dir for _, rep_dir in split_rep_dirs(DATA_DIR, split)]
+        if not reps:
+            print(f"Warning: No repetitions found for split: {split}")
+            continue
+        stats = compute_stats(reps, workers=args.workers, detected_only=args.detected_only)
+        per_split[split] = stats.summary()
+        print(f"{split}: {stats.reps} reps, {stats.frames} frames")
+        if total is None:
+            total = stats
+        else:
+            total.merge(stats)
+
+    if total is None:
+        sys.exit(1)
+    print("\n" + format_summary(total.summary()))
+
+    if args.json:
+        out = {"all": total.summary(), "splits": per_split, "per_landmark": total.per_landmark()}
+        Path(args.json).write_text(json.dumps(out, indent=1))
+        print(f"\nStatistics written: {Path(args.json).resolve()}")
@@ -0,0 +1,140 @@
+"""
+Split manifest: which repetitions of the pre-split data/{sign}/rep-XX tree belong to which split.
+
+    data/splits.json -> {"seed": 42, "ratios": {"train": 0.8, ...}, "folds": null,
+                         "splits": {"train": ["bahor/rep-3", ...], "validation": [...], "test": [...]}}
+
+Written by step02_train_val_test_split.py instead of copying every rep folder into
+data/{split}/: a re-split (other seed, other ratios, k folds) only rewrites this file.
+A rep ID is the rep folder relative to data/: "{sign}/rep-XX" (the same string as the
+provenance in reps.npy of the shards), or "{split}/{sign}/rep-XX" for a manifest recorded
+from an existing physical split (--from-folders).
+
+Readers go through `split_rep_dirs()`, which falls back to physical data/{split}/ folders
+when there is no manifest, so older trees keep working. Standard library only, it is
+imported by dataset-prep, dataset-checks and preprocessing/uzslr.
+"""
+
+import json
+import os
+import random
+from pathlib import Path
+from typing import Optional
+
+SPLIT_MANIFEST = "splits.json"
+SPLITS = ["train", "validation", "test"]
+RATIOS = (0.8, 0.1, 0.1)
+RANDOM_SEED = 42
+
+
+def manifest_path(data_root, name: str = SPLIT_MANIFEST) -> Path:
+    return Path(data_root) / name
+
+def rep_sign(rep_id: str) -> str:
+    return rep_id.split("/")[-2]
+
+def rep_sort_key(rep_id: str):
+    """'{sign}/rep-12' -> ('{sign}', 12), so rep-2 comes before rep-10."""
+    parent, rep = rep_id.rsplit("/", 1)
+    num = rep[4:]
+    return (parent, int(num) if num.isdigit() else -1, rep)
+
+def list_reps(sign_dir) -> list[str]:
+    return [d for d in os.listdir(sign_dir) if os.path.isdir(os.path.join(sign_dir, d)) and d.startswith("rep-")]
+
+
+# 1. Build
+def make_splits(data_root, signs, seed: int = RANDOM_SEED, ratios=RATIOS) -> dict:
+    """
+    Stratified per-sign split, same procedure as the original copying step02: one
+    random.Random(seed) shuffles the reps of every sign in `signs` order, the first
+    int(ratios[0] * n) go to train, the next int(ratios[1] * n) to validation, the rest to test.
+    """
+    rng = random.Random(seed)
+    splits = {split: [] for split in SPLITS}
+    for sign in signs:
+        sign_dir = Path(data_root) / sign
+        if not sign_dir.is_dir():
+            continue
+        reps = list_reps(sign_dir)
+        rng.shuffle(reps)
+        n_train, n_val = int(ratios[0] * len(reps)), int(ratios[1] * len(reps))
+        for split, chunk in zip(SPLITS, (reps[:n_train], reps[n_train:n_train + n_val], reps[n_train + n_val:])):
+            splits[split] += [f"{sign}/{rep}" for rep in chunk]
+    return _manifest(splits, seed=seed, ratios=ratios)
+
+def make_folds(manifest: dict, k: int, seed: int = RANDOM_SEED) -> list[dict]:
+    """
+    k-fold cross-validation on top of an existing split: test stays as it is, train +
+    validation are pooled and dealt per sign into k folds; fold i is the validation set of
+    the i-th returned manifest.
+    """
+    rng = random.Random(seed)
+    pooled = {}
+    for rep_id in sorted(manifest["splits"]["train"] + manifest["splits"]["validation"], key=rep_sort_key):
+        pooled.setdefault(rep_sign(rep_id), []).append(rep_id)
+
+    folds = [[] for _ in range(k)]
+    n = 0   # keeps dealing where the previous sign stopped, so fold sizes differ by at most one
+    for reps in pooled.values():
+        rng.shuffle(reps)
+        for rep_id in reps:
+            folds[n % k].append(rep_id)
+            n += 1
+
+    return [_manifest({"train": [r for j, f in enumerate(folds) if j != i for r in f],
+                       "validation": folds[i],
+                       "test": list(manifest["splits"]["test"])},
+                      seed=seed, ratios=manifest.get("ratios"), folds={"k": k, "fold": i})
+            for i in range(k)]
+
+def splits_from_folders(data_root) -> dict:
+    """Record an existing physical data/{split}/{sign}/rep-XX layout as a manifest."""
+    splits = {split: [] for split in SPLITS}
+    for split in SPLITS:
+        split_dir = Path(data_root) / split
+        if not split_dir.is_dir():
+            continue
+        for sign_dir in split_dir.iterdir():
+            if sign_dir.is_dir():
+                splits[split] += [f"{split}/{sign_dir.name}/{rep}" for rep in list_reps(sign_dir)]
+    return _manifest(splits, seed=None, ratios=None)
+
+def _manifest(splits: dict, seed, ratios, folds=None) -> dict:
+    return {
+        "seed": seed,
+        "ratios": dict(zip(SPLITS, ratios)) if isinstance(ratios, (list, tuple)) else ratios,
+        "folds": folds,
+        "splits": {split: sorted(reps, key=rep_sort_key) for split, reps in splits.items()},
+    }
+
+
+# 2. Read / write
+def save_splits(data_root, manifest: dict, name: str = SPLIT_MANIFEST) -> Path:
+    p = manifest_path(data_root, name)
+    tmp = p.with_name(p.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2))
+    os.replace(tmp, p)
+    return p
+
+def load_splits(data_root, name: str = SPLIT_MANIFEST) -> Optional[dict]:
+    p = manifest_path(data_root, name)
+    return json.loads(p.read_text()) if p.is_file() else None
+
+def split_rep_dirs(data_root, split: str, name: str = SPLIT_MANIFEST) -> list[tuple[str, Path]]:
+    """
+    [(sign, rep_dir)] of one split: from the manifest if data_root/{name} exists,
+    otherwise from the physical data_root/{split}/{sign}/rep-XX folders.
+    """
+    manifest = load_splits(data_root, name)
+    if manifest is None and name != SPLIT_MANIFEST:
+        raise FileNotFoundError(f"Split manifest not found: {manifest_path(data_root, name)}")
+    if manifest is not None:
+        return [(rep_sign(rep_id), Path(data_root) / rep_id) for rep_id in manifest["splits"][split]]
+
+    split_dir = Path(data_root) / split
+    if not split_dir.is_dir():
+        return []
+    return [(sign_dir.name, sign_dir / rep)
+            for sign_dir in sorted(split_dir.iterdir()) if sign_dir.is_dir()
+            for rep in sorted(list_reps(sign_dir), key=lambda r: rep_sort_key(f"{sign_dir.name}/{r}"))]
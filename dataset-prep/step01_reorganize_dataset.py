@@ -10,10 +10,30 @@ into a new clean structure: data/{sign}/rep-1/, rep-2/, ...
 - Renames folders sequentially (rep-1, rep-2, ...) to prevent conflicts
 - Ignores 'videos/' folders entirely
 - Prints progress and a summary of repetitions per sign
+
+Default mode (incremental, parallel):
+- data/reorganize_journal.json records every data/{sign}/rep-N with its source folder, signer and
+  file signature (name, size, mtime). Re-runs only process new or changed source reps; new reps
+  get the next free number of their sign, so existing rep IDs (and data/splits.json) stay valid.
+- Files are reflinked (copy-on-write clone) or hardlinked where the filesystem allows, and
+  copied otherwise (--link). The recorder replaces landmark files instead of writing into them,
+  so a hardlinked copy never changes behind the journal's back.
+- A thread pool materializes the reps (--workers); each rep is built in a temporary folder and
+  renamed into place, and the journal is saved every few hundred reps, so an interrupted run
+  can simply be started again.
+
+    python step01_reorganize_dataset.py                  # incremental
+    python step01_reorganize_dataset.py --link copy      # always real copies
+    python step01_reorganize_dataset.py --sequential     # original one-shot copy, no journal
 """
 
+import argparse
+import json
 import os
 import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # 50 default signs
@@ -26,12 +46,18 @@ DEFAULT_SIGNS = ['assalomu_alaykum', 'bahor', 'birga', "bo'sh", 'bosh_kiyim', 'b
                'turish', "yomg'ir", 'yopish', 'yordam_berish']
 
 
+# Original dataset location / new dataset location at the root level
+SOURCE_ROOT = Path('../video-collector/Data_Numpy_Arrays_RSL_UzSL')
+TARGET_ROOT = Path('../data')
+
+JOURNAL_NAME = 'reorganize_journal.json'
+JOURNAL_SAVE_EVERY = 200   # reps
+
+
+# 1. Original one-shot copy (--sequential)
 def copy_and_reorganize_dataset():
-    # Original dataset location
-    base_path = Path('../video-collector/Data_Numpy_Arrays_RSL_UzSL')
-    
-    # New dataset location at the root level
-    target_base = Path('../data')
+    base_path = SOURCE_ROOT
+    target_base = TARGET_ROOT
     target_base.mkdir(exist_ok=True)
     
     # Counter to assign unique rep numbers per sign (starting from 1)
@@ -89,6 +115,206 @@ def copy_and_reorganize_dataset():
         else:
             print(f"  {sign}: 0 repetitions (warning: missing?)")
 
+# 2. Incremental, parallel reorganization
+def rep_signature(rep_dir: Path) -> list:
+    """[[relative path, size, mtime_ns], ...] of every file in a repetition folder."""
+    sig = []
+    for root, _, files in os.walk(rep_dir):
+        for name in files:
+            if name.endswith('.tmp'):
+                continue
+            p = Path(root) / name
+            st = p.stat()
+            sig.append([p.relative_to(rep_dir).as_posix(), st.st_size, st.st_mtime_ns])
+    return sorted(sig)
+
+
+_unsupported = set()   # link methods that already failed once in this run (other filesystem, ...)
+
+def _reflink(src: Path, dst: Path):
+    """Copy-on-write clone (btrfs, XFS, ...); raises OSError where it is not available."""
+    if not sys.platform.startswith('linux'):
+        raise OSError("reflink is only attempted on Linux")
+    import fcntl
+    FICLONE = 0x40049409
+    with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+        try:
+            fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+        except OSError:
+            fd.close()
+            dst.unlink()
+            raise
+
+def link_or_copy(src: Path, dst: Path, mode: str) -> str:
+    """Materialize one file; returns the method that worked ('reflink', 'hardlink' or 'copy')."""
+    attempts = {'auto': ('reflink', 'hardlink'), 'reflink': ('reflink',), 'hardlink': ('hardlink',)}.get(mode, ())
+    for method in attempts:
+        if method in _unsupported:
+            continue
+        try:
+            if method == 'reflink':
+                _reflink(src, dst)
+            else:
+                os.link(src, dst)
+            return method
+        except OSError:
+            _unsupported.add(method)
+    shutil.copy2(src, dst)
+    return 'copy'
+
+def staging_dir(dst_dir: Path) -> Path:
+    """Where dst_dir is built: data/{sign}/.rep-N.tmp, a name no 'rep-' reader picks up."""
+    return dst_dir.with_name('.' + dst_dir.name + '.tmp')
+
+def remove_stale_staging(target_base: Path) -> int:
+    """Delete the staging folders left by an interrupted run; returns how many."""
+    removed = 0
+    for sign_dir in target_base.iterdir():
+        if not sign_dir.is_dir():
+            continue
+        for d in sign_dir.iterdir():
+            # also the rep-N.tmp folders of older runs, which were staged without the dot
+            if d.is_dir() and d.name.endswith('.tmp') and d.name.lstrip('.').startswith('rep-'):
+                shutil.rmtree(d)
+                removed += 1
+    return removed
+
+def materialize_rep(src_dir: Path, dst_dir: Path, mode: str) -> str:
+    """Build dst_dir next to its final place and rename it in, replacing an older version."""
+    tmp = staging_dir(dst_dir)
+    shutil.rmtree(tmp, ignore_errors=True)
+    methods = set()
+    for root, _, files in os.walk(src_dir):
+        out = tmp / Path(root).relative_to(src_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        for name in files:
+            if not name.endswith('.tmp'):
+                methods.add(link_or_copy(Path(root) / name, out / name, mode))
+    tmp.mkdir(parents=True, exist_ok=True)   # empty source folder
+    if dst_dir.exists():
+        shutil.rmtree(dst_dir)
+    os.rename(tmp, dst_dir)
+    return '+'.join(sorted(methods)) or 'empty'
+
+
+def load_journal(target_base: Path) -> dict:
+    p = target_base / JOURNAL_NAME
+    if p.exists():
+        return json.loads(p.read_text())
+    return {"source_root": str(SOURCE_ROOT), "reps": {}}
+
+def save_journal(target_base: Path, journal: dict):
+    p = target_base / JOURNAL_NAME
+    tmp = p.with_name(p.name + '.tmp')
+    tmp.write_text(json.dumps(journal, ensure_ascii=False, indent=1))
+    os.replace(tmp, p)
+
+
+def source_reps(base_path: Path):
+    """(sign, signer, rep_dir) in the order the original copy numbers them."""
+    for signer_dir in sorted(base_path.iterdir()):
+        if not signer_dir.is_dir() or not signer_dir.name.startswith('signer'):
+            continue
+        for sign_dir in sorted(signer_dir.iterdir()):
+            if not sign_dir.is_dir() or sign_dir.name not in DEFAULT_SIGNS:
+                continue
+            landmarks_dir = sign_dir / 'landmarks'
+            if not landmarks_dir.exists():
+                print(f"  Warning: No landmarks folder found for {sign_dir.name} in {signer_dir.name}")
+                continue
+            for rep_dir in sorted(landmarks_dir.iterdir()):
+                if rep_dir.is_dir() and rep_dir.name.startswith('rep-'):
+                    yield sign_dir.name, signer_dir.name, rep_dir
+
+
+def plan_jobs(base_path: Path, target_base: Path, journal: dict):
+    """
+    Decide what to do with every source rep.
+    Returns (jobs, n_unchanged, missing): jobs are (target_id, entry) to (re)materialize,
+    missing are journal entries whose source folder no longer exists.
+    """
+    by_source = {entry["source"]: target_id for target_id, entry in journal["reps"].items()}
+    next_num = {sign: 0 for sign in DEFAULT_SIGNS}
+    for target_id in journal["reps"]:
+        sign, rep = target_id.rsplit('/', 1)
+        next_num[sign] = max(next_num[sign], int(rep[4:]))
+
+    jobs, n_unchanged, seen = [], 0, set()
+    for sign, signer, rep_dir in source_reps(base_path):
+        source = rep_dir.relative_to(base_path).as_posix()
+        seen.add(source)
+        signature = rep_signature(rep_dir)
+        target_id = by_source.get(source)
+        if target_id is None:
+            next_num[sign] += 1
+            target_id = f"{sign}/rep-{next_num[sign]}"
+        elif journal["reps"][target_id]["files"] == signature and (target_base / target_id).is_dir():
+            n_unchanged += 1
+            continue
+        jobs.append((target_id, {"source": source, "signer": signer, "source_rep": rep_dir.name,
+                                 "files": signature}))
+
+    missing = [target_id for target_id, entry in journal["reps"].items() if entry["source"] not in seen]
+    return jobs, n_unchanged, missing
+
+
+def reorganize_incremental(workers=None, mode='auto', verbose=False):
+    base_path, target_base = SOURCE_ROOT, TARGET_ROOT
+    target_base.mkdir(exist_ok=True)
+    t = time.perf_counter()
+
+    stale = remove_stale_staging(target_base)
+    if stale:
+        print(f"Removed {stale} staging folders left by an interrupted run.")
+    journal = load_journal(target_base)
+    jobs, n_unchanged, missing = plan_jobs(base_path, target_base, journal)
+    print(f"{len(jobs)} new or changed reps, {n_unchanged} unchanged, "
+          f"{len(missing)} in the journal without a source folder.\n")
+
+    methods = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(materialize_rep, base_path / entry["source"], target_base / target_id, mode):
+                   (target_id, entry) for target_id, entry in jobs}
+        for i, fut in enumerate(as_completed(futures), 1):
+            target_id, entry = futures[fut]
+            entry["method"] = fut.result()
+            journal["reps"][target_id] = entry
+            methods[entry["method"]] = methods.get(entry["method"], 0) + 1
+            if verbose:
+                print(f"  {entry['source']} -> data/{target_id}/ ({entry['method']})")
+            if i % JOURNAL_SAVE_EVERY == 0:
+                save_journal(target_base, journal)
+    save_journal(target_base, journal)
+
+    print(f"Done in {time.perf_counter() - t:.1f}s: " +
+          (", ".join(f"{n} {m}" for m, n in sorted(methods.items())) or "nothing to do"))
+    for target_id in missing:
+        print(f"  Source gone (data/{target_id}/ kept): {journal['reps'][target_id]['source']}")
+    print(f"Journal (new -> old path, signer): {(target_base / JOURNAL_NAME).resolve()}")
+
+    print("\nSummary per sign:")
+    per_sign = {sign: 0 for sign in DEFAULT_SIGNS}
+    for target_id in journal["reps"]:
+        per_sign[target_id.rsplit('/', 1)[0]] += 1
+    for sign in sorted(DEFAULT_SIGNS):
+        count = per_sign[sign]
+        if count > 0:
+            print(f"  {sign}: {count} repetitions")
+        else:
+            print(f"  {sign}: 0 repetitions (warning: missing?)")
+
+
 if __name__ == "__main__":
-    copy_and_reorganize_dataset()
+    parser = argparse.ArgumentParser(description="Collect the landmarks of all signers into data/{sign}/rep-N.")
+    parser.add_argument("--workers", type=int, default=None, help="threads (default: ThreadPoolExecutor's)")
+    parser.add_argument("--link", choices=["auto", "reflink", "hardlink", "copy"], default="auto",
+                        help="auto = reflink, else hardlink, else copy")
+    parser.add_argument("--verbose", action="store_true", help="print one line per processed rep")
+    parser.add_argument("--sequential", action="store_true", help="original one-shot copy (no journal)")
+    args = parser.parse_args()
+
+    if args.sequential:
+        copy_and_reorganize_dataset()
+    else:
+        reorganize_incremental(args.workers, args.link, args.verbose)
 
@@ -4,39 +4,47 @@
 This script creates a stratified train/validation/test split of the dataset while keeping the original data completely untouched.
 
 Key features:
-- Copies (does NOT move or modify) repetition folders (rep-XX) from the original structure.
+- Writes a split manifest (data/splits.json) listing the rep IDs ("{sign}/rep-XX") of every split,
+  together with the seed and ratios. No repetition folder is copied, moved or modified.
 - Splits at the repetition level for each sign independently.
-- Uses 80% train / 10% validation / 10% test ratio per sign.
+- Uses 80% train / 10% validation / 10% test ratio per sign (--ratios).
 - Ensures every sign appears in all three splits (as long as it has enough repetitions).
-- Fully reproducible: fixed random seed (42) guarantees the same split every run.
-- Safe: skips copying if a folder already exists, never overwrites anything.
+- Fully reproducible: fixed random seed (42, --seed) guarantees the same split every run,
+  and the manifest itself records the split that was used.
+- Re-splitting (other seed, other ratios) or k-fold cross-validation (--folds K) only writes
+  small JSON files, in milliseconds and without extra disk space.
 - Original data under data/{sign}/ remains 100% unchanged.
 
-After running, there will be train/validation/test subfolders within the existing "data" folder at the root level:
-    data/train/{sign}/rep-XX/...
-    data/validation/{sign}/rep-XX/...
-    data/test/{sign}/rep-XX/...
+After running, the data folder at the root level contains:
+    data/splits.json                        (default)
+    data/splits-fold{i}.json, i < K         (--folds K: test as in splits.json, fold i is validation)
+
+The loaders (SignDataset), the dataset-checks and step03/step04 read the manifest. Options:
+    --copy          also copy the rep folders into data/train|validation|test/{sign}/ like before
+                    (storage doubles; only needed for tools outside this repository)
+    --from-folders  record an existing physical data/train|validation|test split as data/splits.json
 
 NOTES:
-This code does not create a new "data" folder at the root level, but rather it creates train/validation/test subfolders within the existing
-"data" folder (which was created with the step01_reorganize_dataset.py). It is advised to manually remove {sign-name} 
-subfolders from the "data" folder since landmarks are basically copied into train/val/test splits, effectively the storage doubles.
+This code does not create a new "data" folder at the root level, it works inside the existing
+"data" folder (which was created with the step01_reorganize_dataset.py). Do NOT remove the
+{sign-name} subfolders from the "data" folder: with a manifest they are the only copy of the
+landmarks that the splits point to.
 """
 
+import argparse
 import os
 import shutil
-import random
 
-# Fixed random seed for reproducibility
-RANDOM_SEED = 42
-random.seed(RANDOM_SEED)
+from split_manifest import (
+    SPLITS, RATIOS, RANDOM_SEED, make_splits, make_folds, splits_from_folders, save_splits, rep_sign
+)
 
 # 50 default signs
-DEFAULT_SIGNS = ['assalomu_alaykum', 'bahor', 'birga', "bo'sh", 'bosh_kiyim', 'boshlanishi', 'bozor', 'eshik', 
-               'futbol', 'iltimos', 'internet', 'javob', 'jismoniy_tarbiya', 'karam', 'kartoshka', 
-               'kichik', 'kitob', "ko'prik", 'likopcha', 'maktab', 'mehmonxona', 'mehribon', 'metro', 
-               'musiqa', "o'simlik_yog'i", "o'ynash", 'ochish', 'ot', 'ovqat_tayyorlash', 
-               'oxiri', 'poezd', 'pomidor', 'qidirish', 'qish', "qo'ziqorin", 'qor', "qorong'i", 'quyon', 
+DEFAULT_SIGNS = ['assalomu_alaykum', 'bahor', 'birga', "bo'sh", 'bosh_kiyim', 'boshlanishi', 'bozor', 'eshik',
+               'futbol', 'iltimos', 'internet', 'javob', 'jismoniy_tarbiya', 'karam', 'kartoshka',
+               'kichik', 'kitob', "ko'prik", 'likopcha', 'maktab', 'mehmonxona', 'mehribon', 'metro',
+               'musiqa', "o'simlik_yog'i", "o'ynash", 'ochish', 'ot', 'ovqat_tayyorlash',
+               'oxiri', 'poezd', 'pomidor', 'qidirish', 'qish', "qo'ziqorin", 'qor', "qorong'i", 'quyon',
                'restoran', "sariyog'", 'shokolad', 'sovun', 'stakan', 'televizor', 'tosh', 'toza',
                'turish', "yomg'ir", 'yopish', 'yordam_berish']
 
@@ -44,57 +52,32 @@ DEFAULT_SIGNS = ['assalomu_alaykum', 'bahor', 'birga', "bo'sh", 'bosh_kiyim', 'b
 # Pre-Splitting dataset location at the root level
 data_root = '../data'
 
-# Desired splits
-splits = ['train', 'validation', 'test']
-
-# Create split directories if they do not exist
-for split in splits:
-    os.makedirs(os.path.join(data_root, split), exist_ok=True)
-
-# Process each sign independently
-for sign in DEFAULT_SIGNS:
-    sign_path = os.path.join(data_root, sign)
-    
-    if not os.path.exists(sign_path):
-        print(f"Warning: Sign folder not found: {sign_path}")
-        continue
-    
-    # Get list of repetition folders (rep-XX)
-    reps = [d for d in os.listdir(sign_path) if os.path.isdir(os.path.join(sign_path, d)) and d.startswith('rep-')]
-    
-    if len(reps) == 0:
-        print(f"Warning: No repetitions found for sign: {sign}")
-        continue
-    
-    # Shuffle the repetitions with the fixed seed
-    random.shuffle(reps)
-    
-    # Calculate split sizes
-    total_reps = len(reps)
-    train_count = int(0.8 * total_reps)
-    val_count = int(0.1 * total_reps)
-    test_count = total_reps - train_count - val_count  # Use remainder for test to avoid rounding issues
-    
-    # Assign reps to splits
-    train_reps = reps[:train_count]
-    val_reps = reps[train_count:train_count + val_count]
-    test_reps = reps[train_count + val_count:]
-    
-    print(f"{sign}: {total_reps} reps -> train:{len(train_reps)}, val:{len(val_reps)}, test:{len(test_reps)}")
-    
-    # Copy reps to each split
-    for split, split_reps in zip(splits, [train_reps, val_reps, test_reps]):
-        if len(split_reps) == 0:
-            print(f"  Warning: No repetitions assigned to {split} for sign '{sign}'")
+
+def print_summary(manifest: dict):
+    per_sign = {}
+    for split in SPLITS:
+        for rep_id in manifest["splits"][split]:
+            per_sign.setdefault(rep_sign(rep_id), {s: 0 for s in SPLITS})[split] += 1
+    for sign in DEFAULT_SIGNS:
+        if sign not in per_sign:
+            print(f"Warning: No repetitions found for sign: {sign}")
             continue
-            
-        split_sign_path = os.path.join(data_root, split, sign)
-        os.makedirs(split_sign_path, exist_ok=True)
-        
-        for rep in split_reps:
-            src_rep_path = os.path.join(sign_path, rep)
-            dest_rep_path = os.path.join(split_sign_path, rep)
-            
+        counts = per_sign[sign]
+        print(f"{sign}: {sum(counts.values())} reps -> train:{counts['train']}, "
+              f"val:{counts['validation']}, test:{counts['test']}")
+        for split in SPLITS:
+            if counts[split] == 0:
+                print(f"  Warning: No repetitions assigned to {split} for sign '{sign}'")
+
+
+def copy_split_folders(manifest: dict):
+    """The original behaviour: copy every rep folder into data/{split}/{sign}/ (never overwrites)."""
+    for split in SPLITS:
+        for rep_id in manifest["splits"][split]:
+            src_rep_path = os.path.join(data_root, rep_id)
+            dest_rep_path = os.path.join(data_root, split, rep_id)
+            os.makedirs(os.path.dirname(dest_rep_path), exist_ok=True)
+
             # Copy only if destination does not exist (safe, no overwrite)
             if os.path.exists(dest_rep_path):
                 print(f"  Skipping (already exists): {dest_rep_path}")
@@ -102,8 +85,36 @@ for sign in DEFAULT_SIGNS:
                 shutil.copytree(src_rep_path, dest_rep_path)
                 print(f"  Copied: {src_rep_path} → {dest_rep_path}")
 
-print("\nDataset splitting completed successfully!")
-print("Original data remains untouched. New structure created under data/train, data/validation, data/test")
-print(f"Random seed used: {RANDOM_SEED} (for full reproducibility)")
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the train/validation/test split manifest.")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED)
+    parser.add_argument("--ratios", type=float, nargs=3, default=RATIOS, metavar=("TRAIN", "VAL", "TEST"))
+    parser.add_argument("--folds", type=int, default=0, help="also write K cross-validation manifests")
+    parser.add_argument("--copy", action="store_true", help="also copy rep folders into data/{split}/ (doubles storage)")
+    parser.add_argument("--from-folders", action="store_true", help="record the existing data/{split}/ folders instead")
+    args = parser.parse_args()
+
+    if args.from_folders:
+        manifest = splits_from_folders(data_root)
+    else:
+        if abs(sum(args.ratios) - 1.0) > 1e-6:
+            parser.error(f"ratios must sum to 1, got {args.ratios}")
+        manifest = make_splits(data_root, DEFAULT_SIGNS, seed=args.seed, ratios=args.ratios)
+
+    print_summary(manifest)
+    path = save_splits(data_root, manifest)
+    print(f"\nSplit manifest written: {path}")
+
+    for i, fold in enumerate(make_folds(manifest, args.folds, seed=args.seed) if args.folds else []):
+        fold_path = save_splits(data_root, fold, name=f"splits-fold{i}.json")
+        print(f"  fold {i}: {len(fold['splits']['train'])} train / {len(fold['splits']['validation'])} "
+              f"validation -> {fold_path}")
+
+    if args.copy and not args.from_folders:
+        copy_split_folders(manifest)
 
+    print("\nDataset splitting completed successfully!")
+    print("Original data remains untouched. Splits are listed in data/splits.json")
+    if manifest["seed"] is not None:
+        print(f"Random seed used: {manifest['seed']} (for full reproducibility)")
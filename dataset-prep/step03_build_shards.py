@@ -0,0 +1,110 @@
+"""
+(WRITE-OUT file)
+
+Packs every split of the post-splitting dataset into ONE contiguous, memory-mappable array,
+so that the training DataLoader never has to walk the folder tree or open per-frame files.
+
+For each split (listed in data/splits.json, or the data/train|validation|test folders) it writes:
+    data/shards/{split}/landmarks.npy   -> (N_reps, 32, 1662) float32, read with np.load(mmap_mode='r')
+    data/shards/{split}/labels.npy      -> (N_reps,) int64, index into DEFAULT_SIGNS
+    data/shards/{split}/reps.npy        -> (N_reps,) str, provenance "{sign}/rep-XX" of every row
+    data/shards/{split}/meta.json       -> shapes, dtype, sign list (written last, marks the shard complete)
+
+- Reads packed landmarks.npy as well as legacy frame-XX.npy repetitions.
+- Reps are ordered by sign (DEFAULT_SIGNS order), then by rep number.
+- Repetitions that do not have exactly 32 frames are skipped and reported.
+- The split folders are only read, never modified. Re-running overwrites the shards.
+- float32 is used because that is what the model consumes (MPS cannot handle float64).
+
+The shards are served by `ShardSignDataset` in preprocessing/uzslr/datasets.py.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# landmark file format is defined by the video-collector
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'video-collector'))
+from mod06_landmark_io import load_rep, frame_count, VECTOR_SIZE
+from split_manifest import split_rep_dirs, rep_sort_key
+
+# 50 default signs
+DEFAULT_SIGNS = ['assalomu_alaykum', 'bahor', 'birga', "bo'sh", 'bosh_kiyim', 'boshlanishi', 'bozor', 'eshik',
+               'futbol', 'iltimos', 'internet', 'javob', 'jismoniy_tarbiya', 'karam', 'kartoshka',
+               'kichik', 'kitob', "ko'prik", 'likopcha', 'maktab', 'mehmonxona', 'mehribon', 'metro',
+               'musiqa', "o'simlik_yog'i", "o'ynash", 'ochish', 'ot', 'ovqat_tayyorlash',
+               'oxiri', 'poezd', 'pomidor', 'qidirish', 'qish', "qo'ziqorin", 'qor', "qorong'i", 'quyon',
+               'restoran', "sariyog'", 'shokolad', 'sovun', 'stakan', 'televizor', 'tosh', 'toza',
+               'turish', "yomg'ir", 'yopish', 'yordam_berish']
+
+FRAMES_PER_REP = 32
+
+# Post-Splitting dataset location at the root level
+data_root = Path('../data')
+shards_root = data_root / 'shards'
+
+splits = ['train', 'validation', 'test']
+
+
+def collect_reps(split: str):
+    """Return [(rep_dir, label, "{sign}/rep-XX")] in a fixed (sign, rep) order, and skipped reps."""
+    label_of = {sign: label for label, sign in enumerate(DEFAULT_SIGNS)}
+    by_sign = {}
+    for sign, rep_dir in split_rep_dirs(data_root, split):
+        if sign in label_of:
+            by_sign.setdefault(sign, []).append(rep_dir)
+
+    reps, skipped = [], []
+    for sign in DEFAULT_SIGNS:
+        for rep_dir in sorted(by_sign.get(sign, []), key=lambda d: rep_sort_key(f"{sign}/{d.name}")):
+            if frame_count(rep_dir) != FRAMES_PER_REP:
+                skipped.append(rep_dir)
+                continue
+            reps.append((rep_dir, label_of[sign], f"{sign}/{rep_dir.name}"))
+    return reps, skipped
+
+
+def build_split_shard(split: str):
+    reps, skipped = collect_reps(split)
+    if not reps and not skipped:
+        print(f"Warning: No repetitions found for split: {split}")
+        return
+
+    out_dir = shards_root / split
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # meta.json is removed first and written last, so a half-written shard is never used
+    meta_path = out_dir / 'meta.json'
+    meta_path.unlink(missing_ok=True)
+
+    shape = (len(reps), FRAMES_PER_REP, VECTOR_SIZE)
+    landmarks = np.lib.format.open_memmap(out_dir / 'landmarks.npy', mode='w+',
+                                          dtype=np.float32, shape=shape)
+    for i, (rep_dir, _, _) in enumerate(reps):
+        landmarks[i] = load_rep(rep_dir)
+    landmarks.flush()
+    del landmarks
+
+    np.save(out_dir / 'labels.npy', np.array([label for _, label, _ in reps], dtype=np.int64))
+    np.save(out_dir / 'reps.npy', np.array([name for _, _, name in reps], dtype=str))
+
+    meta_path.write_text(json.dumps({
+        "split": split,
+        "shape": list(shape),
+        "dtype": "float32",
+        "signs": DEFAULT_SIGNS,
+    }, ensure_ascii=False, indent=2))
+
+    size_mb = (out_dir / 'landmarks.npy').stat().st_size / 1e6
+    print(f"{split}: {len(reps)} reps -> {out_dir}/landmarks.npy {shape} ({size_mb:.1f} MB)")
+    for rep_dir in skipped:
+        print(f"  Skipped (not {FRAMES_PER_REP} frames): {rep_dir}")
+
+
+if __name__ == "__main__":
+    print("Building memory-mapped shards (split folders will NOT be modified)...\n")
+    for split in splits:
+        build_split_shard(split)
+    print(f"\nShards located at: {shards_root.resolve()}")
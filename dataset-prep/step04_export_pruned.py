@@ -0,0 +1,91 @@
+"""
+(WRITE-OUT file)
+
+Writes a column-pruned copy of every split: only the x,y of the landmarks the model uses
+(the 118 of POINT_LANDMARKS plus the one pose landmark flip augmentation moves into them),
+tagged with a schema.json that names every column. About 7x smaller than the float32
+shards and 14x smaller than float64 frame-XX.npy files.
+
+For each split (listed in data/splits.json, or the data/train|validation|test folders) it writes:
+    data/pruned/{split}/landmarks.npy   -> (N_reps, 32, 119, 2) float32
+    data/pruned/{split}/presence.npy    -> (N_reps, 32) uint8 hand presence bitmask (--hand-presence)
+    data/pruned/{split}/labels.npy      -> (N_reps,) int64, index into DEFAULT_SIGNS
+    data/pruned/{split}/reps.npy        -> (N_reps,) str, provenance "{sign}/rep-XX" of every row
+    data/pruned/{split}/schema.json     -> landmark ids, coords, source columns (written last)
+
+- Same repetitions, same order as step03_build_shards.py (reps without 32 frames are skipped).
+- The split folders are only read, never modified: they stay the full-fidelity archive.
+- Re-running overwrites the export.
+
+The export is read by `PrunedSignDataset` in preprocessing/uzslr/datasets.py; the schema is
+defined in preprocessing/uzslr/pruned.py.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# landmark file format is defined by the video-collector, the schema by preprocessing/uzslr
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'video-collector'))
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'preprocessing'))
+from mod06_landmark_io import load_rep
+from uzslr.pruned import EXPORT_LANDMARKS, make_schema, prune_frames, hand_presence
+from step03_build_shards import DEFAULT_SIGNS, FRAMES_PER_REP, collect_reps, data_root, splits
+
+pruned_root = data_root / 'pruned'
+
+
+def export_split(split: str, with_presence: bool):
+    reps, skipped = collect_reps(split)
+    if not reps and not skipped:
+        print(f"Warning: No repetitions found for split: {split}")
+        return
+
+    out_dir = pruned_root / split
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # schema.json is removed first and written last, so a half-written export is never used
+    schema_path = out_dir / 'schema.json'
+    schema_path.unlink(missing_ok=True)
+    (out_dir / 'presence.npy').unlink(missing_ok=True)
+
+    shape = (len(reps), FRAMES_PER_REP, len(EXPORT_LANDMARKS), 2)
+    landmarks = np.lib.format.open_memmap(out_dir / 'landmarks.npy', mode='w+',
+                                          dtype=np.float32, shape=shape)
+    presence = np.zeros(shape[:2], dtype=np.uint8)
+    for i, (rep_dir, _, _) in enumerate(reps):
+        frames = load_rep(rep_dir)
+        landmarks[i] = prune_frames(frames, EXPORT_LANDMARKS)
+        if with_presence:
+            presence[i] = hand_presence(frames)
+    landmarks.flush()
+    del landmarks
+
+    if with_presence:
+        np.save(out_dir / 'presence.npy', presence)
+    np.save(out_dir / 'labels.npy', np.array([label for _, label, _ in reps], dtype=np.int64))
+    np.save(out_dir / 'reps.npy', np.array([name for _, _, name in reps], dtype=str))
+
+    schema = make_schema(EXPORT_LANDMARKS, hand_presence=with_presence)
+    schema.update({"split": split, "shape": list(shape), "signs": DEFAULT_SIGNS})
+    schema_path.write_text(json.dumps(schema, ensure_ascii=False, indent=2))
+
+    size_mb = (out_dir / 'landmarks.npy').stat().st_size / 1e6
+    print(f"{split}: {len(reps)} reps -> {out_dir}/landmarks.npy {shape} ({size_mb:.1f} MB)")
+    for rep_dir in skipped:
+        print(f"  Skipped (not {FRAMES_PER_REP} frames): {rep_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the x,y of the model's landmarks only.")
+    parser.add_argument("--hand-presence", action="store_true",
+                        help="also write a per-frame bitmask of detected hands (presence.npy)")
+    args = parser.parse_args()
+
+    print("Exporting column-pruned landmarks (split folders will NOT be modified)...\n")
+    for split in splits:
+        export_split(split, args.hand_presence)
+    print(f"\nExport located at: {pruned_root.resolve()}")
@@ -0,0 +1,89 @@
+"""
+(READ-ONLY file)
+Benchmark: per-item Preprocess (as in 02_ak_preprocess_v1.ipynb) vs. batch-level preprocessing
+in the collate_fn (uzslr.preprocess.Preprocess on (B, T, 1662)).
+
+Random (32, 1662) repetitions are used, nothing is read from or written to disk.
+First checks that every batched output is bit-identical to the notebook implementation, then
+reports milliseconds per batch for:
+    notebook per-item  -> original module, torch.stack([unpack_frame(f) for f in x]) per sample
+    uzslr per-item     -> new module called once per sample (what SignDataset does by default)
+    uzslr collate      -> new module called once per batch (batch_preprocess=True + collate_preprocess)
+
+Run from preprocessing/benchmarks:
+    python 01_bench_batched_preprocess.py
+"""
+
+import sys
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+sys.path.append("..")
+from uzslr.config import POINT_LANDMARKS, MAX_LEN, VECTOR_SIZE
+from uzslr.preprocess import Preprocess, unpack_frame
+
+BATCH_SIZES = [16, 64, 256]
+N_RUNS = 20
+
+
+# original module from the notebook, kept here as the reference
+class NotebookPreprocess(nn.Module):
+    def __init__(self, max_len=32, point_landmarks=POINT_LANDMARKS):
+        super().__init__()
+        self.max_len = max_len
+        self.register_buffer("landmark_idx", torch.tensor(point_landmarks, dtype=torch.long))
+
+    def forward(self, x):
+        frames = torch.stack([unpack_frame(f) for f in x])  # (T, 543, 3)
+        frames = frames[:, self.landmark_idx]
+        frames = frames[..., :2]
+        center = frames[:, self.landmark_idx.tolist().index(17):self.landmark_idx.tolist().index(17)+1]
+        center = torch.nanmean(center, dim=(0,1), keepdim=True)
+        center = torch.where(torch.isnan(center), torch.tensor(0.5, device=center.device), center)
+        diff = frames - center
+        diff = torch.where(torch.isnan(diff), torch.zeros_like(diff), diff)
+        std = torch.sqrt(torch.mean(diff**2, dim=(0,1), keepdim=True))
+        std = torch.clamp(std, min=1e-6)
+        frames = diff / std
+        dx = torch.zeros_like(frames)
+        dx[1:] = frames[1:] - frames[:-1]
+        dx2 = torch.zeros_like(frames)
+        dx2[2:] = frames[2:] - frames[:-2]
+        frames = frames.reshape(frames.shape[0], -1)
+        dx     = dx.reshape(dx.shape[0], -1)
+        dx2    = dx2.reshape(dx2.shape[0], -1)
+        return torch.cat([frames, dx, dx2], dim=-1)
+
+
+def time_ms(fn) -> float:
+    fn()  # warm-up
+    t = time.perf_counter()
+    for _ in range(N_RUNS):
+        fn()
+    return (time.perf_counter() - t) / N_RUNS * 1e3
+
+
+if __name__ == "__main__":
+    torch.set_num_threads(1)   # same as inside one DataLoader worker
+    rng = np.random.default_rng(0)
+    notebook, batched = NotebookPreprocess(MAX_LEN), Preprocess(MAX_LEN)
+
+    # 1. Equivalence
+    x = torch.tensor(rng.random((BATCH_SIZES[0], MAX_LEN, VECTOR_SIZE)), dtype=torch.float32)
+    x[0, :, 1536:] = 0.0   # missing hands in one sample
+    out = batched(x)
+    for b in range(len(x)):
+        assert torch.equal(out[b], notebook(x[b])), f"sample {b} differs"
+    print("Batched output identical to the notebook implementation.\n")
+
+    # 2. Timing
+    print(f"{'batch':>6} {'notebook per-item':>18} {'uzslr per-item':>15} {'uzslr collate':>14} {'speed-up':>9}")
+    for B in BATCH_SIZES:
+        x = torch.tensor(rng.random((B, MAX_LEN, VECTOR_SIZE)), dtype=torch.float32)
+        t_nb = time_ms(lambda: torch.stack([notebook(s) for s in x]))
+        t_item = time_ms(lambda: torch.stack([batched(s) for s in x]))
+        t_batch = time_ms(lambda: batched(x))
+        print(f"{B:>6} {t_nb:>15.2f} ms {t_item:>12.2f} ms {t_batch:>11.2f} ms {t_nb / t_batch:>8.1f}x")
@@ -0,0 +1,66 @@
+"""
+(READ-ONLY file)
+Benchmark: training-time augmentation + preprocessing per sample vs. per batch.
+
+    per-sample  -> what SignDataset(augment=True) does in __getitem__:
+                   unpack_frames -> augment_fn -> pad_or_truncate -> Preprocess, once per sample
+    batched     -> collate_augment_preprocess: augment_batch on the (B, T, N, 2) selected
+                   landmarks + Preprocess once per batch
+    augment only (543 x 3) -> augment_batch on fully unpacked frames, for reference
+
+Random (32, 1662) repetitions are used, nothing is read from or written to disk. Every transform
+is applied (always=True) so both paths do the full amount of work. Reports milliseconds per
+batch, single-threaded like one DataLoader worker.
+
+Run from preprocessing/benchmarks:
+    python 02_bench_batched_augment.py
+"""
+
+import sys
+import time
+
+import numpy as np
+import torch
+
+sys.path.append("..")
+from uzslr.config import MAX_LEN, VECTOR_SIZE, NUM_NODES
+from uzslr.augment import augment_fn, augment_batch
+from uzslr.preprocess import Preprocess, unpack_frames, pad_or_truncate
+from uzslr import datasets
+
+BATCH_SIZES = [16, 64, 256]
+N_RUNS = 20
+
+
+def time_ms(fn) -> float:
+    fn()  # warm-up
+    t = time.perf_counter()
+    for _ in range(N_RUNS):
+        fn()
+    return (time.perf_counter() - t) / N_RUNS * 1e3
+
+
+def per_sample(raw, preprocess):
+    return torch.stack([preprocess(pad_or_truncate(augment_fn(unpack_frames(s), always=True), MAX_LEN)) for s in raw])
+
+
+def batched(raw):
+    # same steps as datasets.collate_augment_preprocess, with always=True
+    x = datasets._augment_select.select_xy(raw)
+    x = augment_batch(x, always=True, perm=datasets._augment_mirror)
+    return datasets._batch_preprocess.features(x[:, :, :NUM_NODES])
+
+
+if __name__ == "__main__":
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(0)
+    preprocess = Preprocess(MAX_LEN)
+
+    print(f"{'batch':>6} {'per-sample':>12} {'batched':>10} {'speed-up':>9} {'augment only (543 x 3)':>24}")
+    for B in BATCH_SIZES:
+        raw = torch.tensor(rng.random((B, MAX_LEN, VECTOR_SIZE)), dtype=torch.float32)
+        unpacked = unpack_frames(raw)
+        t_item = time_ms(lambda: per_sample(raw, preprocess))
+        t_batch = time_ms(lambda: batched(raw))
+        t_full = time_ms(lambda: augment_batch(unpacked, always=True))
+        print(f"{B:>6} {t_item:>9.2f} ms {t_batch:>7.2f} ms {t_item / t_batch:>8.1f}x {t_full:>21.2f} ms")
@@ -0,0 +1,55 @@
+"""
+(READ-ONLY file)
+Benchmark: epoch time of a DataLoader over a split read from disk vs. held in RAM.
+
+    disk       -> SignDataset, every worker reads the .npy files again on every epoch
+    in-memory  -> InMemorySignDataset(SignDataset), the split is loaded once into a shared-memory
+                  tensor and the workers only index it
+
+Reports the one-off load time and size of the in-memory tensor, then seconds per epoch for
+both (the first epoch includes starting the workers). Uses batch_preprocess=True +
+collate_augment_preprocess like training.
+
+Run from preprocessing/benchmarks:
+    python 03_bench_in_memory_dataset.py ../data train --workers 4 --epochs 3
+"""
+
+import argparse
+import sys
+import time
+
+from torch.utils.data import DataLoader
+
+sys.path.append("..")
+from uzslr.datasets import SignDataset, InMemorySignDataset, collate_augment_preprocess
+
+
+def epoch_seconds(dataset, workers: int, epochs: int) -> list[float]:
+    loader = DataLoader(dataset, batch_size=64, shuffle=True, num_workers=workers,
+                        collate_fn=collate_augment_preprocess, persistent_workers=workers > 0)
+    times = []
+    for _ in range(epochs):
+        t = time.perf_counter()
+        for _x, _y in loader:
+            pass
+        times.append(time.perf_counter() - t)
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("data_root")
+    parser.add_argument("split", nargs="?", default="train")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--epochs", type=int, default=3)
+    args = parser.parse_args()
+
+    disk = SignDataset(args.data_root, args.split, batch_preprocess=True)
+    in_memory = InMemorySignDataset(disk)
+
+    print(f"\n{len(disk)} reps, {args.workers} workers")
+    print(f"in-memory load: {in_memory.load_seconds:.2f}s, {in_memory.nbytes / 1e6:.1f} MB\n")
+    print(f"{'dataset':<10} " + " ".join(f"{f'epoch {e}':>9}" for e in range(1, args.epochs + 1)))
+    for name, ds in (("disk", disk), ("in-memory", in_memory)):
+        times = epoch_seconds(ds, args.workers, args.epochs)
+        print(f"{name:<10} " + " ".join(f"{t:>8.2f}s" for t in times))
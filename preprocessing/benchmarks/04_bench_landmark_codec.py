@@ -0,0 +1,86 @@
+"""
+(READ-ONLY file)
+Benchmark / verification of the landmark storage codecs of video-collector/mod06_landmark_io.py.
+
+Every rep of the split is written with each codec (save_rep, into a temporary folder, the
+dataset is not modified) and read back (load_rep). Reported per codec:
+    size        bytes on disk per rep, and the ratio to float64 (what extract_vector produces)
+    write/read  milliseconds per rep
+    max error   largest |decoded - original| over all values, per part (face, pose, rh, lh)
+    features    largest |Preprocess(decoded) - Preprocess(original)| over the (32, 708) features,
+                and relative to the std of the features
+    fallback    reps stored as float32 instead (q16 range exceeded or NaN)
+
+Run from preprocessing/benchmarks:
+    python 04_bench_landmark_codec.py ../../data train --limit 200
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+sys.path.append("..")
+from uzslr.config import FACE_END, POSE_END, RH_END, LH_END
+from uzslr.preprocess import Preprocess
+from uzslr.datasets import SignDataset
+from mod06_landmark_io import CODECS, load_rep, save_rep, rep_files
+
+PARTS = {"face": slice(0, FACE_END), "pose": slice(FACE_END, POSE_END),
+         "rh": slice(POSE_END, RH_END), "lh": slice(RH_END, LH_END)}
+
+
+def features(preprocess: Preprocess, frames: np.ndarray) -> np.ndarray:
+    with torch.no_grad():
+        return preprocess(torch.as_tensor(frames, dtype=torch.float32)).numpy()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("data_root")
+    parser.add_argument("split", nargs="?", default="train")
+    parser.add_argument("--limit", type=int, default=200, help="number of reps to use")
+    args = parser.parse_args()
+
+    dataset = SignDataset(args.data_root, args.split)
+    reps = [load_rep(dataset.samples[i][0]).astype(np.float64) for i in range(min(args.limit, len(dataset)))]
+    preprocess = Preprocess()
+    reference = [features(preprocess, frames) for frames in reps]
+    feature_std = float(np.std(np.stack(reference)))
+    print(f"\n{len(reps)} reps of {args.split}, feature std {feature_std:.4f}\n")
+
+    print(f"{'codec':<10} {'bytes/rep':>10} {'ratio':>6} {'write':>8} {'read':>8}  "
+          + " ".join(f"{'err ' + p:>9}" for p in PARTS) + f" {'features':>9} {'rel':>8} {'fallback':>8}")
+    for codec in CODECS:
+        size, write_s, read_s, fallback = 0, 0.0, 0.0, 0
+        part_err = {p: 0.0 for p in PARTS}
+        feat_err = 0.0
+        with tempfile.TemporaryDirectory() as tmp:
+            for i, frames in enumerate(reps):
+                rep_dir = Path(tmp) / f"rep-{i}"
+                rep_dir.mkdir()
+                t = time.perf_counter()
+                used = save_rep(rep_dir, frames, codec)
+                write_s += time.perf_counter() - t
+                fallback += used != codec
+                size += sum(p.stat().st_size for p in rep_files(rep_dir))
+
+                t = time.perf_counter()
+                decoded = load_rep(rep_dir)
+                read_s += time.perf_counter() - t
+
+                diff = np.abs(decoded.astype(np.float64) - frames)
+                for p, cols in PARTS.items():
+                    part_err[p] = max(part_err[p], float(np.nanmax(diff[:, cols])))
+                feat_err = max(feat_err, float(np.nanmax(np.abs(features(preprocess, decoded) - reference[i]))))
+
+        n = len(reps)
+        if codec == "float64":
+            base = size
+        print(f"{codec:<10} {size / n:>10.0f} {base / size:>5.1f}x {write_s / n * 1e3:>6.2f}ms {read_s / n * 1e3:>6.2f}ms  "
+              + " ".join(f"{part_err[p]:>9.2e}" for p in PARTS)
+              + f" {feat_err:>9.2e} {feat_err / feature_std:>8.1e} {fallback:>8}")
@@ -0,0 +1,65 @@
+"""
+(READ-ONLY file)
+Benchmark: Preprocess on the whole sliding window for every new frame vs. the streaming
+uzslr.preprocess.StreamingPreprocess (running sums of the window normalization).
+
+A random stream of (1662,) frames is used, nothing is read from or written to disk.
+First checks, for every frame of the stream, that
+    push()              == last row of Preprocess(window)   (to float32 rounding)
+    window_features()   == Preprocess(window)               (bit-identical)
+then reports microseconds per new frame for several window lengths:
+    batch window        -> Preprocess on the last T raw frames
+    push                -> StreamingPreprocess.push, features of the newest frame
+    window_features     -> StreamingPreprocess.append + window_features, the whole (T, 708) window
+
+Run from preprocessing/benchmarks:
+    python 05_bench_streaming_preprocess.py
+"""
+
+import sys
+import time
+
+import numpy as np
+import torch
+
+sys.path.append("..")
+from uzslr.config import MAX_LEN, VECTOR_SIZE
+from uzslr.preprocess import Preprocess, StreamingPreprocess
+
+WINDOWS = [MAX_LEN, 64, 128]
+N_FRAMES = 500
+
+
+def time_us(fn, stream) -> float:
+    t = time.perf_counter()
+    for frame in stream:
+        fn(frame)
+    return (time.perf_counter() - t) / len(stream) * 1e6
+
+
+if __name__ == "__main__":
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(0)
+    stream = rng.random((N_FRAMES, VECTOR_SIZE)).astype(np.float32)
+    stream[50:60, 1536:] = 0.0        # missing hands
+    stream[70, 1404:1536] = np.nan    # NaN pose
+
+    # 1. Equivalence
+    batch, streaming, exact = Preprocess(MAX_LEN), StreamingPreprocess(MAX_LEN), StreamingPreprocess(MAX_LEN, exact=True)
+    max_err = 0.0
+    for t, frame in enumerate(stream[:200]):
+        reference = batch(torch.from_numpy(stream[max(0, t + 1 - MAX_LEN):t + 1]))
+        max_err = max(max_err, float((streaming.push(frame) - reference[-1]).abs().max()))
+        assert torch.equal(exact.push(frame), reference), f"frame {t}: window features differ"
+    print(f"window_features() identical to Preprocess, push() max |error| {max_err:.1e}\n")
+
+    # 2. Timing
+    print(f"{'window':>6} {'batch window':>13} {'push':>10} {'window_features':>16}")
+    for T in WINDOWS:
+        batch, streaming = Preprocess(T), StreamingPreprocess(T)
+        frames = torch.from_numpy(stream)
+        t_batch = time_us(lambda i: batch(frames[max(0, i + 1 - T):i + 1]), range(N_FRAMES))
+        t_push = time_us(streaming.push, stream)
+        streaming.reset()
+        t_window = time_us(lambda f: (streaming.append(f), streaming.window_features()), stream)
+        print(f"{T:>6} {t_batch:>10.0f} us {t_push:>7.0f} us {t_window:>13.0f} us")
@@ -0,0 +1,11 @@
+"""
+Importable version of the preprocessing pipeline from `notebooks/02_ak_preprocess_v1.ipynb`.
+
+The notebook remains the place where every step is explained and visualized; this package
+holds the same code so that it can be reused by DataLoaders, scripts and the live recorder.
+
+Usage from a notebook in `preprocessing/notebooks/`:
+    sys.path.append("..")
+    from uzslr.preprocess import Preprocess
+    from uzslr.datasets import SignDataset, ShardSignDataset
+"""
@@ -0,0 +1,240 @@
+"""
+Per-sample augmentations (see section 3.3 of 02_ak_preprocess_v1.ipynb).
+All functions expect (T, 543, 3) tensors.
+
+The *_batch functions and augment_batch apply the same transforms to a whole (B, T, 543, 3)
+batch (e.g. in a collate_fn, see datasets.collate_augment_preprocess).
+"""
+
+import random
+
+import numpy as np
+import torch
+
+from .config import (
+    MAX_LEN, LHAND, RHAND, LLIP, RLIP, LPOSE, RPOSE, LEYE, REYE, LNOSE, RNOSE
+)
+from .layout import mirror_map, mirror_closure
+
+
+# horizontal flip
+def swap(x, a, b):
+    tmp = x[:, a].clone()
+    x[:, a] = x[:, b]
+    x[:, b] = tmp
+
+def flip_lr(x):
+    x = x.clone()
+    x[..., 0] = 1.0 - x[..., 0]
+
+    swap(x, LHAND, RHAND)
+    swap(x, LLIP,  RLIP)
+    swap(x, LPOSE, RPOSE)
+    swap(x, LEYE,  REYE)
+    swap(x, LNOSE, RNOSE)
+
+    return x
+
+
+# temporal resampling, simulating signs with varying speeds, can increase/decrease number of frames (T)
+def resample(x, rate=(0.8, 1.2)):
+    t = x.shape[0]
+    new_t = int(t * random.uniform(*rate))
+    idx = torch.round(torch.linspace(0, t - 1, new_t)).long()
+    idx = torch.clamp(idx, 0, t - 1)
+    return x[idx]
+
+
+# random affine (scale, shear, shift, rotate)
+def spatial_random_affine(x,
+    scale=(0.8,1.2),
+    shear=(-0.15,0.15),
+    shift=(-0.1,0.1),
+    degree=(-30,30),
+):
+    x = x.clone()
+    center = torch.tensor([0.5, 0.5], device=x.device, dtype=x.dtype)
+
+    if scale:
+        x *= random.uniform(*scale)
+
+    if shear:
+        sh = random.uniform(*shear)
+        mat = torch.tensor([[1, sh], [sh, 1]], device=x.device)
+        x[..., :2] = (x[..., :2] @ mat)
+
+    if degree:
+        theta = random.uniform(*degree) * np.pi / 180
+        rot = torch.tensor([[np.cos(theta), np.sin(theta)],
+                            [-np.sin(theta), np.cos(theta)]], device=x.device, dtype=x.dtype)
+        x[..., :2] = (x[..., :2] - center) @ rot + center
+
+    if shift:
+        x[..., :2] += random.uniform(*shift)
+
+    return x
+
+
+# random cutout
+def temporal_crop(x, length=MAX_LEN):
+    if x.shape[0] <= length:
+        return x
+    start = random.randint(0, x.shape[0] - length)
+    return x[start:start + length]
+
+def temporal_mask(x, size=(0.2,0.4)):
+    t = x.shape[0]
+    m = int(t * random.uniform(*size))
+    s = random.randint(0, max(1, t - m))
+    x[s:s+m] = 0
+    return x
+
+
+# random masking
+def spatial_mask(x, size=(0.2,0.4)):
+    m = random.uniform(*size)
+    mx, my = random.random(), random.random()
+    mask = (
+        (x[...,0] > mx) & (x[...,0] < mx + m) &
+        (x[...,1] > my) & (x[...,1] < my + m)
+    )
+    x[mask] = 0
+    return x
+
+
+# augmentations will be applied randomly
+def augment_fn(x, always=False):
+    if random.random() < 0.8 or always:
+        x = resample(x, (0.5, 1.5))
+    if random.random() < 0.5 or always:
+        x = flip_lr(x)
+    x = temporal_crop(x, MAX_LEN)
+    if random.random() < 0.75 or always:
+        x = spatial_random_affine(x)
+    # if random.random() < 0.5 or always:   # due to possibility of introducing discountinities, as of now is removed
+    #     x = temporal_mask(x)
+    if random.random() < 0.5 or always:
+        x = spatial_mask(x)
+    return x
+
+
+# Batch-level augmentation: same transforms as augment_fn, for a whole (B, T, N, C) batch at once.
+# Random parameters are drawn per sample as tensors; every transform is a few batched tensor ops.
+# N can be all 543 landmarks or any subset that is closed under left/right mirroring
+# (see mirror_closure), C >= 2 (x, y[, z]).
+def mirror_permutation(landmarks=None):
+    """
+    Index permutation doing the same swaps, in the same order, as flip_lr.
+    landmarks: optional subset (indices into the 543 landmarks); the permutation is then
+    expressed in positions of that subset.
+    """
+    perm = mirror_map()
+    if landmarks is None:
+        return torch.tensor(perm)
+    pos = {lm: i for i, lm in enumerate(landmarks)}
+    missing = sorted({perm[lm] for lm in landmarks} - set(pos))
+    if missing:
+        raise ValueError(f"Landmark subset is not closed under flip_lr, add {missing} (see mirror_closure)")
+    return torch.tensor([pos[perm[lm]] for lm in landmarks])
+
+MIRROR_PERM = mirror_permutation()   # x[:, :, MIRROR_PERM] swaps every left/right landmark group
+
+
+def _uniform(low, high, n, generator=None):
+    return low + (high - low) * torch.rand(n, generator=generator)
+
+
+def resample_batch(x, rate, crop, length=MAX_LEN):
+    """
+    Fixed-length version of resample -> temporal_crop -> pad_or_truncate.
+    x: (B, T, N, C); rate: (B,) speed factors; crop: (B,) in [0, 1), position of the crop window
+    Sample b is resampled to int(T * rate[b]) frames (positions interpolated over the
+    sequence, each picking the nearest source frame, like resample), a window of `length`
+    frames is cropped at `crop[b]`, and shorter sequences are zero-padded at the end.
+    returns: (B, length, N, C), valid: (B, length) bool (False for padded frames)
+    """
+    B, T = x.shape[:2]
+    new_t = torch.clamp(torch.floor(T * rate), min=1)                          # (B,)
+    start = torch.floor(crop * torch.clamp(new_t - length + 1, min=1))         # (B,)
+    k = start[:, None] + torch.arange(length, dtype=rate.dtype)                # (B, L) resampled frame index
+    valid = k < new_t[:, None]
+    src = torch.round(k * (T - 1) / torch.clamp(new_t - 1, min=1)[:, None])
+    src = torch.clamp(src, 0, T - 1).long()
+    out = x[torch.arange(B)[:, None], src]                                     # (B, L, N, C)
+    return out * valid[:, :, None, None].to(x.dtype), valid
+
+
+def flip_lr_batch(x, flip, perm=MIRROR_PERM):
+    """x: (B, T, N, C); flip: (B,) bool. Mirrors x and swaps left/right landmarks where flip is set."""
+    B, T, N = x.shape[:3]
+    idx = torch.where(flip[:, None], perm.to(x.device), torch.arange(N, device=x.device))   # (B, N)
+    x = x[torch.arange(B)[:, None, None], torch.arange(T)[None, :, None], idx[:, None, :]]
+    x[..., 0] = torch.where(flip[:, None, None], 1.0 - x[..., 0], x[..., 0])
+    return x
+
+
+def spatial_random_affine_batch(x, scale, shear, theta, shift):
+    """
+    Batched spatial_random_affine with explicit per-sample parameters, all (B,):
+    x *= scale, then x,y are sheared, rotated by theta (radians) around (0.5, 0.5) and shifted.
+    scale, shear and rotation are folded into one (B, 2, 2) matrix plus a (B, 2) offset.
+    """
+    one = torch.ones_like(shear)
+    shear_mat = torch.stack([torch.stack([one, shear], -1), torch.stack([shear, one], -1)], -2)   # (B, 2, 2)
+    cos, sin = torch.cos(theta), torch.sin(theta)
+    rot = torch.stack([torch.stack([cos, sin], -1), torch.stack([-sin, cos], -1)], -2)            # (B, 2, 2)
+    center = torch.tensor([0.5, 0.5], dtype=rot.dtype)
+
+    mat = scale[:, None, None] * (shear_mat @ rot)                   # xy @ mat == ((scale * xy) @ shear) @ rot
+    offset = center - center @ rot + shift[:, None]                  # (B, 2)
+
+    B, T, N, C = x.shape
+    xy = torch.baddbmm(offset.to(x.dtype)[:, None, :], x[..., :2].reshape(B, T * N, 2), mat.to(x.dtype))
+    if C == 2:
+        return xy.reshape(B, T, N, 2)
+    return torch.cat([xy.reshape(B, T, N, 2), x[..., 2:] * scale[:, None, None, None].to(x.dtype)], dim=-1)
+
+
+def spatial_mask_batch(x, size, mx, my):
+    """Batched spatial_mask: zero every landmark inside the square [mx, mx+size] x [my, my+size] of its sample."""
+    size, mx, my = (v[:, None, None].to(x.dtype) for v in (size, mx, my))
+    mask = (
+        (x[..., 0] > mx) & (x[..., 0] < mx + size) &
+        (x[..., 1] > my) & (x[..., 1] < my + size)
+    )
+    return x.masked_fill(mask[..., None], 0.0)
+
+
+def augment_batch(x, always=False, length=MAX_LEN, perm=MIRROR_PERM, generator=None):
+    """
+    Batched augment_fn followed by pad_or_truncate, with the same probabilities and ranges.
+    x: (B, T, N, C) unpacked frames, perm: mirror permutation of those N landmarks
+    returns: (B, length, N, C), padded frames stay zero
+    """
+    B = x.shape[0]
+    g = generator
+
+    def coin(p):
+        return torch.ones(B, dtype=torch.bool) if always else torch.rand(B, generator=g) < p
+
+    # resample (p=0.8) + temporal crop + pad, fixed output length
+    rate = torch.where(coin(0.8), _uniform(0.5, 1.5, B, g), torch.ones(B))
+    x, valid = resample_batch(x, rate, torch.rand(B, generator=g), length)
+
+    # horizontal flip (p=0.5)
+    x = flip_lr_batch(x, coin(0.5), perm)
+
+    # random affine (p=0.75), identity parameters for the samples that are skipped
+    do = coin(0.75)
+    scale = torch.where(do, _uniform(0.8, 1.2, B, g), torch.ones(B))
+    shear = torch.where(do, _uniform(-0.15, 0.15, B, g), torch.zeros(B))
+    theta = torch.where(do, _uniform(-30, 30, B, g) * np.pi / 180, torch.zeros(B))
+    shift = torch.where(do, _uniform(-0.1, 0.1, B, g), torch.zeros(B))
+    x = spatial_random_affine_batch(x, scale, shear, theta, shift)
+
+    # random masking (p=0.5), a zero-size square masks nothing
+    size = torch.where(coin(0.5), _uniform(0.2, 0.4, B, g), torch.zeros(B))
+    x = spatial_mask_batch(x, size, torch.rand(B, generator=g), torch.rand(B, generator=g))
+
+    # padded frames were transformed too, keep them zero as pad_or_truncate would
+    return x * valid[:, :, None, None].to(x.dtype)
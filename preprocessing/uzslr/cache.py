@@ -0,0 +1,200 @@
+"""
+Content-addressed on-disk cache of preprocessed features for the deterministic splits.
+
+Validation and test samples are not augmented, so every epoch recomputes the same
+(MAX_LEN, 708) tensors. CachedDataset computes them once and serves them from a memory map:
+
+    {cache_root}/{config_hash}/features.npy   -> (N_entries, MAX_LEN, 708) float32, np.load(mmap_mode='r')
+    {cache_root}/{config_hash}/index.json     -> {"config": ..., "rows": {rep_hash: row}, "sources": {fingerprint: rep_hash},
+                                                  "users": {dataset cache_key: [fingerprint, ...]}}
+
+- config_hash covers POINT_LANDMARKS, MAX_LEN and PREPROCESS_VERSION: changing any of them
+  selects a new, empty cache directory, i.e. old features are never served.
+- rep_hash is the SHA-1 of the raw (T, 1662) landmarks (as float32), so the same repetition
+  is cached once, whether it is read from data/{split} or from a shard.
+- Source files are only re-read and re-hashed when their size/mtime fingerprint changes;
+  changed reps get a new entry, unchanged ones are served as before.
+- Every dataset using the cache (validation, test, a shard, ...) records its current
+  fingerprints under "users". Rows no user needs any more (old versions of changed reps) are
+  dropped whenever features.npy is rewritten for new entries, or when they exceed
+  COMPACT_UNUSED of the file; fingerprints no user has are dropped from "sources".
+- features.npy is rewritten next to the old file and renamed, index.json is written last.
+  Row numbers change when the file is rewritten, so CachedDataset maps its reps to rows when it
+  opens the memory map, from the index.json of that moment.
+
+    val_dataset = CachedDataset(SignDataset(DATA_ROOT, "validation"), CACHE_ROOT)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+from .config import POINT_LANDMARKS, MAX_LEN
+from .datasets import InMemorySignDataset
+from .preprocess import PREPROCESS_VERSION
+
+COMPACT_UNUSED = 0.25    # rewrite features.npy without the unused rows above this share of the file
+COPY_CHUNK = 1024        # rows copied at a time when features.npy is rewritten
+
+
+def config_hash(max_len=MAX_LEN, point_landmarks=POINT_LANDMARKS) -> str:
+    config = {"point_landmarks": [int(i) for i in point_landmarks], "max_len": int(max_len),
+              "preprocess_version": PREPROCESS_VERSION}
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def rep_hash(frames) -> str:
+    return hashlib.sha1(np.ascontiguousarray(frames, dtype=np.float32).tobytes()).hexdigest()
+
+
+class FeatureCache:
+    def __init__(self, cache_root, max_len=MAX_LEN, point_landmarks=POINT_LANDMARKS):
+        self.root = Path(cache_root)
+        self.config = {"point_landmarks": [int(i) for i in point_landmarks], "max_len": int(max_len),
+                       "preprocess_version": PREPROCESS_VERSION}
+        self.dir = self.root / config_hash(max_len, point_landmarks)
+        self.index_path = self.dir / "index.json"
+        self.features_path = self.dir / "features.npy"
+
+        self.rows, self.sources, self.users = {}, {}, {}
+        if self.index_path.exists() and self.features_path.exists():
+            index = json.loads(self.index_path.read_text())
+            self.rows, self.sources = index["rows"], index["sources"]
+            self.users = index.get("users", {})
+
+    def used(self) -> set:
+        """rep_hashes of the current fingerprints of all users."""
+        return {self.sources[fp] for fps in self.users.values() for fp in fps if fp in self.sources}
+
+    def update(self, entries: dict) -> bool:
+        """
+        entries: {rep_hash: (MAX_LEN, 708) features} that are not cached yet.
+        features.npy is rewritten with the used rows and the new entries when there are new
+        entries or too many unused rows; returns True if it was.
+        """
+        used = self.used()
+        keep = [h for h in self.rows if h in used]
+        n_unused = len(self.rows) - len(keep)
+        if not entries and n_unused <= COMPACT_UNUSED * len(self.rows):
+            return False
+        self._rewrite(keep, entries)
+        return True
+
+    def compact(self):
+        """Rewrite features.npy with the used rows only."""
+        self._rewrite([h for h in self.rows if h in self.used()], {})
+
+    def _rewrite(self, keep: list, entries: dict):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        old_rows = np.array(sorted(self.rows[h] for h in keep), dtype=np.int64)
+        by_row = {r: h for h, r in self.rows.items()}
+        if entries:
+            shape = next(iter(entries.values())).shape
+        else:
+            shape = np.load(self.features_path, mmap_mode="r").shape[1:] if self.features_path.exists() else (0, 0)
+
+        tmp = self.dir / "features.npy.tmp"
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=(len(keep) + len(entries), *shape))
+        rows = {}
+        if len(old_rows):
+            old = np.load(self.features_path, mmap_mode="r")
+            for start in range(0, len(old_rows), COPY_CHUNK):
+                chunk = old_rows[start:start + COPY_CHUNK]
+                out[start:start + len(chunk)] = old[chunk]
+            del old
+            rows = {by_row[r]: i for i, r in enumerate(old_rows.tolist())}
+        for i, (h, feats) in enumerate(entries.items(), start=len(keep)):
+            out[i] = feats
+            rows[h] = i
+        out.flush()
+        del out
+        os.replace(tmp, self.features_path)
+        self.rows = rows
+
+    def save_index(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        current = {fp for fps in self.users.values() for fp in fps}
+        self.sources = {fp: h for fp, h in self.sources.items() if fp in current}
+        tmp = self.index_path.with_name("index.json.tmp")
+        tmp.write_text(json.dumps({"config": self.config, "rows": self.rows, "sources": self.sources,
+                                   "users": self.users}))
+        os.replace(tmp, self.index_path)
+
+    def open(self, hashes: list) -> tuple[np.ndarray, np.ndarray]:
+        """(memory map of features.npy, row of every hash), read together from disk."""
+        rows = json.loads(self.index_path.read_text())["rows"]
+        return np.load(self.features_path, mmap_mode="r"), np.array([rows[h] for h in hashes], dtype=np.int64)
+
+    def prune_stale(self):
+        """Delete the cache directories of every other config."""
+        for d in self.root.iterdir():
+            if d.is_dir() and d != self.dir and (d / "index.json").exists():
+                shutil.rmtree(d)
+
+
+class CachedDataset(Dataset):
+    """
+    Serves a non-augmented SignDataset / ShardSignDataset from the feature cache.
+    Missing or changed samples are preprocessed once, in __init__; __getitem__ is a
+    single slice of the memory map (opened lazily in each DataLoader worker).
+    """
+    def __init__(self, dataset, cache_root):
+        if isinstance(dataset, InMemorySignDataset):
+            raise TypeError("CachedDataset cannot wrap an InMemorySignDataset: wrap the dataset it was built "
+                            "from instead (the cached features are memory-mapped already)")
+        if dataset.augment or dataset.batch_preprocess:
+            raise ValueError("Only deterministic datasets (augment=False, batch_preprocess=False) can be cached")
+        self.cache = FeatureCache(cache_root, dataset.max_len, dataset.preprocess.landmark_idx.tolist())
+
+        hashes, labels, fingerprints, new = [], [], [], {}
+        changed = False
+        for idx in range(len(dataset)):
+            fp = dataset.fingerprint(idx)
+            fingerprints.append(fp)
+            h = self.cache.sources.get(fp)
+            if h is None:   # new or modified source: read and hash it
+                raw = dataset.raw(idx)
+                h = rep_hash(raw)
+                self.cache.sources[fp] = h
+                changed = True
+                if h not in self.cache.rows and h not in new:
+                    new[h] = dataset.transform(raw, dataset.label(idx))[0].numpy()
+            hashes.append(h)
+            labels.append(dataset.label(idx))
+
+        key = dataset.cache_key()
+        if self.cache.users.get(key) != fingerprints:
+            self.cache.users[key] = fingerprints
+            changed = True
+        if self.cache.update(new) or changed:
+            self.cache.save_index()
+
+        self.hashes = hashes
+        self.labels = np.array(labels, dtype=np.int64)
+        self.n_computed = len(new)
+        self._features, self._rows = None, None
+
+    @property
+    def features(self):
+        if self._features is None:
+            self._features, self._rows = self.cache.open(self.hashes)
+        return self._features
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_features"] = state["_rows"] = None   # never pickle the memory map into worker processes
+        return state
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __getitem__(self, idx):
+        x = torch.from_numpy(np.array(self.features[self._rows[idx]]))
+        y = torch.tensor(self.labels[idx], dtype=torch.long)
+        return x, y
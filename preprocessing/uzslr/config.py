@@ -0,0 +1,84 @@
+"""
+Constants shared by the preprocessing pipeline (copied from 02_ak_preprocess_v1.ipynb).
+"""
+
+# 50 signs
+DEFAULT_SIGNS = ['assalomu_alaykum', 'bahor', 'birga', "bo'sh", 'bosh_kiyim', 'boshlanishi', 'bozor', 'eshik', 
+               'futbol', 'iltimos', 'internet', 'javob', 'jismoniy_tarbiya', 'karam', 'kartoshka', 
+               'kichik', 'kitob', "ko'prik", 'likopcha', 'maktab', 'mehmonxona', 'mehribon', 'metro', 
+               'musiqa', "o'simlik_yog'i", "o'ynash", 'ochish', 'ot', 'ovqat_tayyorlash', 
+               'oxiri', 'poezd', 'pomidor', 'qidirish', 'qish', "qo'ziqorin", 'qor', "qorong'i", 'quyon', 
+               'restoran', "sariyog'", 'shokolad', 'sovun', 'stakan', 'televizor', 'tosh', 'toza',
+               'turish', "yomg'ir", 'yopish', 'yordam_berish'] 
+
+SIGN2IDX = {s: i for i, s in enumerate(DEFAULT_SIGNS)}
+NUM_CLASSES = len(DEFAULT_SIGNS)   # 50 uzbek signs
+SPLITS = ["train", "validation", "test"]
+
+
+# Raw (1662,) frame layout
+FACE_LANDMARKS = 468
+POSE_LANDMARKS = 33
+HAND_LANDMARKS = 21
+
+FACE_START = 0
+FACE_END   = 468 * 3
+
+POSE_START = FACE_END
+POSE_END   = POSE_START + 33 * 4
+
+RH_START   = POSE_END
+RH_END     = RH_START + 21 * 3
+
+LH_START   = RH_END
+LH_END     = LH_START + 21 * 3
+
+VECTOR_SIZE = LH_END      # 1662
+ROWS_PER_FRAME = 543      # unpacked (543, 3)
+
+
+MAX_LEN = 32              # fixed
+PAD_VALUE = 0.0           # shorter frames are not padded
+
+
+# Selected landmarks (indices into the unpacked (543, 3) frame)
+NOSE=[
+    1,2,98,327
+]
+# additional info
+LNOSE = [98]
+RNOSE = [327]
+
+LIP = [ 0, 
+    61, 185, 40, 39, 37, 267, 269, 270, 409,
+    291, 146, 91, 181, 84, 17, 314, 405, 321, 375,
+    78, 191, 80, 81, 82, 13, 312, 311, 310, 415,
+    95, 88, 178, 87, 14, 317, 402, 318, 324, 308,
+]
+
+# additional info
+LLIP = [84,181,91,146,61,185,40,39,37,87,178,88,95,78,191,80,81,82]
+RLIP = [314,405,321,375,291,409,270,269,267,317,402,318,324,308,415,310,311,312]
+
+# as of now testing without a pose
+POSE = [500, 502, 504, 501, 503, 505, 512, 513]
+LPOSE = [513,505,503,501]
+RPOSE = [512,504,502,500]
+
+REYE = [
+    33, 7, 163, 144, 145, 153, 154, 155, 133,
+    246, 161, 160, 159, 158, 157, 173,
+]
+LEYE = [
+    263, 249, 390, 373, 374, 380, 381, 382, 362,
+    466, 388, 387, 386, 385, 384, 398,
+]
+
+RHAND = list(range(468 + 33 + 21, 468 + 33 + 42))
+LHAND = list(range(468 + 33, 468 + 33 + 21))
+
+
+POINT_LANDMARKS = LIP + LHAND + RHAND + NOSE + REYE + LEYE 
+
+NUM_NODES = len(POINT_LANDMARKS)  # 118 selected features
+CHANNELS = 6 * NUM_NODES          # 708 total output features
@@ -0,0 +1,312 @@
+"""
+Dataset classes (see section 3.4 of 02_ak_preprocess_v1.ipynb).
+
+SignDataset       -> loads every repetition of a split from disk: the reps listed in data/splits.json
+                     (dataset-prep/step02_train_val_test_split.py), or data/{split}/{sign}/rep-XX folders
+ShardSignDataset  -> serves the same samples from data/shards/{split} (built by dataset-prep/step03_build_shards.py)
+PrunedSignDataset -> serves the x,y-only export from data/pruned/{split} (built by dataset-prep/step04_export_pruned.py)
+InMemorySignDataset -> holds a whole split in one shared-memory tensor (opt-in, wraps any of the above)
+
+All return x: (MAX_LEN, 708) float32 and y: class index (0-49) long.
+
+With batch_preprocess=True the datasets return x un-preprocessed instead (raw (MAX_LEN, 1662)
+without augmentation, (MAX_LEN, 543, 3) after augmentation, (MAX_LEN, 118, 2) from
+PrunedSignDataset), and `collate_preprocess`
+computes the features of the whole batch in one call:
+
+    DataLoader(SignDataset(root, "validation", batch_preprocess=True),
+               batch_size=64, collate_fn=collate_preprocess)
+
+For training, `collate_augment_preprocess` also runs the augmentations per batch (augment_batch),
+so the dataset is built without augment:
+
+    DataLoader(SignDataset(root, "train", batch_preprocess=True),
+               batch_size=16, shuffle=True, collate_fn=collate_augment_preprocess)
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+from .config import SIGN2IDX, MAX_LEN, POINT_LANDMARKS, NUM_NODES
+from .preprocess import Preprocess, unpack_frames, pad_or_truncate
+from .augment import augment_fn, augment_batch, mirror_permutation, mirror_closure
+from .pruned import check_schema
+
+# landmark file format is defined by the video-collector
+sys.path.append(str(Path(__file__).resolve().parents[2] / "video-collector"))
+from mod06_landmark_io import load_rep, frame_count, rep_files
+# and the split manifest by dataset-prep
+sys.path.append(str(Path(__file__).resolve().parents[2] / "dataset-prep"))
+from split_manifest import SPLIT_MANIFEST, split_rep_dirs
+
+
+class SignDataset(Dataset):
+    """
+    `splits` names the split manifest inside root (default splits.json, e.g. "splits-fold2.json"
+    for k-fold); without a manifest the physical root/{split}/ folders are used.
+    """
+    def __init__(self, root, split="train", augment=False, max_len=MAX_LEN, batch_preprocess=False,
+                 splits=SPLIT_MANIFEST):
+        self.samples = []
+        self.root, self.split, self.splits = Path(root), split, splits
+        self.augment = augment
+        self.max_len = max_len
+        self.batch_preprocess = batch_preprocess
+        self.preprocess = Preprocess(max_len=max_len)
+
+        for sign, rep_dir in split_rep_dirs(root, split, splits):
+            if sign not in SIGN2IDX:
+                continue
+            if frame_count(rep_dir) == 0:
+                continue
+            self.samples.append((str(rep_dir), SIGN2IDX[sign]))
+        if not self.samples:
+            raise FileNotFoundError(f"No repetitions of split '{split}' found in {root}")
+
+    def __len__(self):
+        return len(self.samples)
+
+    def __getitem__(self, idx):
+        return self.transform(self.raw(idx), self.label(idx))
+
+    def raw(self, idx):
+        return load_rep(self.samples[idx][0])  # (T, 1662)
+
+    def label(self, idx):
+        return self.samples[idx][1]
+
+    def fingerprint(self, idx):
+        """Cheap identity of the source files of sample idx (path, size, mtime); see cache.py."""
+        rep_path = self.samples[idx][0]
+        files = rep_files(rep_path)
+        return "|".join(f"{p}:{p.stat().st_size}:{p.stat().st_mtime_ns}" for p in files)
+
+    def cache_key(self):
+        """Identity of the dataset itself (root, manifest, split); see cache.py."""
+        return f"{self.root.resolve()}|{self.splits}|{self.split}"
+
+    def transform(self, frames, label):
+        # frames: raw (T, 1662)
+        if self.augment: # may increase or decrease number of frames
+            x = augment_fn(unpack_frames(frames)) # augmentations expect (T, 543, 3)
+        else:
+            x = torch.as_tensor(frames, dtype=torch.float32) # stays raw, Preprocess gathers straight from (T, 1662)
+
+        x = pad_or_truncate(x, self.max_len) # helps to keep number of frames constant at 32 for each repetitions
+
+        if not self.batch_preprocess:
+            x = self.preprocess(x)  # normalizations, feature selection and engineering, dimensionality reduction
+        y = torch.tensor(label, dtype=torch.long)  # labels, folder name is the label
+        return x, y
+
+
+class ShardSignDataset(SignDataset):
+    """
+    Serves samples from a memory-mapped (N_reps, 32, 1662) shard.
+
+    Per sample there is no directory walk and no file open: __getitem__ is one slice of
+    the memory map. The map is opened lazily inside each DataLoader worker (and dropped
+    when the dataset is pickled), so all workers read through the same OS page cache
+    instead of each receiving a private copy of the array.
+    """
+    def __init__(self, shards_root, split="train", augment=False, max_len=MAX_LEN, batch_preprocess=False):
+        self.augment = augment
+        self.max_len = max_len
+        self.batch_preprocess = batch_preprocess
+        self.preprocess = Preprocess(max_len=max_len)
+
+        self.shard_dir = Path(shards_root) / split
+        meta_path = self.shard_dir / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No complete shard in {self.shard_dir}, run dataset-prep/step03_build_shards.py")
+        self.meta = json.loads(meta_path.read_text())
+
+        self.labels = np.load(self.shard_dir / "labels.npy")
+        self.reps = np.load(self.shard_dir / "reps.npy")   # provenance "{sign}/rep-XX" of every row
+        self._landmarks = None
+
+    @property
+    def landmarks(self):
+        if self._landmarks is None:
+            self._landmarks = np.load(self.shard_dir / "landmarks.npy", mmap_mode="r")
+        return self._landmarks
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_landmarks"] = None   # never pickle the memory map into worker processes
+        return state
+
+    def __len__(self):
+        return len(self.labels)
+
+    def raw(self, idx):
+        return np.array(self.landmarks[idx]) # (32, 1662)
+
+    def label(self, idx):
+        return int(self.labels[idx])
+
+    def fingerprint(self, idx):
+        p = self.shard_dir / "landmarks.npy"
+        st = p.stat()
+        return f"{p}:{st.st_size}:{st.st_mtime_ns}#{idx}"
+
+    def cache_key(self):
+        return str(self.shard_dir.resolve())
+
+
+class PrunedSignDataset(SignDataset):
+    """
+    Serves samples from the column-pruned export (see pruned.py): (32, N_landmarks, 2) x,y
+    per sample instead of (32, 1662). The schema is checked when the dataset is built, so an
+    export that lacks a landmark of POINT_LANDMARKS (or has an unknown layout) fails early.
+    The arrays are memory-mapped lazily inside each worker, like ShardSignDataset.
+
+    With augment=True the sample goes through augment_batch (as a batch of one): augment_fn
+    needs all 543 landmarks, the export only has the ones that are used.
+    """
+    def __init__(self, pruned_root, split="train", augment=False, max_len=MAX_LEN, batch_preprocess=False):
+        self.augment = augment
+        self.max_len = max_len
+        self.batch_preprocess = batch_preprocess
+        self.preprocess = Preprocess(max_len=max_len)
+
+        self.split_dir = Path(pruned_root) / split
+        schema_path = self.split_dir / "schema.json"
+        if not schema_path.exists():
+            raise FileNotFoundError(f"No complete export in {self.split_dir}, run dataset-prep/step04_export_pruned.py")
+        self.schema = json.loads(schema_path.read_text())
+        self.select = torch.tensor(check_schema(self.schema, POINT_LANDMARKS))  # export columns -> model order
+        self.mirror = mirror_permutation(self.schema["landmarks"]) if augment else None
+
+        self.labels = np.load(self.split_dir / "labels.npy")
+        self.reps = np.load(self.split_dir / "reps.npy")   # provenance "{sign}/rep-XX" of every row
+        self._landmarks = None
+        self._presence = None
+
+    @property
+    def landmarks(self):
+        if self._landmarks is None:
+            self._landmarks = np.load(self.split_dir / "landmarks.npy", mmap_mode="r")
+        return self._landmarks
+
+    @property
+    def presence(self):
+        """(N_reps, 32) uint8 hand presence bitmask (pruned.PRESENCE_RH / PRESENCE_LH), None if not exported."""
+        if self._presence is None and self.schema.get("hand_presence"):
+            self._presence = np.load(self.split_dir / "presence.npy", mmap_mode="r")
+        return self._presence
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_landmarks"] = state["_presence"] = None   # never pickle the memory maps into worker processes
+        return state
+
+    def __len__(self):
+        return len(self.labels)
+
+    def raw(self, idx):
+        return np.array(self.landmarks[idx]) # (32, N_landmarks, 2)
+
+    def label(self, idx):
+        return int(self.labels[idx])
+
+    def fingerprint(self, idx):
+        p = self.split_dir / "landmarks.npy"
+        st = p.stat()
+        return f"{p}:{st.st_size}:{st.st_mtime_ns}#{idx}"
+
+    def cache_key(self):
+        return str(self.split_dir.resolve())
+
+    def transform(self, frames, label):
+        # frames: (T, N_landmarks, 2) x,y in export order
+        x = torch.as_tensor(frames, dtype=torch.float32)
+        if self.augment:
+            x = augment_batch(x[None], length=self.max_len, perm=self.mirror)[0]
+        x = pad_or_truncate(x[:, self.select], self.max_len)   # (MAX_LEN, 118, 2)
+
+        if not self.batch_preprocess:
+            x = self.preprocess(x)
+        y = torch.tensor(label, dtype=torch.long)
+        return x, y
+
+
+class InMemorySignDataset(SignDataset):
+    """
+    Opt-in in-RAM mode: the raw landmarks of a whole split are loaded once into one
+    shared-memory tensor (N_reps, T, 1662) float32 ((N_reps, 32, N_landmarks, 2) for
+    PrunedSignDataset), before the DataLoader starts its workers.
+    Workers index that tensor directly: it is inherited on fork and passed by handle (not
+    copied) on spawn, so no worker touches the disk during training.
+
+        train_dataset = InMemorySignDataset(SignDataset(DATA_ROOT, "train", augment=True))
+
+    Load time and memory use are printed and kept in `load_seconds` / `nbytes`.
+    """
+    def __init__(self, dataset):
+        self.dataset = dataset   # only its transform is used from here on
+
+        t = time.perf_counter()
+        reps = [torch.as_tensor(dataset.raw(i), dtype=torch.float32) for i in range(len(dataset))]
+        self.lengths = torch.tensor([len(r) for r in reps], dtype=torch.long)
+        t_max = int(self.lengths.max())
+        self.frames = torch.zeros((len(reps), t_max, *reps[0].shape[1:]), dtype=torch.float32)
+        for i, r in enumerate(reps):
+            self.frames[i, :len(r)] = r
+        self.frames.share_memory_()
+        self.labels = torch.tensor([dataset.label(i) for i in range(len(dataset))], dtype=torch.long)
+        self.labels.share_memory_()
+
+        self.load_seconds = time.perf_counter() - t
+        self.nbytes = self.frames.element_size() * self.frames.nelement()
+        print(f"Loaded {len(reps)} reps into shared memory: "
+              f"{self.nbytes / 1e6:.1f} MB in {self.load_seconds:.2f}s")
+
+    def __len__(self):
+        return len(self.labels)
+
+    def raw(self, idx):
+        return self.frames[idx, :self.lengths[idx]]  # (T, 1662), a view, no copy
+
+    def label(self, idx):
+        return int(self.labels[idx])
+
+    def transform(self, frames, label):
+        return self.dataset.transform(frames, label)
+
+
+# Batch-level preprocessing (batch_preprocess=True)
+_batch_preprocess = Preprocess()
+# the 118 selected landmarks first, then the ones flip_lr can move into them
+_augment_landmarks = mirror_closure(POINT_LANDMARKS)
+_augment_select = Preprocess(point_landmarks=_augment_landmarks)
+_augment_mirror = mirror_permutation(_augment_landmarks)
+
+def collate_preprocess(batch):
+    """
+    collate_fn for datasets built with batch_preprocess=True:
+    stacks the raw / unpacked samples and runs Preprocess once for the whole batch.
+    returns: x (B, MAX_LEN, 708), y (B,)
+    """
+    xs, ys = zip(*batch)
+    return _batch_preprocess(torch.stack(xs)), torch.stack(ys)
+
+def collate_augment_preprocess(batch):
+    """
+    Training collate_fn: augmentation AND preprocessing once per batch.
+    Use with augment=False, batch_preprocess=True datasets (samples stay raw (MAX_LEN, 1662)).
+    Only the x,y of the selected landmarks (plus those flip_lr can swap into them) are
+    augmented: every transform acts per landmark, so the result is the same as augmenting
+    all 543 landmarks first.
+    returns: x (B, MAX_LEN, 708), y (B,)
+    """
+    xs, ys = zip(*batch)
+    x = _augment_select.select_xy(torch.stack(xs))             # (B, T, 118 + extra, 2)
+    x = augment_batch(x, perm=_augment_mirror)                  # (B, MAX_LEN, 118 + extra, 2)
+    return _batch_preprocess.features(x[:, :, :NUM_NODES]), torch.stack(ys)
@@ -0,0 +1,58 @@
+"""
+Index maps over the raw (1662,) and unpacked (543, 3) frame layouts.
+
+Pure Python (no torch), so that dataset-prep can import it without the training environment.
+"""
+
+from .config import (
+    ROWS_PER_FRAME, FACE_LANDMARKS, POSE_LANDMARKS, HAND_LANDMARKS,
+    FACE_START, POSE_START, RH_START, LH_START,
+    LHAND, RHAND, LLIP, RLIP, LPOSE, RPOSE, LEYE, REYE, LNOSE, RNOSE
+)
+
+
+# Column of the x value of every unpacked (543, 3) landmark inside the raw (1662,) frame
+def raw_columns(landmarks):
+    """
+    landmarks: indices into the unpacked (543, 3) frame
+    returns: (N,) index of each landmark's x column in the (1662,) layout (y is the next column)
+    """
+    cols = []
+    for i in landmarks:
+        if i < FACE_LANDMARKS:
+            cols.append(FACE_START + 3 * i)
+        elif i < FACE_LANDMARKS + POSE_LANDMARKS:
+            cols.append(POSE_START + 4 * (i - FACE_LANDMARKS))
+        elif i < FACE_LANDMARKS + POSE_LANDMARKS + HAND_LANDMARKS:
+            cols.append(RH_START + 3 * (i - FACE_LANDMARKS - POSE_LANDMARKS))
+        else:
+            cols.append(LH_START + 3 * (i - FACE_LANDMARKS - POSE_LANDMARKS - HAND_LANDMARKS))
+    return cols
+
+
+# Landmark each of the 543 landmarks is moved to by augment.flip_lr
+def mirror_map():
+    """Same swaps, in the same order, as flip_lr: out[i] is the landmark that ends up in slot i."""
+    perm = list(range(ROWS_PER_FRAME))
+    for a, b in ((LHAND, RHAND), (LLIP, RLIP), (LPOSE, RPOSE), (LEYE, REYE), (LNOSE, RNOSE)):
+        new_a, new_b = [perm[i] for i in b], [perm[i] for i in a]
+        for i, v in zip(a, new_a):
+            perm[i] = v
+        for i, v in zip(b, new_b):
+            perm[i] = v
+    return perm
+
+def mirror_closure(landmarks):
+    """
+    landmarks + every landmark flip_lr can move into them, in that order.
+    (LPOSE/RPOSE overlap the hand indices, so flipping moves pose landmark 500 into a hand slot.)
+    """
+    perm = mirror_map()
+    closed = list(landmarks)
+    seen = set(closed)
+    for lm in closed:   # grows while iterating
+        nxt = perm[lm]
+        if nxt not in seen:
+            seen.add(nxt)
+            closed.append(nxt)
+    return closed
@@ -0,0 +1,265 @@
+"""
+Feature selection, normalization and temporal features (see section 3.2 of 02_ak_preprocess_v1.ipynb).
+"""
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from .config import POINT_LANDMARKS, MAX_LEN, VECTOR_SIZE, ROWS_PER_FRAME
+from .layout import raw_columns
+
+
+# Convert (1662,) numpy ndarray -> (543,3) torch tensor
+def unpack_frame(vec):
+    """
+    vec: (1662,)
+    returns: (543, 3)
+    """
+    vec = torch.tensor(vec, dtype=torch.float32)
+
+    face = vec[0:468*3].reshape(468, 3)
+
+    pose = vec[468*3 : 468*3 + 33*4].reshape(33, 4)
+    pose = pose[:, :3]  # drop visibility
+
+    rh = vec[468*3 + 33*4 : 468*3 + 33*4 + 21*3].reshape(21, 3)
+    lh = vec[468*3 + 33*4 + 21*3 :].reshape(21, 3)
+
+    return torch.cat([face, pose, rh, lh], dim=0) # (543, 3)
+
+
+# Same as unpack_frame, but for all frames of a repetition at once
+def unpack_frames(x):
+    """
+    x: (..., 1662) numpy ndarray or torch tensor
+    returns: (..., 543, 3) torch.float32
+    """
+    x = torch.as_tensor(x, dtype=torch.float32)
+    lead = x.shape[:-1]
+
+    face = x[..., 0:468*3].reshape(*lead, 468, 3)
+    pose = x[..., 468*3 : 468*3 + 33*4].reshape(*lead, 33, 4)[..., :3]  # drop visibility
+    rh   = x[..., 468*3 + 33*4 : 468*3 + 33*4 + 21*3].reshape(*lead, 21, 3)
+    lh   = x[..., 468*3 + 33*4 + 21*3 :].reshape(*lead, 21, 3)
+
+    return torch.cat([face, pose, rh, lh], dim=-2) # (..., 543, 3)
+
+
+# Pad shorter sequences and Truncate longer sequences
+def pad_or_truncate(x, max_len=MAX_LEN):
+    """
+    Ensures temporal length is MAX_LEN: pad if shorter, truncate if longer
+    x: (T, 543, 3) or raw (T, 1662)
+    """
+    if x.shape[0] < max_len:
+        pad = torch.zeros((max_len - x.shape[0], *x.shape[1:]), dtype=x.dtype, device=x.device)
+        x = torch.cat([x, pad], dim=0)
+    else:
+        x = x[:max_len]
+    return x
+
+
+# Bump whenever the output of Preprocess changes (normalization, features, ...):
+# features cached by cache.FeatureCache are keyed by it and recomputed automatically.
+PREPROCESS_VERSION = 1
+
+
+class Preprocess(nn.Module):
+    """
+    Same features as the Preprocess module of 02_ak_preprocess_v1.ipynb, computed for a whole
+    batch at once:
+      - raw (…, 1662) input is never unpacked: the x,y values of the 118 selected landmarks are
+        gathered straight from the raw layout with a precomputed index map
+      - centering / std normalization are reduced per sample over (T, N)
+      - position, velocity and acceleration are written into one output tensor
+    """
+    def __init__(self, max_len=32, point_landmarks=POINT_LANDMARKS):
+        super().__init__()
+        self.max_len = max_len
+        self.register_buffer(
+            "landmark_idx",
+            torch.tensor(point_landmarks, dtype=torch.long)
+        )
+        cols = torch.tensor(raw_columns(point_landmarks), dtype=torch.long)
+        self.register_buffer("raw_xy_idx", torch.stack([cols, cols + 1], dim=-1).reshape(-1))  # (2N,)
+        self.center_pos = list(point_landmarks).index(17)   # nose reference inside the selection
+
+    def forward(self, x):
+        """
+        x: (1662,) single frame or,
+           (T, 1662) stacked frames or,
+           (T, 543, 3) only if augmentation is applied, which unpacks or,
+           (B, T, 1662) / (B, T, 543, 3) a whole batch (e.g. in a collate_fn) or,
+           (T, N, 2) / (B, T, N, 2) x,y of the selected landmarks already (column-pruned export)
+        returns: (T, 6 * NUM_NODES), or (B, T, 6 * NUM_NODES) for batched input
+        """
+        x = torch.as_tensor(x)
+        if x.dim() in (3, 4) and x.shape[-2:] == (len(self.landmark_idx), 2):
+            frames = x.to(torch.float32)
+            return self.features(frames) if x.dim() == 4 else self.features(frames[None])[0]
+        if x.dim() == 1 and x.shape[0] == VECTOR_SIZE:
+            return self.forward_batch(x[None, None])[0]     # (1, 708)
+        if x.dim() == 2 and x.shape[1] == VECTOR_SIZE:
+            return self.forward_batch(x[None])[0]
+        if x.dim() == 3 and x.shape[1:] == (ROWS_PER_FRAME, 3):
+            return self.forward_batch(x[None])[0]
+        if (x.dim() == 3 and x.shape[2] == VECTOR_SIZE) or (x.dim() == 4 and x.shape[2:] == (ROWS_PER_FRAME, 3)):
+            return self.forward_batch(x)
+        raise ValueError(f"Unexpected input shape {x.shape}")
+
+    def forward_batch(self, x):
+        """
+        x: (B, T, 1662) raw or (B, T, 543, 3) unpacked
+        returns: (B, T, 6 * NUM_NODES)
+        """
+        return self.features(self.select_xy(x))
+
+    def select_xy(self, x):
+        """
+        Gather only the x,y of the selected 118 landmarks.
+        x: (B, T, 1662) raw or (B, T, 543, 3) unpacked
+        returns: (B, T, N, 2) float32
+        """
+        B, T = x.shape[:2]
+        if x.shape[-1] == VECTOR_SIZE:
+            return x[..., self.raw_xy_idx].to(torch.float32).reshape(B, T, -1, 2)
+        return x[:, :, self.landmark_idx, :2].to(torch.float32)
+
+    def features(self, frames):
+        """
+        frames: (B, T, N, 2) output of select_xy (possibly augmented)
+        returns: (B, T, 6 * NUM_NODES)
+        """
+        B, T, n = frames.shape[:3]
+
+        # center using landmark 17 (nose reference), per sample
+        center = frames[:, :, self.center_pos:self.center_pos + 1]
+        center = torch.nanmean(center, dim=(1, 2), keepdim=True)                  # (B, 1, 1, 2)
+        center = torch.where(torch.isnan(center), torch.tensor(0.5, device=center.device), center)
+
+        # normalize relative to center
+        diff = frames - center
+        diff = torch.where(torch.isnan(diff), torch.zeros_like(diff), diff)  # replace NaN with 0
+        std = torch.sqrt(torch.mean(diff**2, dim=(1, 2), keepdim=True))      # manual standard deviation
+        std = torch.clamp(std, min=1e-6)
+
+        # position | velocity | acceleration, written into one (B, T, 3, N, 2) tensor
+        out = frames.new_zeros((B, T, 3, n, 2))
+        pos = torch.div(diff, std, out=out[:, :, 0])
+        torch.sub(pos[:, 1:], pos[:, :-1], out=out[:, 1:, 1])
+        torch.sub(pos[:, 2:], pos[:, :-2], out=out[:, 2:, 2])
+
+        return out.reshape(B, T, -1) # (B, T, 708)
+
+
+class StreamingPreprocess:
+    """
+    Preprocess for a live stream: push() one (1662,) frame at a time into a sliding window of
+    the last `max_len` frames.
+
+    The window is normalized as a whole (centered on the mean nose position, divided by the x / y
+    std), so every new frame changes the features of all frames of the window. push() keeps, per
+    frame, the sums the normalization needs (nose x,y sums, sum and sum of squares of the valid
+    x,y, valid counts) and adds / removes them as frames enter and leave the window:
+      - push(frame) costs O(N) whatever the window length: one gather of the 118 x,y, the
+        running sums, and the position / velocity / acceleration of the newest frame only,
+        which is the last row of Preprocess(window) (to float32 rounding, the std comes from
+        the running sums instead of a second pass). append(frame) only updates the window.
+      - window_features() returns the whole (T, 708) window, identical to Preprocess(window):
+        the gathered x,y are kept, so it runs only Preprocess.features, without re-gathering
+        from the raw frames
+    With exact=True, push() returns window_features() instead of the newest row.
+    Until `max_len` frames were pushed, the window is the frames pushed so far.
+
+    The per-frame work is a few hundred values, so it is done in numpy: torch's per-call
+    overhead would cost more than the arithmetic.
+    """
+    def __init__(self, max_len=MAX_LEN, point_landmarks=POINT_LANDMARKS, exact=False):
+        self.preprocess = Preprocess(max_len, point_landmarks)
+        self.max_len = max_len
+        self.exact = exact
+        self.xy_idx = self.preprocess.raw_xy_idx.numpy()
+        self.center_pos = self.preprocess.center_pos
+        n = len(point_landmarks)
+        self.xy = np.zeros((max_len, n, 2), dtype=np.float32)     # gathered x,y, ring
+        self.nan = np.zeros((max_len, n, 2), dtype=bool)
+        self.pos = np.zeros((3, n, 2), dtype=np.float32)          # scratch of newest_features
+        # per frame: nose sum (2) | nose count (2) | sum (2) | sum of squares (2) | count (2)
+        self.sums = np.zeros((max_len, 10), dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = np.zeros(10, dtype=np.float64)
+
+    def __len__(self):
+        """Number of frames in the window."""
+        return min(self.count, self.max_len)
+
+    def push(self, frame):
+        """
+        frame: (1662,) numpy ndarray or torch tensor
+        returns: (6 * NUM_NODES,) features of this frame, or (T, 6 * NUM_NODES) if exact
+        """
+        self.append(frame)
+        return self.window_features() if self.exact else self.newest_features()
+
+    def append(self, frame):
+        """Add a (1662,) frame to the window (dropping the oldest one when full), without features."""
+        slot = self.count % self.max_len
+        xy = self.xy[slot]
+        xy.reshape(-1)[:] = np.asarray(frame)[self.xy_idx]
+        nan = self.nan[slot]
+        np.isnan(xy, out=nan)
+        x0 = np.where(nan, 0.0, xy)     # float64
+        c = self.center_pos
+        sums = self.sums[slot]
+        if self.count >= self.max_len:
+            self.total -= sums
+        sums[0:2] = x0[c]
+        sums[2:4] = ~nan[c]
+        sums[4:6] = x0.sum(0)
+        sums[6:8] = np.einsum("ij,ij->j", x0, x0)
+        sums[8:10] = len(xy) - nan.sum(0)
+        self.total += sums
+        self.count += 1
+        if self.count % self.max_len == 0:      # re-sum once per window, so rounding never accumulates
+            self.total = self.sums.sum(0)
+
+    def center_std(self):
+        """Center (2,) and std (2,) of the window, per axis, from the running sums."""
+        nose_sum, nose_n, s1, s2, n = self.total.reshape(5, 2)
+        center = np.where(nose_n > 0, nose_sum / np.maximum(nose_n, 1), 0.5)
+        sq = np.maximum(s2 - 2 * center * s1 + n * center ** 2, 0)   # per axis sum of (x - center)^2 over valid values
+        std = np.maximum(np.sqrt(sq / (len(self) * self.xy.shape[1])), 1e-6)
+        return center.astype(np.float32), std.astype(np.float32)
+
+    def newest_features(self):
+        """(6 * NUM_NODES,) position | velocity | acceleration of the last pushed frame."""
+        center, std = self.center_std()
+        t = len(self)
+        pos = self.pos
+        for k in range(min(t, 3)):      # newest first
+            slot = (self.count - 1 - k) % self.max_len
+            np.divide(self.xy[slot] - center, std, out=pos[k])
+            pos[k][self.nan[slot]] = 0
+
+        out = np.zeros((3, *pos.shape[1:]), dtype=np.float32)
+        out[0] = pos[0]
+        if t > 1:
+            np.subtract(pos[0], pos[1], out=out[1])
+        if t > 2:
+            np.subtract(pos[0], pos[2], out=out[2])
+        return torch.from_numpy(out.reshape(-1))
+
+    def window(self):
+        """(T, N, 2) gathered x,y of the window, oldest frame first."""
+        if self.count <= self.max_len:
+            return self.xy[:self.count]
+        i = self.count % self.max_len
+        return np.concatenate([self.xy[i:], self.xy[:i]])
+
+    def window_features(self):
+        """(T, 6 * NUM_NODES), the same as Preprocess on the frames of the window."""
+        return self.preprocess.features(torch.from_numpy(self.window())[None])[0]
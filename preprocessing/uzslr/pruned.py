@@ -0,0 +1,88 @@
+"""
+Column-pruned landmark export: only the x,y of the landmarks the model uses.
+
+A raw frame holds 1662 values (all 468 face points, pose with visibility, z everywhere), but
+Preprocess only reads the x,y of 118 landmarks. The export written by
+dataset-prep/step04_export_pruned.py keeps just those columns, so a training run reads
+944 bytes per frame instead of 6648 (float32) or 13296 (float64 frame-XX.npy).
+
+For each split, data/pruned/{split}/ holds:
+    landmarks.npy   -> (N_reps, 32, N_landmarks, 2) float32, x,y in the order of schema["landmarks"]
+    presence.npy    -> (N_reps, 32) uint8 hand presence bitmask (optional, PRESENCE_RH | PRESENCE_LH)
+    labels.npy      -> (N_reps,) int64, index into DEFAULT_SIGNS
+    reps.npy        -> (N_reps,) str, provenance "{sign}/rep-XX" of every row
+    schema.json     -> what the columns are (written last, marks the export complete)
+
+The full 1662-value tree stays the archive; the export can always be rebuilt from it.
+Like layout.py this module does not import torch. Read the export with
+datasets.PrunedSignDataset, which checks the schema first.
+"""
+
+import numpy as np
+
+from .config import POINT_LANDMARKS, RH_START, RH_END, LH_START, LH_END, VECTOR_SIZE
+from .layout import raw_columns, mirror_closure
+
+SCHEMA_NAME = "uzslr-pruned-landmarks"
+SCHEMA_VERSION = 1
+
+# bits of presence.npy
+PRESENCE_RH = 1
+PRESENCE_LH = 2
+
+# the model's 118 landmarks first, then the ones flip_lr can move into them, so that the
+# export can still be augmented (see augment.mirror_closure)
+EXPORT_LANDMARKS = mirror_closure(POINT_LANDMARKS)
+
+
+def make_schema(landmarks=EXPORT_LANDMARKS, hand_presence=False) -> dict:
+    return {
+        "schema": SCHEMA_NAME,
+        "version": SCHEMA_VERSION,
+        "landmarks": [int(i) for i in landmarks],   # indices into the unpacked (543, 3) frame
+        "coords": ["x", "y"],
+        "source_columns": raw_columns(landmarks),   # x column of each landmark in the (1662,) frame
+        "dtype": "float32",
+        "hand_presence": {"rh": PRESENCE_RH, "lh": PRESENCE_LH} if hand_presence else None,
+    }
+
+
+def check_schema(schema: dict, landmarks=POINT_LANDMARKS) -> list[int]:
+    """
+    Make sure an export can serve `landmarks`; returns their positions in schema["landmarks"].
+    Raises ValueError for an unknown schema / version or missing landmarks.
+    """
+    if schema.get("schema") != SCHEMA_NAME or schema.get("version") != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported export schema {schema.get('schema')} v{schema.get('version')}, "
+                         f"expected {SCHEMA_NAME} v{SCHEMA_VERSION}; re-run step04_export_pruned.py")
+    if schema.get("coords") != ["x", "y"]:
+        raise ValueError(f"Unsupported coords {schema.get('coords')}")
+    pos = {lm: i for i, lm in enumerate(schema["landmarks"])}
+    missing = [lm for lm in landmarks if lm not in pos]
+    if missing:
+        raise ValueError(f"Export does not contain landmarks {missing}")
+    return [pos[lm] for lm in landmarks]
+
+
+def prune_frames(frames, landmarks=EXPORT_LANDMARKS) -> np.ndarray:
+    """
+    frames: raw (T, 1662)
+    returns: (T, N, 2) float32, the x,y of `landmarks`
+    """
+    frames = np.asarray(frames)
+    if frames.ndim != 2 or frames.shape[1] != VECTOR_SIZE:
+        raise ValueError(f"Expected (T, {VECTOR_SIZE}) frames, got {frames.shape}")
+    cols = np.asarray(raw_columns(landmarks))
+    return frames[:, np.stack([cols, cols + 1], axis=-1)].astype(np.float32)
+
+
+def hand_presence(frames) -> np.ndarray:
+    """
+    frames: raw (T, 1662)
+    returns: (T,) uint8, PRESENCE_RH / PRESENCE_LH set when that hand was detected
+    (a missing hand is stored as zeros by the recorder).
+    """
+    frames = np.asarray(frames)
+    rh = np.any(frames[:, RH_START:RH_END] != 0, axis=1)
+    lh = np.any(frames[:, LH_START:LH_END] != 0, axis=1)
+    return (rh * PRESENCE_RH | lh * PRESENCE_LH).astype(np.uint8)
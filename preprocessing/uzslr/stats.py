@@ -0,0 +1,255 @@
+"""
+Streaming landmark statistics for EDA, in constant memory.
+
+`01_ak_exploratory_analysis.ipynb` appends every value of every frame to Python lists before
+computing min/max/mean/std, so memory grows with the dataset. Here the frames are read in
+chunks and folded into fixed-size accumulators, per part (face, pose, rh, lh), per landmark
+and per axis:
+    count, mean, std     Welford / Chan et al. update, vectorized over all landmarks
+    min, max
+    nan, inf             counted, and left out of the moments
+    histogram            fixed bins per axis (HIST_RANGE, HIST_BINS), gives the median
+    missing              frames where a part is all zeros (MediaPipe found no face / hand)
+
+Accumulators of different chunks, files or workers merge exactly (`LandmarkStats.merge`), so
+`compute_stats` splits the reps over a process pool and adds up the partial results.
+Like layout.py this module does not import torch.
+"""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .config import (FACE_LANDMARKS, POSE_LANDMARKS, HAND_LANDMARKS, FACE_START, POSE_START,
+                     RH_START, LH_START, VECTOR_SIZE)
+
+# landmark file format is defined by the video-collector
+sys.path.append(str(Path(__file__).resolve().parents[2] / "video-collector"))
+from mod06_landmark_io import load_rep
+
+# name -> (first column in the (1662,) frame, landmarks, values per landmark, axis names)
+PARTS = {
+    "face": (FACE_START, FACE_LANDMARKS, 3, ("x", "y", "z")),
+    "pose": (POSE_START, POSE_LANDMARKS, 4, ("x", "y", "z", "vis")),
+    "rh":   (RH_START, HAND_LANDMARKS, 3, ("x", "y", "z")),
+    "lh":   (LH_START, HAND_LANDMARKS, 3, ("x", "y", "z")),
+}
+
+HIST_RANGE = (-2.0, 3.0)   # observed values lie in [-1.65, 2.46]; outliers go to the edge bins
+HIST_BINS = 500            # 0.01 wide
+CHUNK_FRAMES = 4096        # frames stacked before one vectorized update
+
+
+class RunningStats:
+    """Count, mean, M2, min and max of every element of `shape`, updated and merged in O(shape) memory."""
+
+    def __init__(self, shape):
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+
+    def update(self, x: np.ndarray, valid: np.ndarray):
+        """x: (n, *shape); only the values where `valid` is True are counted."""
+        if valid.all():   # the common case: no NaN / Inf, nothing left out
+            n, mean = np.full(x.shape[1:], len(x)), x.mean(axis=0)
+            self._combine(n, mean, ((x - mean) ** 2).sum(axis=0))
+            self.min = np.minimum(self.min, x.min(axis=0))
+            self.max = np.maximum(self.max, x.max(axis=0))
+            return
+        n = valid.sum(axis=0)
+        mean = np.where(valid, x, 0.0).sum(axis=0) / np.maximum(n, 1)
+        m2 = (np.where(valid, x - mean, 0.0) ** 2).sum(axis=0)
+        self._combine(n, mean, m2)
+        self.min = np.minimum(self.min, np.where(valid, x, np.inf).min(axis=0))
+        self.max = np.maximum(self.max, np.where(valid, x, -np.inf).max(axis=0))
+
+    def merge(self, other: "RunningStats"):
+        self._combine(other.count, other.mean, other.m2)
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+
+    def _combine(self, n, mean, m2):
+        total = self.count + n
+        delta = mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.mean = np.where(total > 0, self.mean + delta * n / total, 0.0)
+            self.m2 = np.where(total > 0, self.m2 + m2 + delta ** 2 * self.count * n / total, 0.0)
+        self.count = total
+
+    def reduce(self, axis) -> "RunningStats":
+        """The statistics of the union of the elements along `axis` (e.g. all landmarks of one axis)."""
+        out = RunningStats(np.delete(np.array(self.count.shape), np.atleast_1d(axis)))
+        out.count = self.count.sum(axis=axis)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out.mean = np.nan_to_num((self.count * self.mean).sum(axis=axis) / out.count)
+            out.m2 = (self.m2 + self.count * (self.mean - np.expand_dims(out.mean, axis)) ** 2).sum(axis=axis)
+        out.min = self.min.min(axis=axis)
+        out.max = self.max.max(axis=axis)
+        return out
+
+    @property
+    def std(self) -> np.ndarray:
+        """Population std (np.std)."""
+        return np.sqrt(self.m2 / np.maximum(self.count, 1))
+
+
+class LandmarkStats:
+    """
+    Accumulators for (T, 1662) frames. Memory does not depend on how many frames were added.
+    detected_only=True leaves a part out of the value statistics in frames where it is all
+    zeros (not detected); by default those zeros are counted, as in the EDA notebook.
+    """
+
+    def __init__(self, bins: int = HIST_BINS, hist_range=HIST_RANGE, detected_only: bool = False):
+        self.bins, self.hist_range, self.detected_only = bins, tuple(hist_range), detected_only
+        self.frames = 0
+        self.reps = 0
+        self.values = {name: RunningStats((n, d)) for name, (_, n, d, _) in PARTS.items()}
+        self.nan = {name: np.zeros((n, d), dtype=np.int64) for name, (_, n, d, _) in PARTS.items()}
+        self.inf = {name: np.zeros((n, d), dtype=np.int64) for name, (_, n, d, _) in PARTS.items()}
+        self.hist = {name: np.zeros((d, bins), dtype=np.int64) for name, (_, _, d, _) in PARTS.items()}
+        self.missing = {name: 0 for name in PARTS}
+        self.missing["both_hands"] = 0
+
+    def update(self, frames: np.ndarray, reps: int = 1):
+        """frames: (T, 1662), one rep or several stacked reps."""
+        frames = np.asarray(frames, dtype=np.float64)
+        if frames.ndim != 2 or frames.shape[1] != VECTOR_SIZE:
+            raise ValueError(f"Expected (T, {VECTOR_SIZE}) frames, got {frames.shape}")
+        self.frames += len(frames)
+        self.reps += reps
+
+        lo, hi = self.hist_range
+        missing = {}
+        for name, (start, n, d, _) in PARTS.items():
+            x = frames[:, start:start + n * d].reshape(-1, n, d)
+            finite = np.isfinite(x)
+            missing[name] = ~np.any(x != 0, axis=(1, 2))   # NaN counts as present
+            self.missing[name] += int(missing[name].sum())
+            self.nan[name] += np.isnan(x).sum(axis=0)
+            self.inf[name] += np.isinf(x).sum(axis=0)
+
+            valid = finite & ~missing[name][:, None, None] if self.detected_only else finite
+            self.values[name].update(x, valid)
+
+            # one bincount for all axes: bin index + axis * bins
+            idx = np.clip(((np.where(valid, x, lo) - lo) * (self.bins / (hi - lo))).astype(np.int64),
+                          0, self.bins - 1) + np.arange(d) * self.bins
+            idx = idx[valid]
+            self.hist[name] += np.bincount(idx, minlength=d * self.bins).reshape(d, self.bins)
+        self.missing["both_hands"] += int((missing["rh"] & missing["lh"]).sum())
+
+    def merge(self, other: "LandmarkStats"):
+        if (other.bins, other.hist_range, other.detected_only) != (self.bins, self.hist_range, self.detected_only):
+            raise ValueError("Cannot merge statistics with different bins, range or detected_only")
+        self.frames += other.frames
+        self.reps += other.reps
+        for name in PARTS:
+            self.values[name].merge(other.values[name])
+            self.nan[name] += other.nan[name]
+            self.inf[name] += other.inf[name]
+            self.hist[name] += other.hist[name]
+        for key in self.missing:
+            self.missing[key] += other.missing[key]
+
+    def quantile(self, name: str, axis: int, q: float) -> float:
+        """Approximate quantile of one axis of a part, from its histogram (accurate to one bin)."""
+        hist = self.hist[name][axis]
+        total = hist.sum()
+        if total == 0:
+            return float("nan")
+        lo, hi = self.hist_range
+        width = (hi - lo) / self.bins
+        cum = np.cumsum(hist)
+        i = int(np.searchsorted(cum, q * total))
+        before = cum[i - 1] if i > 0 else 0
+        return float(lo + width * (i + (q * total - before) / max(hist[i], 1)))
+
+    def summary(self) -> dict:
+        """Per part and axis: count, mean, std, min, max, median, nan, inf; and missing rates."""
+        out = {"frames": self.frames, "reps": self.reps, "detected_only": self.detected_only, "parts": {},
+               "missing_rate": {key: count / max(self.frames, 1) for key, count in self.missing.items()}}
+        for name, (_, _, _, axes) in PARTS.items():
+            per_axis = self.values[name].reduce(0)
+            out["parts"][name] = {
+                axis: {
+                    "count": int(per_axis.count[i]),
+                    "mean": float(per_axis.mean[i]),
+                    "std": float(per_axis.std[i]),
+                    "min": float(per_axis.min[i]),
+                    "max": float(per_axis.max[i]),
+                    "median": self.quantile(name, i, 0.5),
+                    "nan": int(self.nan[name][:, i].sum()),
+                    "inf": int(self.inf[name][:, i].sum()),
+                }
+                for i, axis in enumerate(axes)
+            }
+        return out
+
+    def per_landmark(self) -> dict:
+        """{part: {"mean", "std", "min", "max", "count"}} as (landmarks, axes) lists, for JSON."""
+        return {name: {"mean": s.mean.tolist(), "std": s.std.tolist(), "min": s.min.tolist(),
+                       "max": s.max.tolist(), "count": s.count.tolist()}
+                for name, s in self.values.items()}
+
+
+def format_summary(summary: dict) -> str:
+    """Same layout as the tables of the EDA notebook."""
+    titles = {"face": "FACE", "pose": "POSE", "rh": "RIGHT HAND", "lh": "LEFT HAND"}
+    lines = [f"{summary['reps']} reps, {summary['frames']} frames"
+             + (" (values of undetected parts left out)" if summary["detected_only"] else "")]
+    for name, axes in summary["parts"].items():
+        lines.append(f"\n{titles[name]}:")
+        for axis, s in axes.items():
+            lines.append(f"{axis:>3} | median={s['median']:.5f}  mean={s['mean']:.5f}  std={s['std']:.5f}  "
+                         f"min={s['min']:.5f}  max={s['max']:.5f}")
+        lines.append(f"NaNs: {sum(s['nan'] for s in axes.values())}  Infs: {sum(s['inf'] for s in axes.values())}")
+    rates = summary["missing_rate"]
+    lines.append("\nMissing (all zeros), share of frames: "
+                 + "  ".join(f"{key}={rate:.2%}" for key, rate in rates.items()))
+    return "\n".join(lines)
+
+
+# Streaming over a landmark tree
+def _stats_of_reps(rep_dirs: list, bins: int, hist_range, detected_only: bool, chunk_frames: int) -> LandmarkStats:
+    """One worker task: the reps are loaded one by one and folded in every `chunk_frames` frames."""
+    stats = LandmarkStats(bins, hist_range, detected_only)
+    chunk, n_frames = [], 0
+    for rep_dir in rep_dirs:
+        frames = load_rep(rep_dir)
+        chunk.append(frames)
+        n_frames += len(frames)
+        if n_frames >= chunk_frames:
+            stats.update(np.concatenate(chunk), reps=len(chunk))
+            chunk, n_frames = [], 0
+    if chunk:
+        stats.update(np.concatenate(chunk), reps=len(chunk))
+    return stats
+
+def compute_stats(rep_dirs, workers: Optional[int] = None, bins: int = HIST_BINS, hist_range=HIST_RANGE,
+                  detected_only: bool = False, chunk_frames: int = CHUNK_FRAMES) -> LandmarkStats:
+    """
+    Statistics of all frames of `rep_dirs` (packed or legacy rep folders).
+    The reps are dealt into a few tasks per worker process; every task returns a
+    fixed-size LandmarkStats and the results are merged in task order.
+    """
+    rep_dirs = [str(r) for r in rep_dirs]
+    workers = workers or os.cpu_count()
+    args = (bins, hist_range, detected_only, chunk_frames)
+    if workers == 1 or len(rep_dirs) < 2:
+        return _stats_of_reps(rep_dirs, *args)
+
+    n_tasks = min(len(rep_dirs), workers * 4)
+    tasks = [rep_dirs[i::n_tasks] for i in range(n_tasks)]
+    total = LandmarkStats(bins, hist_range, detected_only)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for partial in pool.map(_stats_of_reps, tasks, *[[a] * n_tasks for a in args]):
+            total.merge(partial)
+    return total
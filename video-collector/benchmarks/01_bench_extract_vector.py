@@ -0,0 +1,103 @@
+"""
+(READ-ONLY file)
+Micro-benchmark of `extract_vector` (mod03_recorder.py).
+
+Builds synthetic MediaPipe results (face 468, pose 33, both hands 21) as real
+NormalizedLandmarkList protobufs, and times:
+    baseline  -> the previous implementation (pose visibility loop + list comprehensions + concatenate)
+    vector    -> extract_vector(results), returns a new (1662,) array
+    into      -> extract_vector_into(results, landmarks[f_idx]), fills the (32, 1662) rep buffer in place
+
+Both implementations are checked for identical output first, with and without missing hands/pose.
+Nothing is written to disk.
+
+Run from video-collector/benchmarks:
+    python 01_bench_extract_vector.py
+"""
+
+import copy
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from mod01_config import FRAMES_PER_REP, POSE_REMOVE_IDX
+from mod03_recorder import extract_vector, extract_vector_into
+from mod06_landmark_io import VECTOR_SIZE
+
+N_CALLS = 2000
+rng = np.random.default_rng(0)
+
+
+def make_landmarks(n: int, with_visibility: bool = False):
+    msg = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z, v in rng.random((n, 4)):
+        lm = msg.landmark.add(x=x, y=y, z=z - 0.5)
+        if with_visibility:
+            lm.visibility = v
+            lm.presence = v
+    return msg
+
+
+def make_results(pose=True, right=True, left=True):
+    return SimpleNamespace(
+        face_landmarks=make_landmarks(468),
+        pose_landmarks=make_landmarks(33, with_visibility=True) if pose else None,
+        right_hand_landmarks=make_landmarks(21) if right else None,
+        left_hand_landmarks=make_landmarks(21) if left else None,
+    )
+
+
+# previous implementation, kept here as the reference
+def extract_vector_baseline(results):
+    if results.pose_landmarks:
+        for idx in POSE_REMOVE_IDX:
+            results.pose_landmarks.landmark[idx].visibility = 0.0
+    pose = np.array([[res.x, res.y, res.z, res.visibility] for res in results.pose_landmarks.landmark]).flatten() if results.pose_landmarks else np.zeros(33*4)
+    face = np.array([[res.x, res.y, res.z] for res in results.face_landmarks.landmark]).flatten() if results.face_landmarks else np.zeros(468*3)
+    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21*3)
+    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21*3)
+    return np.concatenate([face, pose, rh, lh])
+
+
+def time_us(fn) -> float:
+    fn()  # warm-up
+    t = time.perf_counter()
+    for _ in range(N_CALLS):
+        fn()
+    return (time.perf_counter() - t) / N_CALLS * 1e6
+
+
+if __name__ == "__main__":
+    # 1. Equivalence
+    for flags in [(True, True, True), (True, False, True), (True, True, False), (False, True, True)]:
+        results = make_results(*flags)
+        expected = extract_vector_baseline(copy.deepcopy(results))
+        assert np.array_equal(extract_vector(results), expected), f"mismatch for pose/right/left = {flags}"
+    print("Output identical to the baseline implementation.\n")
+
+    # 2. Timing
+    results = make_results()
+    landmarks = np.zeros((FRAMES_PER_REP, VECTOR_SIZE))
+    f_idx = 0
+
+    def fill_rep():
+        global f_idx
+        extract_vector_into(results, landmarks[f_idx])
+        f_idx = (f_idx + 1) % FRAMES_PER_REP
+
+    timings = {
+        "baseline": time_us(lambda: extract_vector_baseline(results)),
+        "vector":   time_us(lambda: extract_vector(results)),
+        "into":     time_us(fill_rep),
+    }
+    base = timings["baseline"]
+    print(f"{'variant':<10} {'us/frame':>10} {'speed-up':>10}")
+    for name, us in timings.items():
+        print(f"{name:<10} {us:>10.1f} {base / us:>9.2f}x")
+    print(f"\nPer repetition ({FRAMES_PER_REP} frames): "
+          f"{base * FRAMES_PER_REP / 1000:.2f} ms -> {timings['into'] * FRAMES_PER_REP / 1000:.2f} ms")
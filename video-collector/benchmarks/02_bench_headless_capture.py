@@ -0,0 +1,80 @@
+"""
+(READ-ONLY file)
+Throughput benchmark of the recording hot path, without camera or display.
+
+Replays a video file (or a folder of frames) through mod10_headless.run_headless for both
+recorders and reports:
+    fps            -> recorded frames (frames_written of every rep) / total wall time
+    per-rep wall   -> mean, p50 and max seconds per 32-frame repetition
+    peak RSS       -> maximum resident memory of the process so far (MB), so the pipelined
+                      row also covers the sync run before it
+
+Everything is written into a temporary DATA_ROOT that is deleted afterwards, the real dataset
+is never touched. Pass --realtime to pace the source at FPS like a webcam (then fps shows
+whether the recorder keeps up with the camera).
+
+Run from video-collector/benchmarks:
+    python 02_bench_headless_capture.py ../Data_Numpy_Arrays_RSL_UzSL/signer01/bahor/videos/rep-0/video.mp4
+    python 02_bench_headless_capture.py path/to/frames_dir --reps 20 --realtime
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from mod01_config import FRAMES_PER_REP
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:   # Windows
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1e6 if sys.platform == "darwin" else rss / 1e3   # bytes on macOS, KB on Linux
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("source", help="video file or directory of frames")
+    parser.add_argument("--reps", type=int, default=10)
+    parser.add_argument("--realtime", action="store_true")
+    args = parser.parse_args()
+    source = Path(args.source).resolve()
+
+    # DATA_ROOT is relative to the working directory, so a scratch cwd keeps the dataset clean
+    scratch = tempfile.mkdtemp(prefix="uzsl_bench_")
+    os.chdir(scratch)
+    from mod10_headless import run_headless
+
+    report = {}
+    try:
+        for name, pipelined in (("sync", False), ("pipelined", True)):
+            timings = run_headless(source, "signer99", f"bench_{name}", args.reps,
+                                   pipelined=pipelined, realtime=args.realtime)
+            wall = np.array([t["wall_seconds"] for t in timings])
+            written = sum(t["frames_written"] for t in timings)
+            report[name] = {
+                "reps": len(wall),
+                "fps": round(written / wall.sum(), 2),
+                "rep_mean_s": round(float(wall.mean()), 4),
+                "rep_p50_s": round(float(np.median(wall)), 4),
+                "rep_max_s": round(float(wall.max()), 4),
+                "peak_rss_mb": round(peak_rss_mb(), 1),
+            }
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(f"\nsource: {source} ({args.reps} reps x {FRAMES_PER_REP} frames, realtime={args.realtime})\n")
+    print(f"{'recorder':<10} {'fps':>8} {'mean s':>8} {'p50 s':>8} {'max s':>8} {'peak RSS MB':>12}")
+    for name, r in report.items():
+        print(f"{name:<10} {r['fps']:>8.1f} {r['rep_mean_s']:>8.3f} {r['rep_p50_s']:>8.3f} "
+              f"{r['rep_max_s']:>8.3f} {r['peak_rss_mb']:>12.1f}")
+    print("\n" + json.dumps(report))
@@ -0,0 +1,121 @@
+"""
+(READ-ONLY file)
+Benchmark of the MediaPipe extraction profiles (MP_PROFILES in mod01_config.py).
+
+The frames of a video file (or a folder of frames) are decoded once into memory, then every
+profile runs over them with a fresh extractor (mod03_recorder.make_holistic) and reports:
+    process     -> ms per frame of the extractor (cvtColor + Holistic / SplitHolistic), p50 and p95
+    draw        -> ms per frame of draw_landmarks with the profile's "draw" mode
+    fps         -> 1000 / mean(process + draw), i.e. the most a station can record with this profile
+    drift       -> mean |x,y difference| to the "full" profile per part (face, pose, right, left hand),
+                   in normalized image units, over the frames where both detected the part. The
+                   landmarks are cut into 32-frame reps and go through fill_skipped_faces first,
+                   as in the recorder.
+    missed      -> % of frames where a part was detected by one profile but not the other
+
+Nothing is written to disk.
+
+Run from video-collector/benchmarks:
+    python 03_bench_mp_profiles.py ../Data_Numpy_Arrays_RSL_UzSL/signer01/bahor/videos/rep-0/video.mp4
+    python 03_bench_mp_profiles.py path/to/frames_dir --frames 600 --profiles full low_power
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from mod01_config import FRAMES_PER_REP, FPS, MP_PROFILES
+from mod03_recorder import make_holistic, draw_landmarks, extract_vector_into, fill_skipped_faces
+from mod06_landmark_io import VECTOR_SIZE
+from mod10_headless import ReplayCapture
+
+# x,y columns of each part in the 1662 layout
+PARTS = {
+    "face": np.arange(0, 1404).reshape(468, 3)[:, :2],
+    "pose": np.arange(1404, 1536).reshape(33, 4)[:, :2],
+    "rh":   np.arange(1536, 1599).reshape(21, 3)[:, :2],
+    "lh":   np.arange(1599, 1662).reshape(21, 3)[:, :2],
+}
+
+
+def read_frames(source: Path, limit: int) -> list[np.ndarray]:
+    cap = ReplayCapture(source, loop=False)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def run_profile(name: str, frames: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """-> (landmarks (T, 1662), process ms (T,), draw ms (T,))"""
+    extractor = make_holistic(profile=name)
+    landmarks = np.zeros((len(frames), VECTOR_SIZE), dtype=np.float32)
+    process_ms, draw_ms = np.zeros(len(frames)), np.zeros(len(frames))
+    try:
+        for i, frame in enumerate(frames):
+            t0 = time.perf_counter()
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            frame_rgb.flags.writeable = False
+            results = extractor.process(frame_rgb)
+            t1 = time.perf_counter()
+            draw_landmarks(frame.copy(), results, MP_PROFILES[name]["draw"])
+            t2 = time.perf_counter()
+            extract_vector_into(results, landmarks[i])
+            process_ms[i], draw_ms[i] = (t1 - t0) * 1e3, (t2 - t1) * 1e3
+    finally:
+        extractor.close()
+
+    for start in range(0, len(frames), FRAMES_PER_REP):
+        fill_skipped_faces(landmarks[start:start + FRAMES_PER_REP], name)
+    return landmarks, process_ms, draw_ms
+
+
+def drift(landmarks: np.ndarray, reference: np.ndarray) -> dict[str, tuple[float, float]]:
+    """part -> (mean |x,y difference| where both detected, % of frames detected by only one)"""
+    out = {}
+    for part, cols in PARTS.items():
+        a, b = landmarks[:, cols], reference[:, cols]
+        found_a, found_b = a.any(axis=(1, 2)), b.any(axis=(1, 2))
+        both = found_a & found_b
+        mean = float(np.abs(a[both] - b[both]).mean()) if both.any() else float("nan")
+        out[part] = (mean, float((found_a != found_b).mean() * 100))
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("source", help="video file or directory of frames")
+    parser.add_argument("--frames", type=int, default=300, help="number of frames to use")
+    parser.add_argument("--profiles", nargs="+", default=list(MP_PROFILES), choices=list(MP_PROFILES))
+    args = parser.parse_args()
+
+    frames = read_frames(Path(args.source), args.frames)
+    if not frames:
+        print(f"No frames could be read from {args.source}")
+        sys.exit(1)
+    h, w = frames[0].shape[:2]
+    print(f"\n{len(frames)} frames of {w}x{h}\n")
+
+    profiles = ["full"] + [p for p in args.profiles if p != "full"]
+    reference = None
+    print(f"{'profile':<10} {'process p50':>11} {'p95':>7} {'draw':>7} {'fps':>6}  "
+          + " ".join(f"{'drift ' + p:>10}" for p in PARTS) + "  " + " ".join(f"{'missed ' + p:>10}" for p in PARTS))
+    for name in profiles:
+        landmarks, process_ms, draw_ms = run_profile(name, frames)
+        if reference is None:
+            reference = landmarks
+        fps = 1e3 / (process_ms + draw_ms).mean()
+        d = drift(landmarks, reference)
+        print(f"{name:<10} {np.percentile(process_ms, 50):>8.1f} ms {np.percentile(process_ms, 95):>7.1f} "
+              f"{draw_ms.mean():>7.1f} {fps:>5.0f}{'' if fps >= FPS else '!'} "
+              + " ".join(f"{d[p][0]:>10.4f}" for p in PARTS) + "  " + " ".join(f"{d[p][1]:>9.1f}%" for p in PARTS))
+    print(f"\n! = below FPS ({FPS}), the profile cannot keep up with the camera on this machine")
@@ -0,0 +1,115 @@
+"""
+(READ-ONLY file)
+Benchmark of the MediaPipe inference resolution (MP_INFERENCE_WIDTH in mod01_config.py).
+
+Stored videos/rep-XX/video.mp4 repetitions are decoded once into memory and replayed through
+mod03_recorder.detect_landmarks (the recorder's own path, with MP_PROFILE) at several input
+widths. The tracking state is reset before every video, like a new recording. Reported per width:
+    latency     -> ms per frame of detect_landmarks (resize + cvtColor + MediaPipe), p50 and p95
+    fps         -> 1000 / mean latency
+    deviation   -> mean |x,y difference| to the full-resolution run per part (face, pose, right,
+                   left hand), in normalized image units (0.001 = 1.3 px at 1280 px wide), over
+                   the frames where both runs detected the part
+    missed      -> % of frames where a hand was detected by one run but not the other
+
+Nothing is written to disk. Pick the smallest width whose deviation is acceptable.
+
+Run from video-collector/benchmarks:
+    python 04_bench_inference_resolution.py                                  # 20 reps of ../Data_Numpy_Arrays_RSL_UzSL
+    python 04_bench_inference_resolution.py path/to/tree --reps 50 --widths 960 640 480
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from mod01_config import FRAME_WIDTH, FPS, MP_PROFILE
+import mod03_recorder
+from mod03_recorder import detect_landmarks, extract_vector_into
+from mod06_landmark_io import VECTOR_SIZE
+
+WIDTHS = [960, 640, 480, 320]
+
+# x,y columns of each part in the 1662 layout
+PARTS = {
+    "face": np.arange(0, 1404).reshape(468, 3)[:, :2],
+    "pose": np.arange(1404, 1536).reshape(33, 4)[:, :2],
+    "rh":   np.arange(1536, 1599).reshape(21, 3)[:, :2],
+    "lh":   np.arange(1599, 1662).reshape(21, 3)[:, :2],
+}
+
+
+def read_video(path: Path) -> list[np.ndarray]:
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def run_width(videos: list[list[np.ndarray]], width) -> tuple[np.ndarray, np.ndarray]:
+    """-> (landmarks (frames, 1662) of all videos, ms per frame)"""
+    landmarks = np.zeros((sum(len(v) for v in videos), VECTOR_SIZE), dtype=np.float32)
+    ms = np.zeros(len(landmarks))
+    i = 0
+    for frames in videos:
+        mod03_recorder.holistic.reset()
+        for frame in frames:
+            t = time.perf_counter()
+            _, results = detect_landmarks(frame, width=width)
+            ms[i] = (time.perf_counter() - t) * 1e3
+            extract_vector_into(results, landmarks[i])
+            i += 1
+    return landmarks, ms
+
+
+def deviation(landmarks: np.ndarray, reference: np.ndarray) -> dict[str, tuple[float, float]]:
+    """part -> (mean |x,y difference| where both detected, % of frames detected by only one)"""
+    out = {}
+    for part, cols in PARTS.items():
+        a, b = landmarks[:, cols], reference[:, cols]
+        found_a, found_b = a.any(axis=(1, 2)), b.any(axis=(1, 2))
+        both = found_a & found_b
+        mean = float(np.abs(a[both] - b[both]).mean()) if both.any() else float("nan")
+        out[part] = (mean, float((found_a != found_b).mean() * 100))
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("root", nargs="?", default="../Data_Numpy_Arrays_RSL_UzSL",
+                        help="tree with signerXX/{sign}/videos/rep-XX/video.mp4 (or any folder of video.mp4)")
+    parser.add_argument("--reps", type=int, default=20, help="number of videos to replay")
+    parser.add_argument("--widths", type=int, nargs="+", default=WIDTHS)
+    args = parser.parse_args()
+
+    paths = sorted(Path(args.root).rglob("video.mp4"))[:args.reps]
+    videos = [frames for frames in map(read_video, paths) if frames]
+    if not videos:
+        print(f"No readable video.mp4 found under {Path(args.root).resolve()}")
+        sys.exit(1)
+    h, w = videos[0][0].shape[:2]
+    print(f"\n{len(videos)} videos, {sum(map(len, videos))} frames of {w}x{h}, profile {MP_PROFILE}\n")
+
+    print(f"{'width':>6} {'latency p50':>11} {'p95':>7} {'fps':>6}  "
+          + " ".join(f"{'dev ' + p:>8}" for p in PARTS) + "  " + " ".join(f"{'missed ' + p:>9}" for p in ("rh", "lh")))
+    reference = None
+    for width in [None] + [wd for wd in args.widths if wd < w]:
+        landmarks, ms = run_width(videos, width)
+        if reference is None:
+            reference = landmarks
+        fps = 1e3 / ms.mean()
+        d = deviation(landmarks, reference)
+        print(f"{width or w:>6} {np.percentile(ms, 50):>8.1f} ms {np.percentile(ms, 95):>7.1f} "
+              f"{fps:>5.0f}{'' if fps >= FPS else '!'} "
+              + " ".join(f"{d[p][0]:>8.4f}" for p in PARTS) + "  " + " ".join(f"{d[p][1]:>8.1f}%" for p in ("rh", "lh")))
+    print(f"\n! = below FPS ({FPS}). The recorded video keeps {FRAME_WIDTH} px whatever MP_INFERENCE_WIDTH is.")
@@ -1,18 +1,23 @@
 """
 (READ-ONLY file)
-This file verifies that every frame-*.npy file in the dataset has the exact shape (1662,).
+This file verifies that every frame-*.npy file in the dataset has the exact shape (1662,),
+and that every packed landmarks.npy file has the exact shape (32, 1662).
 
-It is completely READ-ONLY: it only loads each .npy file to check its shape using np.load(),
-with no writing, saving, or modification of any file.
+It is completely READ-ONLY: it only reads the header of each .npy file to check its shape
+(read_npy_header, the array data is never loaded), with no writing, saving, or modification of any file.
+mod11_validate.py runs this check together with all others in one parallel pass.
 
 The script walks through the full directory structure (signers -> signs -> landmarks -> repetitions -> frames),
 counts all checked files, reports progress per signer, and lists any file with a wrong shape or loading error.
 """
 
 import os
-import numpy as np
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from mod06_landmark_io import read_npy_header
+
 # Base directory containing signer01 to signer10
 root_dir = Path('../Data_Numpy_Arrays_RSL_UzSL')
 
@@ -49,22 +54,34 @@ for signer_dir in sorted(root_dir.iterdir()):
             if not rep_dir.is_dir() or not rep_dir.name.startswith('rep-'):
                 continue
             
+            packed_path = rep_dir / 'landmarks.npy'
+            if packed_path.exists():
+                total_files += 1
+                try:
+                    shape, _ = read_npy_header(packed_path)
+                    if shape != (32, 1662):
+                        all_correct = False
+                        issues.append(f"Wrong shape: {packed_path.relative_to(root_dir)} -> {shape}")
+                except Exception as e:
+                    all_correct = False
+                    issues.append(f"Error loading: {packed_path.relative_to(root_dir)} -> {str(e)}")
+
             for npy_path in rep_dir.glob('frame-*.npy'):
                 total_files += 1
                 try:
-                    arr = np.load(npy_path)  # Loads the array without modifying the file
-                    if arr.shape != (1662,):
+                    shape, _ = read_npy_header(npy_path)  # header only, without modifying the file
+                    if shape != (1662,):
                         all_correct = False
-                        issues.append(f"Wrong shape: {npy_path.relative_to(root_dir)} -> {arr.shape}")
+                        issues.append(f"Wrong shape: {npy_path.relative_to(root_dir)} -> {shape}")
                 except Exception as e:
                     all_correct = False
                     issues.append(f"Error loading: {npy_path.relative_to(root_dir)} -> {str(e)}")
 
 print("\n" + "="*50)
-print(f"Total frame-*.npy files checked: {total_files}")
+print(f"Total frame-*.npy / landmarks.npy files checked: {total_files}")
 
 if all_correct:
-    print("\nSUCCESS: All .npy files have the correct shape (1662,)")
+    print("\nSUCCESS: All .npy files have the correct shape (1662,) or (32, 1662)")
 else:
     print("\nWARNING: Found issues with the following files:")
     for issue in issues:
@@ -0,0 +1,79 @@
+"""
+(WRITE-OUT file) USE WITH CAUTION!
+Converts legacy repetition folders (32 x frame-XX.npy) into the packed layout
+(one landmarks.npy of shape (32, 1662) per repetition).
+
+The script walks every rep-* folder below `root_dir` that still contains frame-XX.npy
+files and writes landmarks/rep-XX/landmarks.npy next to them. It works for the
+collector tree (Data_Numpy_Arrays_RSL_UzSL) as well as for the reorganized /data/
+tree, since both keep one repetition per rep-* folder.
+
+- Already packed folders are skipped, so the script can be re-run safely.
+- `CODEC` selects the storage codec of mod06_landmark_io (e.g. "float32", "q16"). When set,
+  already packed folders stored with another codec are re-encoded as well (lossy codecs
+  cannot be undone: run preprocessing/benchmarks/04_bench_landmark_codec.py first).
+- The frame-XX.npy files are kept unless `DELETE_LEGACY_FRAMES = True`. When enabled, they
+  are removed only after the packed file has been read back and compared against them.
+
+Usage (from this folder):
+    python 07_pack_landmark_reps.py                 # converts ../Data_Numpy_Arrays_RSL_UzSL
+    python 07_pack_landmark_reps.py ../../data      # converts any other tree
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from mod06_landmark_io import pack_rep, is_packed, legacy_frames, load_rep, save_rep, rep_codec
+
+# Base directory containing signer01 to signer10 (or pass another root as first argument)
+root_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path('../Data_Numpy_Arrays_RSL_UzSL')
+
+# MAKE SURE TO BACKUP THE DATASET BEFORE SETTING THIS TO True
+DELETE_LEGACY_FRAMES = False
+
+# None keeps float64 (as recorded by older versions), see LANDMARK_CODEC in mod01_config.py
+CODEC = None
+
+if not root_dir.is_dir():
+    print(f"Error: The directory {root_dir} does not exist. Please check the path.")
+    exit()
+
+packed, recoded, skipped, failed = 0, 0, 0, []
+
+print(f"Packing repetitions under {root_dir.resolve()}...\n")
+
+for rep_dir in sorted(root_dir.rglob('rep-*')):
+    if not rep_dir.is_dir():
+        continue
+
+    if not legacy_frames(rep_dir):
+        if CODEC and is_packed(rep_dir) and rep_codec(rep_dir) != CODEC:
+            try:
+                save_rep(rep_dir, load_rep(rep_dir), CODEC)
+                recoded += 1
+            except Exception as e:
+                failed.append(f"{rep_dir.relative_to(root_dir)} -> {e}")
+        continue
+
+    if is_packed(rep_dir) and not DELETE_LEGACY_FRAMES:
+        skipped += 1
+        continue
+
+    try:
+        pack_rep(rep_dir, delete_frames=DELETE_LEGACY_FRAMES, codec=CODEC)
+        packed += 1
+    except Exception as e:
+        failed.append(f"{rep_dir.relative_to(root_dir)} -> {e}")
+
+print("=" * 50)
+print(f"Packed repetitions:          {packed}")
+print(f"Already packed (skipped):    {skipped}")
+if CODEC:
+    print(f"Re-encoded as {CODEC}:".ljust(29) + f"{recoded}")
+print(f"Legacy frame files removed:  {'yes' if DELETE_LEGACY_FRAMES else 'no'}")
+
+if failed:
+    print("\nWARNING: Failed to pack the following repetitions:")
+    for issue in failed:
+        print(f"  - {issue}")
@@ -59,3 +59,81 @@ MP_CONFIDENCE = 0.5
 POSE_REMOVE_IDX = [0,1,2,3,4,5,6,7,8,9,10,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32]
 POSE_KEEP_CONNECTIONS = frozenset([(11,12),(11,13),(12,14),(13,15),(14,16)])
 
+# Extraction profiles (mod03_recorder.make_holistic). The 1662 layout is the same for all of them.
+#   model_complexity  0 lite | 1 full | 2 heavy pose model (hands use min(complexity, 1))
+#   refine_face       478-point face mesh with irises (only the first 468 points are stored)
+#   face_every        run the face mesh every N frames; in between the last face is reused. With N > 1,
+#                     pose and hands run as separate MediaPipe solutions, since Holistic always runs the face
+#   face_fill         "hold" keeps the reused face, "interpolate" replaces it linearly between two
+#                     fresh faces when the repetition is saved
+#   draw              preview: "full" (face tessellation) | "light" (face contours) | None (camera image only)
+# benchmarks/03_bench_mp_profiles.py reports per-frame latency and landmark drift against "full".
+MP_PROFILES = {
+    "full":      {"model_complexity": 1, "refine_face": False, "face_every": 1, "face_fill": "hold",        "draw": "full"},
+    "balanced":  {"model_complexity": 1, "refine_face": False, "face_every": 2, "face_fill": "interpolate", "draw": "light"},
+    "low_power": {"model_complexity": 0, "refine_face": False, "face_every": 4, "face_fill": "interpolate", "draw": None},
+}
+MP_PROFILE = "full"          # profile of the recorder and mod12_live.py; mod09_reextract.py always uses "full"
+MP_INFERENCE_WIDTH = None    # width (px) of the frame given to MediaPipe, e.g. 640; None = full FRAME_WIDTH.
+                             # The video keeps the full resolution and the landmarks stay normalized to it;
+                             # benchmarks/04_bench_inference_resolution.py compares latency and landmark deviation
+
+
+# 4. CAPTURE PIPELINE (mod07_capture_pipeline.py)
+PIPELINED_RECORDING = True   # grab / landmarks / write / preview run on separate threads
+RING_BUFFER_SIZE = 8         # frames the grab thread may queue ahead of MediaPipe before dropping the oldest
+                             # (must stay well below FRAMES_PER_REP, or a rep can never overflow it)
+
+
+# 5. PROFILING (mod08_profiler.py)
+PROFILE_RECORDING = False    # write landmarks/rep-XX/profile.json with per-stage latencies
+
+
+# 6. OFFLINE RE-EXTRACTION (mod09_reextract.py)
+REEXTRACT_ROOT = "./Data_Numpy_Arrays_RSL_UzSL_reextracted"   # new landmarks tree, same signerXX/{sign}/landmarks/rep-N layout
+REEXTRACT_WORKERS = None     # worker processes (one Holistic each), None = all cores
+
+
+# 7. DATASET VALIDATION (mod11_validate.py)
+VALIDATE_WORKERS = None      # worker processes (one per signer / sign folder at a time), None = all cores
+VALIDATE_REPORT = "./validation_report.json"   # machine-readable report of the last run
+VALIDATE_MANIFEST = ".validation_manifest.json"   # per-file size/mtime/shape/dtype (+ hash/NaN with --content) record, kept in the validated root
+
+
+# 8. LANDMARK STORAGE (mod06_landmark_io.py)
+# codec of the landmarks written by the recorder and mod09_reextract.py, bytes per value:
+# "float64" 8 | "float32" 4 (exact, MediaPipe's own precision) | "float16" 2 | "q16" 2 (int16 fixed point)
+# | "q16-delta" (q16 frame-to-frame differences, compressed). Every reader decodes all of them.
+LANDMARK_CODEC = "float32"
+
+
+# 9. LIVE RECOGNITION (mod12_live.py)
+LIVE_MODEL = "../models/uzslr_classifier.pt"   # TorchScript: (1, 32, 708) Preprocess features -> (1, 50) logits
+LIVE_STRIDE = 4              # run the classifier every N new frames (1 = every frame)
+LIVE_TOP_K = 3               # predictions shown in the preview
+LIVE_TORCH_THREADS = 1       # intra-op threads of the classifier; MediaPipe needs the other cores
+
+
+# 10. MULTI-STATION RECORDING (mod13_stations.py)
+# One recording booth per entry, each recorded by its own process (own camera, own Holistic):
+# "source" is a capture device index, a stream URL, or a video file / frame folder (replayed).
+# Every station records its own signer, so the stations never write into the same subtree.
+STATIONS = [
+    {"source": 0, "signer": "signer11"},
+    {"source": 1, "signer": "signer12"},
+]
+STATION_REPS = 5             # repetitions per sign and station
+STATION_STATUS_SECONDS = 1.0 # refresh period of the status table (per-station fps, sign, rep)
+
+
+# 11. VIDEO ENCODING (mod14_video_writer.py)
+# The recorders hand every frame to a background encoder thread (bounded queue), so capture never
+# waits for the encoder. Per rep, videos/rep-N/encode.json reports encode time and file sizes.
+VIDEO_ENCODER = "cv2"        # "cv2" (cv2.VideoWriter with VIDEO_FOURCC) | "ffmpeg" (ffmpeg process fed through a pipe)
+VIDEO_FOURCC = "mp4v"        # cv2 backend
+VIDEO_CODEC = "libx264"      # ffmpeg backend: -c:v VIDEO_CODEC -crf VIDEO_CRF -preset VIDEO_PRESET
+VIDEO_CRF = 23               # lower = better quality and larger files (libx264: 18 visually lossless .. 28)
+VIDEO_PRESET = "veryfast"    # libx264 speed / size trade-off; fast presets keep up with several stations
+VIDEO_QUEUE_SIZE = 64        # frames waiting for the encoder thread before write() blocks
+VIDEO_PROXY_WIDTH = None     # e.g. 320: also write video_proxy.mp4 at this width for quick review; None = off
+FFMPEG_BIN = "ffmpeg"
@@ -33,19 +33,26 @@ def _meta_path() -> Path:
     """One single meta file in the dataset root."""
     return Path(DATA_ROOT) / "meta.json"
 
+_sign_list_cache: Optional[list[str]] = None   # meta.json is read once, save_sign_list keeps it current
+
 def load_sign_list(signer_id: str) -> list[str]:
     """Return the *global* list – ignore the signer_id."""
-    p = _meta_path()
-    if p.exists():
-        try:
-            data = json.loads(p.read_text())
-            # makes sure that newly added signs are shown across all signers
-            return data.get("global", DEFAULT_SIGNS[:])
-        except Exception:
-            pass
-    return DEFAULT_SIGNS[:]
+    global _sign_list_cache
+    if _sign_list_cache is None:
+        _sign_list_cache = DEFAULT_SIGNS[:]
+        p = _meta_path()
+        if p.exists():
+            try:
+                data = json.loads(p.read_text())
+                # makes sure that newly added signs are shown across all signers
+                _sign_list_cache = data.get("global", DEFAULT_SIGNS[:])
+            except Exception:
+                pass
+    return _sign_list_cache[:]
 
 def save_sign_list(signer_id: str, signs: list[str]):
+    global _sign_list_cache
+    _sign_list_cache = list(signs)
     p = _meta_path()
     # keep any old signs
     if p.exists():
@@ -66,31 +73,128 @@ def add_sign(signer_id: str, new_sign: str):
         save_sign_list(signer_id, signs)  # signer_id is ignored inside
 
 
-# 4. Progress: how many repetitions already exist for a sign?
+# 4. Manifest: signer -> sign -> recorded repetitions, kept in memory and in DATA_ROOT/manifest.json
+#    {"signers": {"signer01": {"bahor": [0, 1, 2], ...}, ...}}
+#    The recorders register every rep-N folder they create, add_signer registers new signers, so
+#    the menus never have to walk the tree. Run `python mod02_storage.py` to reconcile it with
+#    the folders on disk after manual changes (deleted reps, 06_trash_unwanted_sign.py, ...).
+_manifest: Optional[dict] = None
+_manifest_lock = None   # set by share_manifest() when several processes record into DATA_ROOT
+
+def _manifest_path() -> Path:
+    return Path(DATA_ROOT) / "manifest.json"
+
+def share_manifest(lock):
+    """
+    Several recorder processes (mod13_stations.py) write manifest.json: with a shared
+    multiprocessing lock, every save re-reads the file and merges its reps in, so no process
+    overwrites the reps registered by another one.
+    """
+    global _manifest_lock
+    _manifest_lock = lock
+
+def scan_manifest() -> dict:
+    """Build the manifest from the folders on disk (one walk of the whole tree)."""
+    signers = {}
+    for signer_dir in sorted(Path(DATA_ROOT).iterdir()):
+        if not signer_dir.is_dir() or not signer_dir.name.startswith("signer"):
+            continue
+        signs = {}
+        for sign_dir in sorted(signer_dir.iterdir()):
+            vid_dir = sign_dir / "videos"
+            if not vid_dir.is_dir():
+                continue
+            # each repetition -> a sub-folder "rep-0", "rep-1", …
+            reps = sorted(int(d.name[4:]) for d in vid_dir.iterdir()
+                          if d.is_dir() and d.name.startswith("rep-") and d.name[4:].isdigit())
+            if reps:
+                signs[sign_dir.name] = reps
+        signers[signer_dir.name] = signs
+    return {"signers": signers}
+
+def _write_manifest():
+    p = _manifest_path()
+    tmp = p.with_name(p.name + ".tmp")
+    tmp.write_text(json.dumps(_manifest, ensure_ascii=False))
+    os.replace(tmp, p)
+
+def _save_manifest():
+    if _manifest_lock is None:
+        _write_manifest()
+        return
+    with _manifest_lock:
+        try:
+            on_disk = json.loads(_manifest_path().read_text())["signers"]
+        except (OSError, ValueError, KeyError):
+            on_disk = {}
+        for sid, signs in on_disk.items():
+            mine = _manifest["signers"].setdefault(sid, {})
+            for sign, reps in signs.items():
+                mine[sign] = sorted(set(mine.get(sign, [])) | set(reps))
+        _write_manifest()
+
+def manifest() -> dict:
+    """The in-memory manifest; loaded from manifest.json once, rebuilt from disk if missing."""
+    global _manifest
+    if _manifest is None:
+        try:
+            _manifest = json.loads(_manifest_path().read_text())
+        except (OSError, ValueError):
+            _manifest = scan_manifest()
+            _save_manifest()
+    return _manifest
+
+def rebuild_manifest() -> dict:
+    """Reconcile: rescan the tree, replace the manifest and return what changed."""
+    global _manifest
+    old = manifest()["signers"]
+    _manifest = scan_manifest()
+    _save_manifest()
+    new = _manifest["signers"]
+    changes = {}
+    for sid in sorted(set(old) | set(new)):
+        if (sid in old) != (sid in new):
+            changes[sid] = "added" if sid in new else "removed"
+        for sign in sorted(set(old.get(sid, {})) | set(new.get(sid, {}))):
+            before, after = old.get(sid, {}).get(sign, []), new.get(sid, {}).get(sign, [])
+            if before != after:
+                changes[f"{sid}/{sign}"] = f"{len(before)} -> {len(after)} reps"
+    return changes
+
+def add_signer(signer_id: str):
+    path_signer(signer_id).mkdir(parents=True, exist_ok=True)
+    signers = manifest()["signers"]
+    if signer_id not in signers:
+        signers[signer_id] = {}
+        _save_manifest()
+
+def register_rep(signer_id: str, sign: str, rep_idx: int):
+    """Called by the recorders right after they create videos/rep-{rep_idx}."""
+    reps = manifest()["signers"].setdefault(signer_id, {}).setdefault(sign, [])
+    if rep_idx not in reps:
+        reps.append(rep_idx)
+        reps.sort()
+        _save_manifest()
+
+
+# 5. Progress: how many repetitions already exist for a sign?
 def count_repetitions(signer_id: str, sign: str) -> int:
-    vid_dir = path_videos(signer_id, sign)
-    if not vid_dir.exists():
-        return 0
-    # each repetition -> a sub-folder "rep-0", "rep-1", …
-    return len([d for d in vid_dir.iterdir() if d.is_dir() and d.name.startswith("rep-")])
+    return len(manifest()["signers"].get(signer_id, {}).get(sign, []))
 
 
-# 5. Which signs have AT LEAST ONE repetition?
+# 6. Which signs have AT LEAST ONE repetition?
 def recorded_signs(signer_id: str) -> set[str]:
     signs = load_sign_list(signer_id)
-    recorded = set()
-    for s in signs:
-        if count_repetitions(signer_id, s) > 0:
-            recorded.add(s)
-    return recorded
+    recorded_in = manifest()["signers"].get(signer_id, {})
+    return {s for s in signs if recorded_in.get(s)}
 
 
-# 6. List ALL signers that already exist
+# 7. List ALL signers that already exist
 def list_signers() -> list[str]:
-    return [d.name for d in Path(DATA_ROOT).iterdir() if d.is_dir() and d.name.startswith("signer")]
+    return list(manifest()["signers"])
 
 
-# 7. Pretty tree view – now with BLUE highlighting for the active node
+# 8. Pretty tree view – now with BLUE highlighting for the active node
 ANSI_BLUE   = "\033[94m"
 ANSI_GREEN  = "\033[92m"
 ANSI_WHITE  = "\033[97m"
@@ -107,10 +211,7 @@ def print_tree(signer_id: Optional[str] = None,
     current_rep  – the repetition we are about to record (0-based)
     """
     print("\n=== CURRENT DATASET TREE ===")
-    for signer_dir in sorted(Path(DATA_ROOT).iterdir()):
-        if not signer_dir.is_dir() or not signer_dir.name.startswith("signer"):
-            continue
-        sid = signer_dir.name
+    for sid in sorted(list_signers()):
         recorded = len(recorded_signs(sid))
         total    = len(load_sign_list(sid))
 
@@ -152,3 +253,9 @@ def print_tree(signer_id: Optional[str] = None,
     print("==========================\n")
 
 
+if __name__ == "__main__":
+    print(f"Reconciling {_manifest_path()} with the folders on disk...")
+    changes = rebuild_manifest()
+    for key, change in changes.items():
+        print(f"  {key}: {change}")
+    print(f"{len(changes)} changes.")
@@ -1,50 +1,148 @@
+import json
+from itertools import islice
+from types import SimpleNamespace
+
 import cv2
 import numpy as np
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
 from mod01_config import (
     VIDEO_DEVICE, FRAME_WIDTH, FRAME_HEIGHT, FPS,
     FRAMES_PER_REP, COUNTDOWN_SECONDS,
-    MP_CONFIDENCE, POSE_REMOVE_IDX, POSE_KEEP_CONNECTIONS
+    MP_CONFIDENCE, POSE_REMOVE_IDX, POSE_KEEP_CONNECTIONS, LANDMARK_CODEC,
+    MP_PROFILES, MP_PROFILE, MP_INFERENCE_WIDTH
 )
-from mod02_storage import ensure_folders, path_videos, path_landmarks
+from mod02_storage import ensure_folders, path_videos, path_landmarks, register_rep
+from mod06_landmark_io import save_rep, VECTOR_SIZE
+from mod08_profiler import PROFILER
+from mod14_video_writer import AsyncVideoWriter, ENCODE_INFO
 
 
 # MediaPipe initializations
 mp_holistic = mp.solutions.holistic
 mp_drawing = mp.solutions.drawing_utils
 
-holistic = mp_holistic.Holistic(
-    min_detection_confidence=MP_CONFIDENCE,
-    min_tracking_confidence=MP_CONFIDENCE,
-    static_image_mode=False
-)
+
+class SplitHolistic:
+    """
+    Holistic replacement for profiles with face_every > 1: Holistic always runs the face mesh,
+    so pose and hands run as their own solutions on every frame and FaceMesh every `face_every`
+    frames, the last face being reused in between. process() returns the same four attributes
+    as Holistic, so extract_vector_into and draw_landmarks work unchanged.
+    """
+    def __init__(self, confidence: float, model_complexity: int, refine_face: bool, face_every: int):
+        conf = dict(min_detection_confidence=confidence, min_tracking_confidence=confidence)
+        self.pose = mp.solutions.pose.Pose(model_complexity=model_complexity, **conf)
+        self.hands = mp.solutions.hands.Hands(model_complexity=min(model_complexity, 1), max_num_hands=2, **conf)
+        self.face_mesh = mp.solutions.face_mesh.FaceMesh(max_num_faces=1, refine_landmarks=refine_face, **conf)
+        self.face_every = face_every
+        self.frame, self.face = 0, None
+
+    def process(self, frame_rgb):
+        pose = self.pose.process(frame_rgb).pose_landmarks
+        hands = self.hands.process(frame_rgb)
+        if self.frame % self.face_every == 0:
+            faces = self.face_mesh.process(frame_rgb).multi_face_landmarks
+            self.face = faces[0] if faces else None
+        self.frame += 1
+        right, left = _assign_hands(hands, pose)
+        return SimpleNamespace(face_landmarks=self.face, pose_landmarks=pose,
+                               right_hand_landmarks=right, left_hand_landmarks=left)
+
+    def reset(self):
+        for solution in (self.pose, self.hands, self.face_mesh):
+            solution.reset()
+        self.frame, self.face = 0, None
+
+    def close(self):
+        for solution in (self.pose, self.hands, self.face_mesh):
+            solution.close()
+
+
+def _assign_hands(hands, pose):
+    """(right, left) hand of the signer, as Holistic reports them, from a Hands result."""
+    found = list(hands.multi_hand_landmarks or [])[:2]
+    if not found:
+        return None, None
+    if pose is not None:
+        # nearest pose wrist (16 right, 15 left), as Holistic derives its hand regions from the pose
+        wrists = (pose.landmark[16], pose.landmark[15])
+        d = [(h.landmark[0].x - w.x) ** 2 + (h.landmark[0].y - w.y) ** 2 for h in found for w in wrists]
+        if len(found) == 1:
+            return (found[0], None) if d[0] <= d[1] else (None, found[0])
+        return (found[0], found[1]) if d[0] + d[3] <= d[1] + d[2] else (found[1], found[0])
+    # Hands labels assume a mirrored image: on the raw camera frame its "Left" is the signer's right hand
+    right = left = None
+    for hand, handedness in zip(found, hands.multi_handedness):
+        if handedness.classification[0].label == "Left":
+            right = hand if right is None else right
+        else:
+            left = hand if left is None else left
+    return right, left
+
+
+def make_holistic(confidence: float = MP_CONFIDENCE, profile: str = MP_PROFILE):
+    p = MP_PROFILES[profile]
+    if p["face_every"] > 1:
+        return SplitHolistic(confidence, p["model_complexity"], p["refine_face"], p["face_every"])
+    return mp_holistic.Holistic(
+        min_detection_confidence=confidence,
+        min_tracking_confidence=confidence,
+        static_image_mode=False,
+        model_complexity=p["model_complexity"],
+        refine_face_landmarks=p["refine_face"]
+    )
+
+holistic = make_holistic()
 
 # Landmark detection (no drawing just yet)
-def detect_landmarks(frame, black_bg=False):
-    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+def detect_landmarks(frame, black_bg=False, width=MP_INFERENCE_WIDTH):
+    """
+    Run the extractor on `frame` (BGR), downscaled to `width` pixels first if it is wider.
+    MediaPipe landmarks are normalized to the image, so they stay valid for the full frame.
+    Returns the frame itself (not a copy: callers that draw on it while it is still to be
+    written to the video must copy it) and the results.
+    """
+    h, w = frame.shape[:2]
+    small = frame
+    if width and width < w:
+        with PROFILER.stage("resize"):
+            small = cv2.resize(frame, (width, round(h * width / w)), interpolation=cv2.INTER_AREA)
+    with PROFILER.stage("cvtColor_bgr2rgb"):
+        frame_rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
     frame_rgb.flags.writeable = False
-    results = holistic.process(frame_rgb)
-    frame_rgb.flags.writeable = True
-    frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+    with PROFILER.stage("holistic_process"):
+        results = holistic.process(frame_rgb)
 
-    # zero visibility of unwanted pose points (but will still be saved into .npy)
-    if results.pose_landmarks:
-        for i in POSE_REMOVE_IDX:
-            results.pose_landmarks.landmark[i].visibility = 0.0
+    # visibility of unwanted pose points is zeroed in extract_vector_into (one masked write)
+    # and, for the preview only, in draw_landmarks
 
     if black_bg:
-        h, w = frame.shape[:2]
         frame = np.zeros((h, w, 3), dtype=np.uint8)
 
     return frame, results
 
 
-# Draw everything (face, pose, right and left hands)
-def draw_landmarks(frame, results):
-    # Face tessellation
+# Draw everything (face, pose, right and left hands), as set by the "draw" of the profile
+def draw_landmarks(frame, results, mode=MP_PROFILES[MP_PROFILE]["draw"]):
+    if not mode:
+        return frame
+
+    # hide unwanted pose points in the preview (MediaPipe skips points with visibility < 0.5).
+    # results is never written: the pipelined writer thread may still be reading it
+    pose = None
+    with PROFILER.stage("pose_visibility"):
+        if results.pose_landmarks:
+            pose = landmark_pb2.NormalizedLandmarkList()
+            pose.CopyFrom(results.pose_landmarks)
+            for i in POSE_REMOVE_IDX:
+                pose.landmark[i].visibility = 0.0
+
+    # Face tessellation ("light": only the contours)
     if results.face_landmarks:
         mp_drawing.draw_landmarks(
-            frame, results.face_landmarks, mp_holistic.FACEMESH_TESSELATION,
+            frame, results.face_landmarks,
+            mp_holistic.FACEMESH_TESSELATION if mode == "full" else mp_holistic.FACEMESH_CONTOURS,
             mp_drawing.DrawingSpec(color=(0,244,0), thickness=1, circle_radius=2),
             mp_drawing.DrawingSpec(color=(0,255,255), thickness=1)
         )
@@ -63,48 +161,116 @@ def draw_landmarks(frame, results):
             mp_drawing.DrawingSpec(color=(0,0,255), thickness=8)
         )
     # Pose (only upper-body)
-    if results.pose_landmarks:
+    if pose is not None:
         mp_drawing.draw_landmarks(
-            frame, results.pose_landmarks, POSE_KEEP_CONNECTIONS,
+            frame, pose, POSE_KEEP_CONNECTIONS,
             mp_drawing.DrawingSpec(color=(0,255,0), thickness=17, circle_radius=4),
             mp_drawing.DrawingSpec(color=(0,255,0), thickness=17)
         )
     return frame
 
 
-# Extract flattened vector 
+# Extract flattened vector
+# layout (fixed order): face 468x3 | pose 33x4 | right hand 21x3 | left hand 21x3 = 1662
+_PARTS = (
+    ("face_landmarks",       0,    468, 3),
+    ("pose_landmarks",       1404, 33,  4),
+    ("right_hand_landmarks", 1536, 21,  3),
+    ("left_hand_landmarks",  1599, 21,  3),
+)
+# flat positions of the visibility value of every POSE_REMOVE_IDX point
+_POSE_VIS_REMOVE = np.array([1404 + 4 * i + 3 for i in POSE_REMOVE_IDX])
+
+
+def _fill_part(landmark_list, out: np.ndarray, n: int, k: int):
+    """Write the first n landmarks (x, y, z[, visibility]) field by field into the flat slice out."""
+    j = 0
+    if k == 4:
+        for lm in islice(landmark_list.landmark, n):
+            out[j] = lm.x
+            out[j + 1] = lm.y
+            out[j + 2] = lm.z
+            out[j + 3] = lm.visibility
+            j += 4
+    else:   # the refined face mesh has 10 iris points after the 468 kept ones
+        for lm in islice(landmark_list.landmark, n):
+            out[j] = lm.x
+            out[j + 1] = lm.y
+            out[j + 2] = lm.z
+            j += 3
+
+
+def extract_vector_into(results, out: np.ndarray) -> np.ndarray:
+    """
+    Fill a preallocated (1662,) buffer in place, e.g. one row of the (32, 1662) rep array:
+        extract_vector_into(results, landmarks[f_idx])
+    Missing parts are zeroed in place, and the visibility of POSE_REMOVE_IDX points is
+    zeroed with a single masked write.
+    """
+    for attr, start, n, k in _PARTS:
+        part = out[start:start + n * k]
+        landmark_list = getattr(results, attr)
+        if landmark_list:
+            _fill_part(landmark_list, part, n, k)
+        else:
+            part[...] = 0.0
+    out[_POSE_VIS_REMOVE] = 0.0
+    return out
+
+
 def extract_vector(results):
-    pose = np.array([[lm.x, lm.y, lm.z, lm.visibility] for lm in results.pose_landmarks.landmark]).flatten() \
-           if results.pose_landmarks else np.zeros(33*4)
-    face = np.array([[lm.x, lm.y, lm.z] for lm in results.face_landmarks.landmark]).flatten() \
-           if results.face_landmarks else np.zeros(468*3)
-    rh = np.array([[lm.x, lm.y, lm.z] for lm in results.right_hand_landmarks.landmark]).flatten() \
-         if results.right_hand_landmarks else np.zeros(21*3)
-    lh = np.array([[lm.x, lm.y, lm.z] for lm in results.left_hand_landmarks.landmark]).flatten() \
-         if results.left_hand_landmarks else np.zeros(21*3)
-    return np.concatenate([face, pose, rh, lh])
+    return extract_vector_into(results, np.empty(VECTOR_SIZE))
+
+
+def fill_skipped_faces(landmarks: np.ndarray, profile: str = MP_PROFILE) -> np.ndarray:
+    """
+    (T, 1662) rep, in place. For profiles with face_every > 1 and face_fill "interpolate", the
+    faces reused by SplitHolistic (bit-identical to the previous frame) are replaced by a linear
+    interpolation between the fresh faces around them. Frames after the last fresh face, or
+    next to a frame without face, keep the reused one.
+    """
+    p = MP_PROFILES[profile]
+    if p["face_every"] == 1 or p["face_fill"] != "interpolate":
+        return landmarks
+    face = landmarks[:, :468 * 3]
+    held = np.zeros(len(face), dtype=bool)
+    held[1:] = (face[1:] == face[:-1]).all(axis=1) & face[1:].any(axis=1)
+    fresh = np.flatnonzero(~held)
+    for a, b in zip(fresh[:-1], fresh[1:]):
+        if b - a > 1 and face[a].any() and face[b].any():
+            w = (np.arange(1, b - a) / (b - a))[:, None]
+            face[a + 1:b] = (1 - w) * face[a] + w * face[b]
+    return landmarks
 
 
 # ONE REPETITION 
-def record_one_repetition(cap, signer_id: str, sign: str, rep_idx: int):
+def record_one_repetition(cap, signer_id: str, sign: str, rep_idx: int, headless: bool = False,
+                          window: str = "Recorder"):
+    """
+    Record one 32-frame repetition from `cap`.
+    headless=True skips the countdown and every GUI call (preview, imshow, waitKey), so the
+    capture path can run on a machine without a display (see mod10_headless.py).
+    window is the title of the preview (one per station in mod13_stations.py).
+    """
     ensure_folders(signer_id, sign)
 
     rep_dir = path_videos(signer_id, sign) / f"rep-{rep_idx}"
     lm_dir  = path_landmarks(signer_id, sign) / f"rep-{rep_idx}"
     rep_dir.mkdir(exist_ok=True)
     lm_dir.mkdir(exist_ok=True)
+    register_rep(signer_id, sign, rep_idx)   # keeps the UI manifest in step with the rep folders
 
     video_path = rep_dir / "video.mp4"
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(str(video_path), fourcc, FPS, (FRAME_WIDTH, FRAME_HEIGHT))
+    out = AsyncVideoWriter(video_path, FPS, (FRAME_WIDTH, FRAME_HEIGHT))   # encodes on its own thread
 
     # SMOOTH COUNTDOWN 
     import time
     start_time = time.time()
     elapsed = 0
-    while elapsed < COUNTDOWN_SECONDS:
+    while elapsed < COUNTDOWN_SECONDS and not headless:
         ret, frame = cap.read()
         if not ret:
+            out.abort()
             raise RuntimeError("Camera failed during countdown")
         frame = cv2.flip(frame, 1)
         secs_left = int(COUNTDOWN_SECONDS - elapsed) + 1
@@ -112,40 +278,60 @@ def record_one_repetition(cap, signer_id: str, sign: str, rep_idx: int):
                     cv2.FONT_HERSHEY_SIMPLEX, 3, (0,255,255), 6)
         cv2.putText(frame, f"Signer: {signer_id} | Sign: {sign} | Rep: {rep_idx+1}",
                     (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
-        cv2.imshow("Recorder", frame)
+        cv2.imshow(window, frame)
         if cv2.waitKey(1) & 0xFF == ord('q'):
+            out.abort()
             raise KeyboardInterrupt("User abort during countdown")
         elapsed = time.time() - start_time
 
 
-    # record 32 frames 
+    # record 32 frames, landmarks are kept in memory and saved as ONE file per rep
+    landmarks = np.zeros((FRAMES_PER_REP, VECTOR_SIZE))
+    PROFILER.reset()
     for f_idx in range(FRAMES_PER_REP):
-        ret, frame = cap.read()
+        with PROFILER.stage("cap_read"):
+            ret, frame = cap.read()
         if not ret:
+            out.abort()
             raise RuntimeError("Camera lost during recording")
 
-        # raw frame -> video file
-        out.write(frame)
+        # raw frame -> encoder queue (the frame must not be modified from here on)
+        with PROFILER.stage("out_write"):
+            out.write(frame)
 
         # landmarks
         frame_vis, results = detect_landmarks(frame, black_bg=False)
-        frame_vis = draw_landmarks(frame_vis, results)
-        frame_vis = cv2.flip(frame_vis, 1)
+        key = -1
+        if not headless:
+            with PROFILER.stage("draw_landmarks"):
+                frame_vis = draw_landmarks(frame_vis.copy(), results)   # frame_vis is the queued frame
+            with PROFILER.stage("flip"):
+                frame_vis = cv2.flip(frame_vis, 1)
 
-        # on-screen info
-        cv2.putText(frame_vis, f"Rep {rep_idx+1} Frame {f_idx+1}/{FRAMES_PER_REP}",
-                    (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
-        cv2.imshow("Recorder", frame_vis)
+            # on-screen info
+            cv2.putText(frame_vis, f"Rep {rep_idx+1} Frame {f_idx+1}/{FRAMES_PER_REP}",
+                        (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
+            with PROFILER.stage("imshow_waitKey"):
+                cv2.imshow(window, frame_vis)
+                key = cv2.waitKey(1) & 0xFF
 
-        # save .npy
-        vec = extract_vector(results)
-        np.save(lm_dir / f"frame-{f_idx:02d}.npy", vec)
+        # landmarks of this frame
+        with PROFILER.stage("extract_vector"):
+            extract_vector_into(results, landmarks[f_idx])
+        PROFILER.frame_done()
 
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            out.release()
+        if key == ord('q'):
+            out.abort()
             raise KeyboardInterrupt("User abort")
 
-    out.release()
-    cv2.destroyWindow("Recorder")
+    with PROFILER.stage("video_flush"):
+        encode = out.release()
+    (rep_dir / ENCODE_INFO).write_text(json.dumps(encode, indent=2))
+    with PROFILER.stage("save"):
+        fill_skipped_faces(landmarks)
+        save_rep(lm_dir, landmarks, LANDMARK_CODEC)   # landmarks/rep-N/landmarks.npy -> (32, 1662)
+    PROFILER.save(lm_dir / "profile.json")
+    if not headless:
+        cv2.destroyWindow(window)
     return rep_idx + 1
 
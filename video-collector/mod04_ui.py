@@ -1,6 +1,6 @@
 import os
 from mod02_storage import (
-    list_signers, add_sign, load_sign_list, recorded_signs,
+    list_signers, add_sign, add_signer, load_sign_list, recorded_signs,
     print_tree, ensure_folders, count_repetitions
 )
 
@@ -20,8 +20,7 @@ def select_signer() -> str:
             input("Press Enter to continue...")
             continue
         # create folder if new
-        from mod02_storage import path_signer
-        path_signer(inp).mkdir(parents=True, exist_ok=True)
+        add_signer(inp)
         return inp
 
 
@@ -1,12 +1,15 @@
 
 import cv2
-from mod01_config import VIDEO_DEVICE, FRAME_WIDTH, FRAME_HEIGHT, FPS
+from mod01_config import VIDEO_DEVICE, FRAME_WIDTH, FRAME_HEIGHT, FPS, PIPELINED_RECORDING
 from mod04_ui import select_signer, select_sign, after_recording_menu
 from mod03_recorder import record_one_repetition
+from mod07_capture_pipeline import record_one_repetition_pipelined
 from mod02_storage import count_repetitions
 
 
 def main():
+    record = record_one_repetition_pipelined if PIPELINED_RECORDING else record_one_repetition
+
     # CAMERA
     cap = cv2.VideoCapture(VIDEO_DEVICE)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
@@ -56,7 +59,7 @@ def main():
 
             # record one repetition
             try:
-                rep_idx = record_one_repetition(cap, signer_id, chosen_sign, rep_idx)
+                rep_idx = record(cap, signer_id, chosen_sign, rep_idx)
             except KeyboardInterrupt:
                 print("\nRecording aborted by user.")
                 break
@@ -0,0 +1,259 @@
+"""
+Landmark file format for ONE repetition.
+
+Current (packed) layout, written by the recorder:
+    landmarks/rep-{XX}/landmarks.npy      -> (FRAMES_PER_REP, 1662)
+    landmarks/rep-{XX}/landmarks.npz      -> same, stored with the "q16-delta" codec
+
+Legacy layout, still found in older trees:
+    landmarks/rep-{XX}/frame-00.npy ... frame-31.npy   -> (1662,) each
+
+Every reader in the project should go through `load_rep()` so that both layouts and
+every codec keep working. `pack_rep()` converts a legacy folder into the packed layout.
+
+Storage codecs (save_rep(..., codec=...), LANDMARK_CODEC in mod01_config.py):
+    float64     8 bytes / value, what extract_vector produces
+    float32     4 bytes, exact: MediaPipe itself returns float32 landmarks
+    float16     2 bytes, relative error <= 2**-11 (about 0.002 for the largest values)
+    q16         2 bytes, int16 fixed point, value = q / Q16_SCALE[column], per part and axis
+                scale; absolute error <= 0.5 / scale (6.1e-5 for x, y)
+    q16-delta   q16, every frame stored as the difference to the previous one and
+                zlib-compressed (landmarks.npz); same error as q16, smaller on disk
+The codec is recorded by the file itself (dtype, or the .npz name), load_rep() decodes
+every codec to float32 (float64 stays float64).
+
+This module only depends on NumPy and has no import side effects, so it can be
+imported from the dataset-checks, dataset-prep and preprocessing stages as well.
+"""
+
+import io
+import os
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+PACKED_FILE = "landmarks.npy"
+DELTA_FILE = "landmarks.npz"     # "q16-delta" codec
+DELTA_KEY = "q16_delta"
+LEGACY_GLOB = "frame-*.npy"
+VECTOR_SIZE = 1662   # face 468*3 + pose 33*4 + rh 21*3 + lh 21*3
+CODECS = ("float64", "float32", "float16", "q16", "q16-delta")
+
+
+def _q16_scale() -> np.ndarray:
+    """Per column scale of the q16 codecs: 32767 / largest |value| expected for that part and axis."""
+    face = np.tile([4.0, 4.0, 0.5], 468)         # x, y may leave [0, 1]; face z stays within +-0.1
+    pose = np.tile([4.0, 4.0, 4.0, 1.0], 33)     # observed y up to 2.5, z down to -1.7; visibility in [0, 1]
+    hand = np.tile([4.0, 4.0, 1.0], 21)          # hand z within +-0.3
+    return 32767.0 / np.concatenate([face, pose, hand, hand])
+
+Q16_SCALE = _q16_scale()
+
+
+# 1. Layout detection
+def packed_path(rep_dir) -> Path:
+    """
+    landmarks.npy, or landmarks.npz (q16-delta) if that exists; if both exist (a codec
+    change was interrupted) the newer one.
+    """
+    npy, npz = Path(rep_dir) / PACKED_FILE, Path(rep_dir) / DELTA_FILE
+    try:
+        npz_mtime = npz.stat().st_mtime_ns
+    except FileNotFoundError:
+        return npy
+    try:
+        return npz if npz_mtime >= npy.stat().st_mtime_ns else npy
+    except FileNotFoundError:
+        return npz
+
+def legacy_frames(rep_dir) -> list[Path]:
+    """Sorted frame-XX.npy files of a legacy repetition folder."""
+    return sorted(Path(rep_dir).glob(LEGACY_GLOB))
+
+def is_packed(rep_dir) -> bool:
+    return packed_path(rep_dir).is_file()
+
+def rep_files(rep_dir) -> list[Path]:
+    """The file(s) holding the landmarks of a repetition, for either layout."""
+    return [packed_path(rep_dir)] if is_packed(rep_dir) else legacy_frames(rep_dir)
+
+
+# 2. Header-only inspection (no array data is read)
+_header_cache: dict = {}   # raw header bytes -> (shape, dtype); a dataset has only a few distinct headers
+
+def _header_end(head: bytes) -> int:
+    """Offset of the array data, from the magic string and header length field."""
+    if head[:6] != b"\x93NUMPY" or len(head) < 12:
+        raise ValueError("Not a .npy file")
+    start = 10 if head[6] == 1 else 12
+    return start + int.from_bytes(head[8:start], "little")
+
+def parse_npy_header(head: bytes) -> tuple[tuple, np.dtype, int]:
+    """
+    Return (shape, dtype, data offset) from the first bytes (or all bytes) of a .npy file.
+    Parsing the header dict is the expensive part, so it is cached by the header bytes
+    (identical for every frame file of the dataset).
+    """
+    end = _header_end(head)
+    if len(head) < end:
+        raise ValueError("Truncated .npy header")
+    key = head[:end]
+
+    cached = _header_cache.get(key)
+    if cached is None:
+        buf = io.BytesIO(key)
+        version = np.lib.format.read_magic(buf)
+        if version == (1, 0):
+            shape, _, dtype = np.lib.format.read_array_header_1_0(buf)
+        else:
+            shape, _, dtype = np.lib.format.read_array_header_2_0(buf)
+        cached = _header_cache[key] = (shape, dtype)
+    return cached[0], cached[1], end
+
+def read_npy_header(path) -> tuple[tuple, np.dtype]:
+    """Return (shape, dtype) of a .npy file by reading only its header (one unbuffered read)."""
+    with open(path, "rb", buffering=0) as f:
+        head = f.read(256)
+        try:
+            end = _header_end(head)
+        except ValueError as e:
+            raise ValueError(f"{e}: {path}") from None
+        if len(head) < end:
+            head += f.read(end - len(head))
+    shape, dtype, _ = parse_npy_header(head)
+    return shape, dtype
+
+def read_npz_header(path, key: str = DELTA_KEY) -> tuple[tuple, np.dtype]:
+    """(shape, dtype) of one array of an .npz file; only the start of that member is decompressed."""
+    with zipfile.ZipFile(path) as z, z.open(f"{key}.npy") as f:
+        shape, dtype, _ = parse_npy_header(f.read(256))
+    return shape, dtype
+
+def frame_count(rep_dir) -> int:
+    """Number of frames stored in a repetition folder, for either layout."""
+    if is_packed(rep_dir):
+        p = packed_path(rep_dir)
+        shape, _ = read_npz_header(p) if p.suffix == ".npz" else read_npy_header(p)
+        return shape[0] if shape else 0
+    return len(legacy_frames(rep_dir))
+
+
+# 3. Codecs
+def encode_rep(frames: np.ndarray, codec: str) -> np.ndarray:
+    """
+    (T, 1662) frames -> the array stored for `codec`.
+    q16 / q16-delta raise ValueError for NaN or values outside the fixed-point range.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown landmark codec {codec!r}, expected one of {CODECS}")
+    if not codec.startswith("q16"):
+        return np.asarray(frames, dtype=codec)
+
+    q = np.rint(np.asarray(frames, dtype=np.float64) * Q16_SCALE)
+    if not np.all(np.abs(q) <= 32767):   # also False for NaN
+        raise ValueError("Landmarks outside the q16 range (or NaN)")
+    q = q.astype(np.int16)
+    if codec == "q16-delta":
+        q[1:] = q[1:] - q[:-1]   # int16 wrap-around; the cumulative sum in decode_rep wraps back exactly
+    return q
+
+def decode_rep(stored: np.ndarray, delta: bool = False) -> np.ndarray:
+    """Stored array (any codec) -> (T, 1662) float32 (float64 / float32 files are returned as they are)."""
+    if stored.dtype == np.int16:
+        q = np.cumsum(stored, axis=0, dtype=np.int16) if delta else stored
+        return (q / Q16_SCALE).astype(np.float32)
+    if stored.dtype == np.float16:
+        return stored.astype(np.float32)
+    return stored
+
+def rep_codec(rep_dir) -> str:
+    """Codec of a packed repetition ("float64" for legacy frame files)."""
+    p = packed_path(rep_dir)
+    if p.suffix == ".npz" and p.is_file():
+        return "q16-delta"
+    if not p.is_file():
+        frames = legacy_frames(rep_dir)
+        return read_npy_header(frames[0])[1].name if frames else "float64"
+    dtype = read_npy_header(p)[1]
+    return "q16" if dtype == np.int16 else dtype.name
+
+
+# 4. Read / write
+def save_rep(rep_dir, frames: np.ndarray, codec: Optional[str] = None) -> str:
+    """
+    Write all frames of one repetition as a single (T, 1662) file, with `codec`
+    (None keeps the dtype of `frames`). Returns the codec used: a rep that does not fit
+    the q16 range (or has NaN) is stored as float32 instead.
+    The file is written next to the target and renamed into place, so an
+    interrupted write never leaves a truncated landmarks.npy behind; the packed file of
+    another codec is removed afterwards.
+    """
+    frames = np.asarray(frames)
+    if frames.ndim != 2 or frames.shape[1] != VECTOR_SIZE:
+        raise ValueError(f"Expected (T, {VECTOR_SIZE}) frames, got {frames.shape}")
+
+    codec = codec or frames.dtype.name
+    try:
+        stored = encode_rep(frames, codec)
+    except ValueError:
+        if not codec.startswith("q16"):
+            raise
+        codec, stored = "float32", encode_rep(frames, "float32")
+
+    target = Path(rep_dir) / (DELTA_FILE if codec == "q16-delta" else PACKED_FILE)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "wb") as f:
+        if codec == "q16-delta":
+            np.savez_compressed(f, **{DELTA_KEY: stored})
+        else:
+            np.save(f, stored)
+    os.replace(tmp, target)
+    (Path(rep_dir) / (PACKED_FILE if target.name == DELTA_FILE else DELTA_FILE)).unlink(missing_ok=True)
+    return codec
+
+def load_rep(rep_dir, mmap_mode: Optional[str] = None) -> np.ndarray:
+    """
+    Return the (T, 1662) landmarks of one repetition, decoded (see decode_rep).
+    Packed folders cost one open(); legacy folders fall back to one np.load per frame.
+    mmap_mode only applies to float32 / float64 files.
+    """
+    if is_packed(rep_dir):
+        p = packed_path(rep_dir)
+        if p.suffix == ".npz":
+            with np.load(p) as z:
+                return decode_rep(z[DELTA_KEY], delta=True)
+        return decode_rep(np.load(p, mmap_mode=mmap_mode))
+
+    frames = legacy_frames(rep_dir)
+    if not frames:
+        raise FileNotFoundError(f"No landmarks found in {rep_dir}")
+    return np.stack([np.load(p) for p in frames])
+
+
+# 5. Legacy -> packed conversion
+def pack_rep(rep_dir, delete_frames: bool = False, codec: Optional[str] = None) -> bool:
+    """
+    Convert a legacy repetition folder in place (with `codec`, None keeps float64).
+    Returns False if the folder has no frame-XX.npy files (nothing to convert).
+    The frame-XX.npy files are only removed (delete_frames=True) after the packed
+    file has been read back and compared against them (through the same codec).
+    """
+    frames = legacy_frames(rep_dir)
+    if not frames:
+        return False
+
+    if not is_packed(rep_dir):
+        save_rep(rep_dir, np.stack([np.load(p) for p in frames]), codec)
+
+    if delete_frames:
+        packed = load_rep(rep_dir)
+        legacy = np.stack([np.load(p) for p in frames])
+        codec = rep_codec(rep_dir)
+        expected = decode_rep(encode_rep(legacy, codec), delta=codec == "q16-delta")
+        if packed.shape != legacy.shape or not np.array_equal(packed, expected, equal_nan=True):
+            raise ValueError(f"Packed file does not match frame files in {rep_dir}")
+        for p in frames:
+            p.unlink()
+    return True
@@ -0,0 +1,305 @@
+"""
+Pipelined version of `record_one_repetition` (mod03_recorder.py).
+
+The synchronous recorder runs cap.read -> out.write -> holistic.process -> draw -> imshow
+in one loop, so any slow stage stretches the 32-frame window and the camera drops frames.
+Here every stage runs on its own thread and frames are handed over by reference:
+
+    grab thread      cap.read() + timestamp  -> FrameRing (bounded, drops the OLDEST frame when full)
+    landmark thread  holistic.process()      -> writer queue + latest-frame slot for the preview
+    writer thread    out.write() + landmark row of the (32, 1662) rep array
+                     (out is mod14's AsyncVideoWriter: the encoding itself runs on its own thread)
+    main thread      draw_landmarks + imshow/waitKey (GUI calls must stay on the main thread)
+
+The grab thread only reads from the camera, so frames are captured at the camera rate no
+matter how long MediaPipe or the disk take. It keeps reading until FRAMES_PER_REP frames have
+reached the writer: a frame dropped by the ring is replaced by a later one instead of leaving
+an all-zero landmark row. Dropped frames (ring overflow + gaps in the camera timestamps) are
+reported for every repetition. A replayed file (ReplayCapture without realtime) has no camera
+clock to keep up with, so the ring blocks instead of dropping.
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from mod01_config import (
+    FRAME_WIDTH, FRAME_HEIGHT, FPS,
+    FRAMES_PER_REP, COUNTDOWN_SECONDS, RING_BUFFER_SIZE, LANDMARK_CODEC
+)
+from mod02_storage import ensure_folders, path_videos, path_landmarks, register_rep
+from mod03_recorder import detect_landmarks, draw_landmarks, extract_vector_into, fill_skipped_faces
+from mod06_landmark_io import save_rep, VECTOR_SIZE
+from mod08_profiler import PROFILER
+from mod14_video_writer import AsyncVideoWriter, ENCODE_INFO
+
+
+# 1. Bounded ring buffer between the grab thread and the landmark thread
+class FrameRing:
+    """
+    Fixed-size FIFO of (f_idx, timestamp, frame). push() never blocks: when the ring is
+    full the oldest frame is discarded and counted in `dropped`. With block=True push()
+    waits for a free slot instead (until the ring is closed).
+    """
+    def __init__(self, size: int, block: bool = False):
+        self._items = deque(maxlen=size)
+        self._cond = threading.Condition()
+        self.block = block
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, item):
+        with self._cond:
+            while self.block and len(self._items) == self._items.maxlen and not self.closed:
+                self._cond.wait()
+            if self.closed:
+                return
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def pop(self, timeout: float = 0.1):
+        """Oldest item, or None if the ring is empty (and closed, or the timeout expired)."""
+        with self._cond:
+            if not self._items and not self.closed:
+                self._cond.wait(timeout)
+            item = self._items.popleft() if self._items else None
+            self._cond.notify_all()   # a blocked push()
+            return item
+
+
+# 2. Worker threads
+class _Stage(threading.Thread):
+    """Thread that keeps the first exception so the main thread can re-raise it."""
+    def __init__(self, name: str, stop: threading.Event):
+        super().__init__(name=name, daemon=True)
+        self.stop = stop
+        self.error = None
+
+    def run(self):
+        try:
+            self.work()
+        except Exception as e:
+            self.error = e
+            self.stop.set()
+
+    def work(self):
+        raise NotImplementedError
+
+
+class GrabStage(_Stage):
+    """Reads frames until `full` is set (the writer has its n frames) or the stage is stopped."""
+    def __init__(self, cap, ring: FrameRing, full: threading.Event, stop: threading.Event):
+        super().__init__("grab", stop)
+        self.cap, self.ring, self.full = cap, ring, full
+        self.timestamps = []
+
+    def work(self):
+        try:
+            f_idx = 0
+            while not self.full.is_set():
+                if self.stop.is_set():
+                    return
+                with PROFILER.stage("cap_read"):
+                    ret, frame = self.cap.read()
+                if not ret:
+                    raise RuntimeError("Camera lost during recording")
+                t = time.perf_counter()
+                self.timestamps.append(t)
+                self.ring.push((f_idx, t, frame))
+                f_idx += 1
+        finally:
+            self.ring.close()
+
+
+class LandmarkStage(_Stage):
+    def __init__(self, ring: FrameRing, write_q: queue.Queue, stop: threading.Event):
+        super().__init__("landmarks", stop)
+        self.ring, self.write_q = ring, write_q
+        self.latest = None          # (f_idx, frame_vis, results) for the preview, overwritten every frame
+        self.latest_lock = threading.Lock()
+
+    def work(self):
+        try:
+            while not self.stop.is_set():
+                item = self.ring.pop()
+                if item is None:
+                    if self.ring.closed:
+                        return
+                    continue
+                f_idx, _, frame = item
+                frame_vis, results = detect_landmarks(frame, black_bg=False)
+                self.write_q.put((f_idx, frame, results))
+                with self.latest_lock:
+                    self.latest = (f_idx, frame_vis, results)
+        finally:
+            self.ring.close()   # wakes a grab thread blocked on a full ring
+            self.write_q.put(None)
+
+
+class WriterStage(_Stage):
+    """Writes the first len(landmarks) frames it receives, in order, then sets `full`."""
+    def __init__(self, out, write_q: queue.Queue, landmarks: np.ndarray, full: threading.Event,
+                 stop: threading.Event):
+        super().__init__("writer", stop)
+        self.out, self.write_q, self.landmarks, self.full = out, write_q, landmarks, full
+        self.written = []
+
+    def work(self):
+        while True:
+            item = self.write_q.get()
+            if item is None:
+                return
+            f_idx, frame, results = item
+            row = len(self.written)
+            if row == len(self.landmarks):
+                continue   # grabbed before the grab thread saw `full`
+            with PROFILER.stage("out_write"):
+                self.out.write(frame)   # raw frame -> video file
+            with PROFILER.stage("extract_vector"):
+                extract_vector_into(results, self.landmarks[row])
+            self.written.append(f_idx)
+            PROFILER.frame_done()
+            if len(self.written) == len(self.landmarks):
+                self.full.set()
+
+
+# 3. Per-rep report
+def capture_report(timestamps: list, ring_dropped: int, written: list, n_frames: int,
+                   camera_clock: bool = True) -> dict:
+    """
+    Frames are counted as dropped when they never reached the writer (ring buffer overflow),
+    or when the gap between two camera timestamps is longer than 1.5 frame periods
+    (the camera itself skipped frames). Either way the rep still has n_frames frames, with
+    a gap in time where frames were dropped. Without camera_clock (a blocking ring fed by a
+    replayed file) timestamp gaps are waits on MediaPipe, not drops.
+    """
+    period = 1.0 / FPS
+    gaps = np.diff(np.asarray(timestamps)) if len(timestamps) > 1 else np.zeros(0)
+    camera_dropped = int(np.sum(np.maximum(np.round(gaps / period) - 1, 0)[gaps > 1.5 * period])) if camera_clock else 0
+    duration = timestamps[-1] - timestamps[0] if len(timestamps) > 1 else 0.0
+    return {
+        "frames_expected": n_frames,
+        "frames_written": len(written),
+        "ring_dropped": ring_dropped,
+        "camera_dropped": camera_dropped,
+        "dropped_frames": ring_dropped + camera_dropped,
+        "capture_seconds": round(duration, 4),
+        "capture_fps": round((len(timestamps) - 1) / duration, 2) if duration > 0 else 0.0,
+    }
+
+
+# 4. ONE REPETITION (pipelined)
+def record_one_repetition_pipelined(cap, signer_id: str, sign: str, rep_idx: int, headless: bool = False,
+                                    window: str = "Recorder"):
+    ensure_folders(signer_id, sign)
+
+    rep_dir = path_videos(signer_id, sign) / f"rep-{rep_idx}"
+    lm_dir  = path_landmarks(signer_id, sign) / f"rep-{rep_idx}"
+    rep_dir.mkdir(exist_ok=True)
+    lm_dir.mkdir(exist_ok=True)
+    register_rep(signer_id, sign, rep_idx)   # keeps the UI manifest in step with the rep folders
+
+    video_path = rep_dir / "video.mp4"
+    out = AsyncVideoWriter(video_path, FPS, (FRAME_WIDTH, FRAME_HEIGHT))
+
+    # SMOOTH COUNTDOWN (same as the synchronous recorder)
+    start_time = time.time()
+    elapsed = 0
+    while elapsed < COUNTDOWN_SECONDS and not headless:
+        ret, frame = cap.read()
+        if not ret:
+            out.abort()
+            raise RuntimeError("Camera failed during countdown")
+        frame = cv2.flip(frame, 1)
+        secs_left = int(COUNTDOWN_SECONDS - elapsed) + 1
+        cv2.putText(frame, f"Start in {secs_left}", (400, 360),
+                    cv2.FONT_HERSHEY_SIMPLEX, 3, (0,255,255), 6)
+        cv2.putText(frame, f"Signer: {signer_id} | Sign: {sign} | Rep: {rep_idx+1}",
+                    (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
+        cv2.imshow(window, frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            out.abort()
+            raise KeyboardInterrupt("User abort during countdown")
+        elapsed = time.time() - start_time
+
+    # record 32 frames through the staged pipeline
+    landmarks = np.zeros((FRAMES_PER_REP, VECTOR_SIZE))
+    stop, full = threading.Event(), threading.Event()
+    ring = FrameRing(RING_BUFFER_SIZE, block=not getattr(cap, "realtime", True))
+    write_q = queue.Queue()
+
+    grab = GrabStage(cap, ring, full, stop)
+    marks = LandmarkStage(ring, write_q, stop)
+    writer = WriterStage(out, write_q, landmarks, full, stop)
+    stages = (grab, marks, writer)
+    PROFILER.reset()
+    for stage in stages:
+        stage.start()
+
+    # render stage: show the most recent processed frame until the writer has drained
+    shown = -1
+    aborted = False
+    if headless:
+        writer.join()
+    while writer.is_alive():
+        with marks.latest_lock:
+            latest = marks.latest
+        if latest is not None and latest[0] != shown:
+            f_idx, frame_vis, results = latest
+            with PROFILER.stage("draw_landmarks"):
+                frame_vis = draw_landmarks(frame_vis.copy(), results)   # the writer may not have written it yet
+            with PROFILER.stage("flip"):
+                frame_vis = cv2.flip(frame_vis, 1)
+            cv2.putText(frame_vis, f"Rep {rep_idx+1} Frame {len(writer.written)}/{FRAMES_PER_REP}",
+                        (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
+            with PROFILER.stage("imshow"):
+                cv2.imshow(window, frame_vis)
+            shown = f_idx
+        with PROFILER.stage("waitKey"):
+            key = cv2.waitKey(1) & 0xFF
+        if key == ord('q'):
+            aborted = True
+            stop.set()
+            break
+
+    for stage in stages:
+        stage.join()
+
+    error = next((stage.error for stage in stages if stage.error is not None), None)
+    if aborted or error is not None or len(writer.written) < FRAMES_PER_REP:
+        out.abort()
+        if aborted:
+            raise KeyboardInterrupt("User abort")
+        if error is not None:
+            raise error
+        # never save a rep with all-zero rows for missing frames
+        raise RuntimeError(f"Only {len(writer.written)}/{FRAMES_PER_REP} frames recorded, rep not saved")
+    with PROFILER.stage("video_flush"):
+        encode = out.release()
+
+    report = capture_report(grab.timestamps, ring.dropped, writer.written, FRAMES_PER_REP, camera_clock=not ring.block)
+    with PROFILER.stage("save"):
+        fill_skipped_faces(landmarks)
+        save_rep(lm_dir, landmarks, LANDMARK_CODEC)   # landmarks/rep-N/landmarks.npy -> (32, 1662)
+    PROFILER.save(lm_dir / "profile.json")
+    (lm_dir / "capture.json").write_text(json.dumps(report, indent=2))
+    (rep_dir / ENCODE_INFO).write_text(json.dumps(encode, indent=2))
+    print(f"Rep {rep_idx+1}: {report['frames_written']}/{FRAMES_PER_REP} frames, "
+          f"{report['dropped_frames']} dropped, {report['capture_fps']} fps, "
+          f"video {encode['bytes'] / 1e6:.1f} MB encoded in {encode['encode_seconds']:.2f}s")
+
+    if not headless:
+        cv2.destroyWindow(window)
+    return rep_idx + 1
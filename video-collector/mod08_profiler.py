@@ -0,0 +1,98 @@
+"""
+Opt-in per-stage latency profiler for the recording loop.
+
+Enable it with PROFILE_RECORDING = True in mod01_config.py. Every instrumented stage
+(cvtColor, holistic.process, the pose visibility loop, draw_landmarks, flip, imshow/waitKey,
+out.write, extract_vector, save) is timed per frame, and after each repetition a summary is
+written next to the landmarks:
+
+    landmarks/rep-XX/profile.json
+        stages: {name: {count, p50_ms, p95_ms, max_ms, total_ms}}
+        frames, wall_seconds, effective_fps
+        timings_ms: {name: [per-call durations in order]}
+
+Comparing the stages shows whether a collection station is CPU-bound (holistic.process,
+cvtColor), display-bound (draw_landmarks, imshow/waitKey) or disk-bound (out.write, save).
+When disabled, `stage()` returns a shared no-op context and nothing is recorded.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+from mod01_config import PROFILE_RECORDING
+
+_NOOP = nullcontext()
+
+
+class StageProfiler:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.timings = {}       # stage -> [ns, ...]
+            self.frames = 0
+            self._t0 = time.perf_counter_ns()
+            self._t1 = None
+
+    # 1. Recording
+    def stage(self, name: str):
+        """Context manager timing one call of `name`; free when the profiler is disabled."""
+        if not self.enabled:
+            return _NOOP
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str):
+        t = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter_ns() - t
+            with self._lock:
+                self.timings.setdefault(name, []).append(dt)
+
+    def frame_done(self):
+        if self.enabled:
+            with self._lock:
+                self.frames += 1
+                self._t1 = time.perf_counter_ns()
+
+    # 2. Reporting
+    def summary(self) -> dict:
+        with self._lock:
+            timings = {k: np.asarray(v) / 1e6 for k, v in self.timings.items()}
+            frames = self.frames
+            wall = ((self._t1 or time.perf_counter_ns()) - self._t0) / 1e9
+
+        stages = {}
+        for name, ms in timings.items():
+            stages[name] = {
+                "count": int(ms.size),
+                "p50_ms": round(float(np.percentile(ms, 50)), 3),
+                "p95_ms": round(float(np.percentile(ms, 95)), 3),
+                "max_ms": round(float(ms.max()), 3),
+                "total_ms": round(float(ms.sum()), 3),
+            }
+        return {
+            "frames": frames,
+            "wall_seconds": round(wall, 4),
+            "effective_fps": round(frames / wall, 2) if wall > 0 else 0.0,
+            "stages": stages,
+            "timings_ms": {k: [round(float(x), 3) for x in v] for k, v in timings.items()},
+        }
+
+    def save(self, path):
+        if self.enabled:
+            with open(path, "w") as f:
+                json.dump(self.summary(), f, indent=2)
+
+
+# one profiler shared by mod03_recorder and mod07_capture_pipeline
+PROFILER = StageProfiler(enabled=PROFILE_RECORDING)
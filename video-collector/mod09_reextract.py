@@ -0,0 +1,174 @@
+"""
+Offline landmark re-extraction from the stored videos.
+
+Every repetition keeps its raw videos/rep-N/video.mp4. This script re-runs MediaPipe Holistic
+over those videos with a process pool (one Holistic graph per worker process) and writes the
+packed (T, 1662) landmarks in the same layout as the recorder:
+
+    {out_root}/signerXX/{sign}/landmarks/rep-N/landmarks.npy
+    {out_root}/signerXX/{sign}/landmarks/rep-N/extract.json   # settings + source video, written last
+
+Use it after changing MP_CONFIDENCE or upgrading MediaPipe, instead of re-recording signers.
+
+- Resumable / idempotent: a repetition is skipped when its extract.json matches the current
+  settings (MediaPipe version, confidence) and the source video (size, mtime). landmarks.npy is
+  written atomically, so an interrupted run simply continues where it stopped.
+- The default output is a NEW tree (REEXTRACT_ROOT in mod01_config.py); the recorded
+  landmarks are never touched unless --in-place is given.
+- The videos are mp4v-compressed, so landmarks will differ slightly from the live ones.
+
+Run from video-collector/:
+    python mod09_reextract.py                      # -> REEXTRACT_ROOT, all cores
+    python mod09_reextract.py --workers 4 --confidence 0.6
+    python mod09_reextract.py --in-place           # (CAUTION!) overwrites the recorded landmarks.npy
+    python mod09_reextract.py --force              # ignore extract.json, redo everything
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import mediapipe as mp
+
+from mod01_config import (DATA_ROOT, FRAMES_PER_REP, MP_CONFIDENCE, REEXTRACT_ROOT, REEXTRACT_WORKERS,
+                          LANDMARK_CODEC, MP_PROFILE)
+from mod06_landmark_io import is_packed
+
+EXTRACT_INFO = "extract.json"
+
+
+# 1. Jobs: one per stored video
+def find_jobs(data_root: Path, out_root: Path) -> list[tuple[Path, Path]]:
+    """[(video.mp4, output landmarks/rep-N folder)] for every repetition, in a fixed order."""
+    jobs = []
+    for video in sorted(data_root.glob("signer*/*/videos/rep-*/video.mp4")):
+        rep_dir = video.parent
+        sign_dir = rep_dir.parent.parent
+        signer_dir = sign_dir.parent
+        out_dir = out_root / signer_dir.name / sign_dir.name / "landmarks" / rep_dir.name
+        jobs.append((video, out_dir))
+    return jobs
+
+
+def job_info(video: Path, confidence: float) -> dict:
+    st = video.stat()
+    return {
+        "mediapipe": mp.__version__,
+        "confidence": confidence,
+        "video_size": st.st_size,
+        "video_mtime_ns": st.st_mtime_ns,
+    }
+
+
+def is_done(video: Path, out_dir: Path, confidence: float) -> bool:
+    info_path = out_dir / EXTRACT_INFO
+    if not info_path.exists() or not is_packed(out_dir):
+        return False
+    try:
+        saved = json.loads(info_path.read_text())
+    except (OSError, ValueError):
+        return False
+    expected = job_info(video, confidence)
+    return all(saved.get(k) == v for k, v in expected.items())
+
+
+# 2. Worker process
+_recorder = None   # mod03_recorder, imported per worker (its Holistic is this worker's graph)
+
+def _init_worker(confidence: float):
+    global _recorder
+    import mod03_recorder
+    if confidence != MP_CONFIDENCE or MP_PROFILE != "full":
+        # offline there is no frame budget: always the full profile (face on every frame)
+        mod03_recorder.holistic.close()
+        mod03_recorder.holistic = mod03_recorder.make_holistic(confidence, "full")
+    _recorder = mod03_recorder
+
+
+def extract_video(video: str, out_dir: str, info: dict) -> tuple[str, int, str]:
+    """Run Holistic over one video and save its landmarks. Returns (video, n_frames, error)."""
+    import cv2
+    import numpy as np
+    from mod06_landmark_io import save_rep, VECTOR_SIZE
+
+    holistic = _recorder.holistic
+    holistic.reset()   # every video starts from a fresh tracking state, like a new recording
+
+    rows = []
+    cap = cv2.VideoCapture(video)
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            frame_rgb.flags.writeable = False
+            results = holistic.process(frame_rgb)
+            rows.append(_recorder.extract_vector_into(results, np.empty(VECTOR_SIZE)))
+    except Exception as e:
+        return video, 0, f"{type(e).__name__}: {e}"
+    finally:
+        cap.release()
+
+    if not rows:
+        return video, 0, "no frames could be decoded"
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / EXTRACT_INFO).unlink(missing_ok=True)
+    save_rep(out_dir, np.stack(rows), LANDMARK_CODEC)
+    (out_dir / EXTRACT_INFO).write_text(json.dumps({**info, "frames": len(rows)}, indent=2))
+    return video, len(rows), ""
+
+
+# 3. Batch
+def reextract(data_root: Path, out_root: Path, workers=None, confidence: float = MP_CONFIDENCE,
+              force: bool = False) -> dict:
+    jobs = find_jobs(data_root, out_root)
+    todo = [(v, o) for v, o in jobs if force or not is_done(v, o, confidence)]
+    print(f"{len(jobs)} videos found, {len(jobs) - len(todo)} already up to date, {len(todo)} to extract")
+
+    workers = workers or os.cpu_count()
+    failed, short = [], []
+    t0 = time.perf_counter()
+    # spawn: MediaPipe graphs (and their threads) are not fork-safe
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(confidence,)) as pool:
+        futures = [pool.submit(extract_video, str(v), str(o), job_info(v, confidence)) for v, o in todo]
+        for i, fut in enumerate(as_completed(futures), 1):
+            video, n_frames, error = fut.result()
+            if error:
+                failed.append((video, error))
+            elif n_frames != FRAMES_PER_REP:
+                short.append((video, n_frames))
+            if i % 50 == 0 or i == len(futures):
+                rate = i / (time.perf_counter() - t0)
+                print(f"  {i}/{len(futures)} videos ({rate:.1f} videos/s)")
+
+    elapsed = time.perf_counter() - t0
+    print(f"\nDone in {elapsed:.1f}s with {workers} workers -> {out_root.resolve()}")
+    for video, n_frames in short:
+        print(f"  Warning: {video} has {n_frames} frames (expected {FRAMES_PER_REP})")
+    for video, error in failed:
+        print(f"  Failed: {video}: {error}")
+    return {"found": len(jobs), "extracted": len(todo) - len(failed), "failed": len(failed),
+            "seconds": round(elapsed, 2)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-run MediaPipe Holistic over the stored videos.")
+    parser.add_argument("--data-root", default=DATA_ROOT)
+    parser.add_argument("--out", default=REEXTRACT_ROOT, help="output landmarks tree")
+    parser.add_argument("--in-place", action="store_true", help="(CAUTION!) overwrite landmarks inside --data-root")
+    parser.add_argument("--workers", type=int, default=REEXTRACT_WORKERS)
+    parser.add_argument("--confidence", type=float, default=MP_CONFIDENCE)
+    parser.add_argument("--force", action="store_true", help="re-extract even if extract.json is up to date")
+    args = parser.parse_args()
+
+    out_root = Path(args.data_root) if args.in_place else Path(args.out)
+    reextract(Path(args.data_root), out_root, args.workers, args.confidence, args.force)
@@ -0,0 +1,153 @@
+"""
+Headless replay mode: record repetitions from a video file or a folder of frames instead of
+the webcam, without any window, countdown or key press.
+
+    ReplayCapture(source)   -> drop-in for cv2.VideoCapture(VIDEO_DEVICE)
+                               (a video file, or a directory of .png/.jpg frames; loops at the end)
+    run_headless(...)       -> records N repetitions through record_one_repetition(_pipelined)
+                               with headless=True and returns per-rep timings
+
+Without realtime the pipelined recorder's ring blocks on a ReplayCapture instead of dropping
+frames (there is no camera to keep up with), so every decoded frame reaches MediaPipe.
+
+Nothing here needs a display, so the capture hot path (MediaPipe, extract_vector, out.write,
+save) can be measured on a server or CI box. See benchmarks/02_bench_headless_capture.py.
+
+Run from video-collector/ (writes into DATA_ROOT like the normal recorder):
+    python mod10_headless.py path/to/video.mp4 --signer signer99 --sign bahor --reps 5
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import cv2
+
+from mod01_config import FRAME_WIDTH, FRAME_HEIGHT, FPS, FRAMES_PER_REP, PIPELINED_RECORDING
+
+FRAME_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+# 1. Stand-in camera
+class ReplayCapture:
+    """
+    Minimal cv2.VideoCapture replacement (read / isOpened / release / set / get).
+
+    Frames are resized to FRAME_WIDTH x FRAME_HEIGHT when needed, because cv2.VideoWriter
+    silently drops frames of the wrong size. With realtime=True reads are paced at FPS like a
+    real camera; by default frames are returned as fast as they can be decoded.
+    """
+    def __init__(self, source, loop: bool = True, realtime: bool = False):
+        self.source = Path(source)
+        self.loop = loop
+        self.realtime = realtime
+        self._next_t = None
+
+        if self.source.is_dir():
+            self._frames = sorted(p for p in self.source.iterdir() if p.suffix.lower() in FRAME_SUFFIXES)
+            self._pos = 0
+            self._cap = None
+            self._opened = bool(self._frames)
+        else:
+            self._frames = None
+            self._cap = cv2.VideoCapture(str(self.source))
+            self._opened = self._cap.isOpened()
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def _read_raw(self):
+        if self._frames is not None:
+            if self._pos >= len(self._frames):
+                if not self.loop:
+                    return False, None
+                self._pos = 0
+            frame = cv2.imread(str(self._frames[self._pos]))
+            self._pos += 1
+            return frame is not None, frame
+
+        ret, frame = self._cap.read()
+        if not ret and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._cap.read()
+        return ret, frame
+
+    def read(self):
+        if self.realtime:
+            now = time.perf_counter()
+            if self._next_t is not None and now < self._next_t:
+                time.sleep(self._next_t - now)
+            self._next_t = max(now, self._next_t or now) + 1.0 / FPS
+
+        ret, frame = self._read_raw()
+        if ret and (frame.shape[1], frame.shape[0]) != (FRAME_WIDTH, FRAME_HEIGHT):
+            frame = cv2.resize(frame, (FRAME_WIDTH, FRAME_HEIGHT))
+        return ret, frame
+
+    def set(self, prop_id, value) -> bool:
+        return False   # resolution / fps of a replayed source cannot be changed
+
+    def get(self, prop_id) -> float:
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(FRAME_WIDTH)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(FRAME_HEIGHT)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(FPS)
+        return self._cap.get(prop_id) if self._cap is not None else 0.0
+
+    def release(self):
+        if self._cap is not None:
+            self._cap.release()
+        self._opened = False
+
+
+# 2. Non-interactive recording
+def run_headless(source, signer_id: str, sign: str, reps: int,
+                 pipelined: bool = PIPELINED_RECORDING, realtime: bool = False) -> list[dict]:
+    """
+    Record `reps` repetitions of `sign` for `signer_id` from a replayed source.
+    Returns one {rep_idx, wall_seconds, frames_written} entry per repetition
+    (frames_written from the pipelined recorder's capture.json).
+    """
+    # imported here so that a caller can chdir() into a scratch DATA_ROOT first
+    from mod02_storage import count_repetitions, path_landmarks
+    from mod03_recorder import record_one_repetition
+    from mod07_capture_pipeline import record_one_repetition_pipelined
+
+    record = record_one_repetition_pipelined if pipelined else record_one_repetition
+    cap = ReplayCapture(source, loop=True, realtime=realtime)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Cannot open replay source {source}")
+
+    timings = []
+    rep_idx = count_repetitions(signer_id, sign)
+    try:
+        for _ in range(reps):
+            t = time.perf_counter()
+            next_idx = record(cap, signer_id, sign, rep_idx, headless=True)
+            wall = time.perf_counter() - t
+            capture = path_landmarks(signer_id, sign) / f"rep-{rep_idx}" / "capture.json"
+            written = json.loads(capture.read_text())["frames_written"] if capture.exists() else FRAMES_PER_REP
+            timings.append({"rep_idx": rep_idx, "wall_seconds": wall, "frames_written": written})
+            rep_idx = next_idx
+    finally:
+        cap.release()
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record repetitions from a video file or frame folder, without GUI.")
+    parser.add_argument("source", help="video file or directory of frames")
+    parser.add_argument("--signer", default="signer99")
+    parser.add_argument("--sign", default="bahor")
+    parser.add_argument("--reps", type=int, default=5)
+    parser.add_argument("--sync", action="store_true", help="use record_one_repetition instead of the pipelined recorder")
+    parser.add_argument("--realtime", action="store_true", help="pace the source at FPS like a real camera")
+    args = parser.parse_args()
+
+    timings = run_headless(args.source, args.signer, args.sign, args.reps,
+                           pipelined=not args.sync, realtime=args.realtime)
+    for t in timings:
+        print(f"rep-{t['rep_idx']}: {t['wall_seconds']:.3f}s")
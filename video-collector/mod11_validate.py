@@ -0,0 +1,374 @@
+"""
+Single-pass, incremental dataset validator.
+
+One engine for the checks that used to be spread over dataset-checks/01-05 and
+dataset-prep/dataset-checks/01, 04: the tree is walked once and the work fans out over a
+process pool, one task per signer (collector tree) or per sign folder (data/ tree).
+
+Header-only by default: a .npy file is checked from its header (shape, dtype) and its size
+(truncated data), an .npz from the start of its member, so a run reads a few hundred bytes
+per file. --content also reads every inspected file completely, to hash it (sha256) and count
+its NaN values.
+
+Incremental: a manifest (VALIDATE_MANIFEST, kept in the validated root) records every .npy
+file as {size, mtime_ns, shape, dtype, hash, nan} (hash and nan only once a --content run has
+read it). On later runs a file whose size and mtime are unchanged is not opened again, its
+recorded shape / dtype / NaN count are re-checked instead; only new or modified files are
+inspected (with --content, also the files that were never read completely). --full inspects
+every file again; --full --content also reports files whose content changed although size
+and mtime did not.
+
+Checks, all in the same pass:
+    collector tree  Data_Numpy_Arrays_RSL_UzSL/signerXX/{sign}/landmarks|videos/rep-N
+        missing_sign / extra_sign   sign folders of every signer vs DEFAULT_SIGNS
+        rep_mismatch                landmarks/rep-N and videos/rep-N folders differ
+        missing_video               videos/rep-N without a non-empty video.mp4
+    data tree       data/{sign}/rep-N (+ data/{split}/{sign}/rep-N, data/splits.json)
+        missing_sign                sign folders vs DEFAULT_SIGNS
+        split_missing_rep           rep listed in splits.json without a folder
+        split_overlap               rep listed in more than one split
+    both
+        frame_count                 not FRAMES_PER_REP frames (packed file or frame-XX.npy files)
+        shape / dtype               landmarks.npy|npz not (32, 1662), frame-XX.npy not (1662,),
+                                    not float (or int16 for the q16 codecs of mod06)
+        unreadable                  .npy file whose header cannot be parsed, or shorter than its header says
+        nan                         (--content) NaN values (MediaPipe writes zeros for missing landmarks)
+        content_changed             (--full --content) hash differs from the manifest, size and mtime do not
+        leftover_tmp                *.tmp left behind by an interrupted write
+
+The report (VALIDATE_REPORT in mod01_config.py) is JSON: totals, rep counts per signer / folder
+and sign, and one {"check", "path", "detail"} entry per issue. The exit code is 1 when any
+issue was found, so the script can gate other steps.
+
+Run from video-collector/:
+    python mod11_validate.py                             # DATA_ROOT (collector tree)
+    python mod11_validate.py ../data                     # prepared dataset, splits included
+    python mod11_validate.py --workers 4 --report /tmp/report.json
+    python mod11_validate.py --full                      # re-check every header, ignore the manifest
+    python mod11_validate.py --content                   # also hash + NaN-scan (reads whole files)
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from mod01_config import (DATA_ROOT, DEFAULT_SIGNS, FRAMES_PER_REP, VALIDATE_WORKERS, VALIDATE_REPORT,
+                          VALIDATE_MANIFEST)
+from mod06_landmark_io import PACKED_FILE, DELTA_FILE, DELTA_KEY, VECTOR_SIZE, parse_npy_header, read_npz_header
+
+# split manifest of the prepared data/ tree is defined by dataset-prep
+sys.path.append(str(Path(__file__).resolve().parent.parent / "dataset-prep"))
+from split_manifest import SPLITS, load_splits
+
+VIDEO_FILE = "video.mp4"
+MANIFEST_VERSION = 1
+
+
+def _issue(check: str, path, detail: str = "") -> dict:
+    return {"check": check, "path": str(path), "detail": detail}
+
+def _subdirs(path: Path) -> list[str]:
+    try:
+        return sorted(e.name for e in os.scandir(path) if e.is_dir() and not e.name.startswith("."))
+    except FileNotFoundError:
+        return []
+
+
+# 1. One repetition
+def inspect_header(path: Path, st: os.stat_result) -> dict:
+    """Header-only manifest record {size, mtime_ns, shape, dtype, hash: None, nan: None, error}."""
+    record = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": None,
+              "shape": None, "dtype": None, "nan": None, "error": None}
+    try:
+        if path.name == DELTA_FILE:
+            shape, dtype = read_npz_header(path)
+        else:
+            with open(path, "rb", buffering=0) as f:
+                shape, dtype, offset = parse_npy_header(f.read(4096))   # .npy headers are 128 bytes in practice
+            expected = offset + int(np.prod(shape)) * dtype.itemsize
+            if not dtype.hasobject and st.st_size < expected:
+                raise ValueError(f"truncated: {st.st_size} bytes, header says {expected}")
+        if dtype.hasobject:
+            raise ValueError("object arrays are not landmarks")
+    except Exception as e:   # not a .npy / .npz file, truncated data, ...
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+    record["shape"], record["dtype"] = list(shape), dtype.str
+    return record
+
+def inspect_npy(path: Path, st: os.stat_result) -> dict:
+    """Read one .npy file completely (--content): the record with its sha256 and NaN count."""
+    data = path.read_bytes()
+    record = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": hashlib.sha256(data).hexdigest(),
+              "shape": None, "dtype": None, "nan": 0, "error": None}
+    try:
+        if path.name == DELTA_FILE:   # q16-delta codec: the .npy inside the zip
+            with zipfile.ZipFile(io.BytesIO(data)) as z:
+                data = z.read(f"{DELTA_KEY}.npy")
+        shape, dtype, offset = parse_npy_header(data)
+        if dtype.hasobject:
+            raise ValueError("object arrays are not landmarks")
+        arr = np.frombuffer(data, dtype=dtype, count=int(np.prod(shape)), offset=offset)
+    except Exception as e:   # not a .npy / .npz file, truncated data, ...
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+    record["shape"], record["dtype"] = list(shape), dtype.str
+    if dtype.kind == "f":
+        record["nan"] = int(np.isnan(arr).sum())
+    return record
+
+def _check_record(record: dict, shape: tuple, rel: str, issues: list):
+    if record["error"]:
+        issues.append(_issue("unreadable", rel, record["error"]))
+        return
+    if tuple(record["shape"]) != shape:
+        issues.append(_issue("shape", rel, f"{tuple(record['shape'])}, expected {shape}"))
+    dtype = np.dtype(record["dtype"])
+    if dtype.kind != "f" and not (dtype == np.int16 and rel.endswith((PACKED_FILE, DELTA_FILE))):   # int16: q16 codecs
+        issues.append(_issue("dtype", rel, str(dtype)))
+    if record["nan"]:
+        issues.append(_issue("nan", rel, f"{record['nan']} NaN values"))
+
+def check_rep(rep_dir: Path, rel: str, known: dict = None, full: bool = False,
+              content: bool = False) -> tuple[dict, int, list[dict]]:
+    """
+    Validate one landmarks rep folder with a single directory listing.
+    `known` holds the manifest records of this rep ({file name: record}); files whose size and
+    mtime match are not opened (with content=True, unless they were never read completely).
+    Returns (records, n_inspected, issues).
+    """
+    known = known or {}
+    issues, records, inspected = [], {}, 0
+    entries = [e for e in os.scandir(rep_dir) if e.is_file()]
+    frames = sorted(e.name for e in entries if e.name.startswith("frame-") and e.name.endswith(".npy"))
+    packed = [e.name for e in entries if e.name in (PACKED_FILE, DELTA_FILE)]
+
+    for e in entries:
+        if e.name.endswith(".tmp"):
+            issues.append(_issue("leftover_tmp", f"{rel}/{e.name}"))
+        if e.name not in (PACKED_FILE, DELTA_FILE) and not (e.name.startswith("frame-") and e.name.endswith(".npy")):
+            continue
+        st = e.stat()
+        record = known.get(e.name)
+        unchanged = record is not None and (record["size"], record["mtime_ns"]) == (st.st_size, st.st_mtime_ns)
+        if full or not unchanged or (content and record.get("hash") is None):
+            new = (inspect_npy if content else inspect_header)(Path(e.path), st)
+            if unchanged and content and record.get("hash") is not None and new["hash"] != record["hash"]:
+                issues.append(_issue("content_changed", f"{rel}/{e.name}", "size and mtime unchanged"))
+            if unchanged and not content:   # keep what an earlier --content run found
+                new["hash"], new["nan"] = record.get("hash"), record.get("nan")
+            record = new
+            inspected += 1
+        records[e.name] = record
+
+    for name in packed:
+        _check_record(records[name], (FRAMES_PER_REP, VECTOR_SIZE), f"{rel}/{name}", issues)
+    if not packed and len(frames) != FRAMES_PER_REP:   # for a packed file the shape check covers the frame count
+        issues.append(_issue("frame_count", rel, f"{len(frames)} frames, expected {FRAMES_PER_REP}"))
+    for name in frames:
+        _check_record(records[name], (VECTOR_SIZE,), f"{rel}/{name}", issues)
+    return records, inspected, issues
+
+
+# 2. Units of work (one per worker task)
+def validate_signer(signer_dir: str, root: str, known: dict, full: bool = False, content: bool = False) -> dict:
+    """Collector tree: every sign of one signer. `known`: manifest records of its reps."""
+    signer_dir, root = Path(signer_dir), Path(root)
+    issues, counts, records, inspected = [], {}, {}, 0
+
+    signs = _subdirs(signer_dir)
+    for sign in sorted(set(DEFAULT_SIGNS) - set(signs)):
+        issues.append(_issue("missing_sign", f"{signer_dir.name}/{sign}"))
+    for sign in sorted(set(signs) - set(DEFAULT_SIGNS)):
+        issues.append(_issue("extra_sign", f"{signer_dir.name}/{sign}"))
+
+    for sign in signs:
+        rel = f"{signer_dir.name}/{sign}"
+        lm_reps = set(r for r in _subdirs(signer_dir / sign / "landmarks") if r.startswith("rep-"))
+        vid_reps = set(r for r in _subdirs(signer_dir / sign / "videos") if r.startswith("rep-"))
+        if lm_reps != vid_reps:
+            issues.append(_issue("rep_mismatch", rel,
+                                 f"only in landmarks: {sorted(lm_reps - vid_reps)}, "
+                                 f"only in videos: {sorted(vid_reps - lm_reps)}"))
+        for rep in sorted(vid_reps):
+            video = signer_dir / sign / "videos" / rep / VIDEO_FILE
+            if not video.is_file() or video.stat().st_size == 0:
+                issues.append(_issue("missing_video", f"{rel}/videos/{rep}"))
+        for rep in sorted(lm_reps):
+            rep_rel = f"{rel}/landmarks/{rep}"
+            records[rep_rel], n, rep_issues = check_rep(signer_dir / sign / "landmarks" / rep, rep_rel,
+                                                        known.get(rep_rel), full, content)
+            inspected += n
+            issues += rep_issues
+        counts[sign] = len(lm_reps)
+    return {"unit": signer_dir.name, "counts": counts, "records": records, "inspected": inspected, "issues": issues}
+
+def validate_sign_dir(sign_dir: str, root: str, known: dict, full: bool = False, content: bool = False) -> dict:
+    """data/ tree: every rep-N of one data/{sign} or data/{split}/{sign} folder."""
+    sign_dir, root = Path(sign_dir), Path(root)
+    unit = sign_dir.relative_to(root).as_posix()
+    issues, records, inspected = [], {}, 0
+    reps = [r for r in _subdirs(sign_dir) if r.startswith("rep-")]
+    for rep in reps:
+        rep_rel = f"{unit}/{rep}"
+        records[rep_rel], n, rep_issues = check_rep(sign_dir / rep, rep_rel, known.get(rep_rel), full, content)
+        inspected += n
+        issues += rep_issues
+    return {"unit": unit, "counts": {sign_dir.name: len(reps)}, "records": records, "inspected": inspected,
+            "issues": issues}
+
+
+# 3. Whole tree
+def _unit_of(rep_rel: str, tree: str) -> str:
+    """Work unit a manifest key belongs to: 'signerXX' or the '{split}/{sign}' / '{sign}' folder."""
+    return rep_rel.split("/", 1)[0] if tree == "collector" else rep_rel.rsplit("/", 1)[0]
+
+def load_manifest(path: Path, tree: str) -> dict:
+    """{rep path relative to root: {file name: record}} of the previous run; empty if none / other format."""
+    try:
+        manifest = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("tree") != tree:
+        return {}
+    return manifest["reps"]
+
+def save_manifest(path: Path, tree: str, reps: dict):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "tree": tree, "reps": reps}, separators=(",", ":")))
+    os.replace(tmp, path)
+
+
+def detect_tree(root: Path) -> str:
+    return "collector" if any(d.startswith("signer") for d in _subdirs(root)) else "data"
+
+def plan_units(root: Path, tree: str) -> list[tuple]:
+    """[(function, folder)] work items."""
+    if tree == "collector":
+        return [(validate_signer, root / d) for d in _subdirs(root) if d.startswith("signer")]
+    units = [(validate_sign_dir, root / d) for d in _subdirs(root) if d in DEFAULT_SIGNS]
+    for split in SPLITS:   # physical split folders of older trees
+        units += [(validate_sign_dir, root / split / d) for d in _subdirs(root / split) if d in DEFAULT_SIGNS]
+    return units
+
+def check_tree_level(root: Path, tree: str, results: list[dict]) -> list[dict]:
+    """Checks that need the whole tree (done in the main process, from the worker results)."""
+    issues = []
+    if tree != "data":
+        return issues
+    presplit = {r["unit"] for r in results if "/" not in r["unit"]}
+    if presplit:
+        for sign in DEFAULT_SIGNS:
+            if sign not in presplit:
+                issues.append(_issue("missing_sign", sign))
+
+    manifest = load_splits(root)
+    if manifest is not None:
+        owner = {}
+        for split in SPLITS:
+            for rep_id in manifest["splits"][split]:
+                if rep_id in owner:
+                    issues.append(_issue("split_overlap", rep_id, f"{owner[rep_id]} and {split}"))
+                owner.setdefault(rep_id, split)
+                if not (root / rep_id).is_dir():
+                    issues.append(_issue("split_missing_rep", rep_id, split))
+    return issues
+
+
+def validate(root, workers=VALIDATE_WORKERS, tree: str = "auto", full: bool = False, manifest=None,
+             content: bool = False) -> dict:
+    """
+    Validate the tree and update its manifest (default root/VALIDATE_MANIFEST; reps that no
+    longer exist are dropped from it). full=True inspects every file again; content=True reads
+    the inspected files completely (hash + NaN count) instead of their header only.
+    """
+    root = Path(root)
+    if not root.is_dir():
+        raise FileNotFoundError(f"Dataset root not found: {root}")
+    tree = detect_tree(root) if tree == "auto" else tree
+    units = plan_units(root, tree)
+    manifest = Path(manifest) if manifest else root / VALIDATE_MANIFEST
+
+    t0 = time.perf_counter()
+    previous, known = load_manifest(manifest, tree), {}
+    for rep_rel, records in previous.items():
+        known.setdefault(_unit_of(rep_rel, tree), {})[rep_rel] = records
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(fn, str(folder), str(root), known.get(folder.relative_to(root).as_posix(), {}),
+                               full, content)
+                   for fn, folder in units]
+        results = [f.result() for f in futures]
+
+    reps = {rep_rel: records for r in results for rep_rel, records in r["records"].items()}
+    if any(r["inspected"] for r in results) or reps.keys() != previous.keys():
+        save_manifest(manifest, tree, reps)
+    issues = [i for r in results for i in r["issues"]] + check_tree_level(root, tree, results)
+    return {
+        "tree": tree,
+        "root": str(root.resolve()),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seconds": round(time.perf_counter() - t0, 3),
+        "workers": workers,
+        "full": full,
+        "content": content,
+        "manifest": str(manifest.resolve()),
+        "totals": {
+            "units": len(results),
+            "reps": sum(sum(r["counts"].values()) for r in results),
+            "files": sum(len(records) for r in results for records in r["records"].values()),
+            "inspected": sum(r["inspected"] for r in results),
+            "issues": len(issues),
+        },
+        "counts": {r["unit"]: r["counts"] for r in results},
+        "issues": issues,
+    }
+
+
+def print_report(report: dict, max_paths: int = 10):
+    t = report["totals"]
+    print(f"{report['tree']} tree {report['root']}: {t['units']} folders, {t['reps']} reps, "
+          f"{t['files']} .npy files checked in {report['seconds']:.2f}s ({report['workers']} workers)")
+    print(f"{t['inspected']} of them inspected ({'--full' if report['full'] else 'new or modified since the last run'}, "
+          f"{'whole files' if report['content'] else 'headers only'}), the others checked from the manifest")
+    by_check = {}
+    for issue in report["issues"]:
+        by_check.setdefault(issue["check"], []).append(issue)
+    if not by_check:
+        print("No issues found.")
+    for check, issues in sorted(by_check.items()):
+        print(f"\n✖ {check}: {len(issues)}")
+        for issue in issues[:max_paths]:
+            print(f"    {issue['path']}" + (f"  ({issue['detail']})" if issue["detail"] else ""))
+        if len(issues) > max_paths:
+            print(f"    ... {len(issues) - max_paths} more in the report")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate a landmarks tree in one parallel, incremental pass.")
+    parser.add_argument("root", nargs="?", default=DATA_ROOT, help="collector tree or prepared data/ folder")
+    parser.add_argument("--tree", choices=["auto", "collector", "data"], default="auto")
+    parser.add_argument("--workers", type=int, default=VALIDATE_WORKERS)
+    parser.add_argument("--report", default=VALIDATE_REPORT, help="where to write the JSON report")
+    parser.add_argument("--full", action="store_true", help="inspect every file, not only new / modified ones")
+    parser.add_argument("--content", action="store_true",
+                        help="read whole files: sha256 + NaN count (default: headers and sizes only)")
+    parser.add_argument("--manifest", default=None, help=f"manifest to use (default: ROOT/{VALIDATE_MANIFEST})")
+    args = parser.parse_args()
+
+    report = validate(args.root, args.workers, args.tree, args.full, args.manifest, args.content)
+    Path(args.report).write_text(json.dumps(report, ensure_ascii=False, indent=1))
+    print_report(report)
+    print(f"\nReport: {Path(args.report).resolve()}")
+    sys.exit(1 if report["issues"] else 0)
@@ -0,0 +1,273 @@
+"""
+Live sign recognition: a sliding 32-frame window over the camera (or a video file).
+
+Nothing is recorded. Every frame takes the recorder's landmark path (detect_landmarks ->
+extract_vector_into) and is appended to uzslr's StreamingPreprocess, which keeps the x,y of
+the last FRAMES_PER_REP frames and the running sums of their normalization. Every LIVE_STRIDE
+frames the window features (identical to Preprocess on the window) go through the classifier,
+and the top-k signs are drawn on the preview:
+
+    grab thread   cap.read() -> FrameRing(1): only the newest frame is kept, so a slow
+                  prediction skips camera frames instead of falling further and further behind
+    main thread   holistic -> append -> [window features -> classifier -> softmax] -> overlay / imshow
+
+Latency is measured per prediction from the moment the newest frame of the window was read
+from the camera: capture -> landmarks -> features -> logits. A summary (p50 / p95 / max) is
+printed at the end and written to --report.
+
+The classifier is a TorchScript file (torch.jit.save) or a pickled nn.Module (torch.save) that
+maps (1, 32, 708) Preprocess features to (1, 50) logits in DEFAULT_SIGNS order. This module
+needs torch next to MediaPipe (the uzslr training environment).
+
+Run from video-collector/:
+    python mod12_live.py                                         # camera VIDEO_DEVICE, LIVE_MODEL
+    python mod12_live.py --model model.pt --stride 2 --top-k 5
+    python mod12_live.py --source clip.mp4 --headless --report live.json   # no camera, no display
+    python mod12_live.py --source clip.mp4 --realtime             # paced at FPS, frames dropped like a camera
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+import torch
+
+from mod01_config import (
+    VIDEO_DEVICE, FRAME_WIDTH, FRAME_HEIGHT, FPS, FRAMES_PER_REP, DEFAULT_SIGNS,
+    LIVE_MODEL, LIVE_STRIDE, LIVE_TOP_K, LIVE_TORCH_THREADS
+)
+from mod03_recorder import detect_landmarks, draw_landmarks, extract_vector_into
+from mod06_landmark_io import VECTOR_SIZE
+from mod07_capture_pipeline import FrameRing
+
+# the features are computed by the preprocessing package, exactly as for training
+sys.path.append(str(Path(__file__).resolve().parents[1] / "preprocessing"))
+from uzslr.preprocess import StreamingPreprocess
+
+LATENCY_STAGES = ("capture_to_landmarks_ms", "features_ms", "logits_ms", "end_to_end_ms")
+
+
+# 1. Classifier
+def load_classifier(path) -> torch.nn.Module:
+    try:
+        model = torch.jit.load(str(path), map_location="cpu")
+    except RuntimeError:   # not TorchScript: a whole module saved with torch.save
+        model = torch.load(str(path), map_location="cpu", weights_only=False)
+    return model.eval()
+
+
+class Recognizer:
+    """
+    Sliding window of the last FRAMES_PER_REP frames + classifier.
+    push() adds a (1662,) frame; predict() returns the top-k of the current window and the stage end times.
+    """
+    def __init__(self, model_path=LIVE_MODEL, top_k: int = LIVE_TOP_K, threads: int = LIVE_TORCH_THREADS):
+        torch.set_num_threads(threads)
+        self.model = load_classifier(model_path)
+        self.stream = StreamingPreprocess(max_len=FRAMES_PER_REP)
+        self.top_k = min(top_k, len(DEFAULT_SIGNS))
+
+        # warm-up (the first TorchScript calls are slow) and a shape check
+        with torch.inference_mode():
+            logits = self.model(torch.zeros((1, FRAMES_PER_REP, self.stream.xy[0].size * 3)))
+        if logits.shape[-1] != len(DEFAULT_SIGNS):
+            raise ValueError(f"Classifier returns {logits.shape[-1]} logits, expected {len(DEFAULT_SIGNS)} (DEFAULT_SIGNS)")
+
+    def push(self, frame: np.ndarray):
+        self.stream.append(frame)
+
+    @property
+    def full(self) -> bool:
+        return len(self.stream) == FRAMES_PER_REP
+
+    @torch.inference_mode()
+    def predict(self) -> tuple[list[tuple[str, float]], float, float]:
+        """-> ([(sign, probability)] best first, t_features, t_logits)"""
+        x = self.stream.window_features()   # (32, 708)
+        t_features = time.perf_counter()
+        logits = self.model(x[None])[0]
+        t_logits = time.perf_counter()
+        probs, idx = torch.softmax(logits.float(), dim=-1).topk(self.top_k)
+        return [(DEFAULT_SIGNS[i], float(p)) for p, i in zip(probs.tolist(), idx.tolist())], t_features, t_logits
+
+
+# 2. Frames
+class LiveFrames:
+    """
+    Iterates (capture time, frame) from `cap`.
+    latest_only=True (camera): a grab thread reads continuously and only the newest frame is
+    handed out, older ones are counted in `dropped`. latest_only=False (video file): every
+    frame, in order, as fast as it is consumed.
+    """
+    def __init__(self, cap, latest_only: bool):
+        self.cap = cap
+        self.latest_only = latest_only
+        self.ring = FrameRing(1)
+        self.stop = threading.Event()
+        self.thread = None
+
+    @property
+    def dropped(self) -> int:
+        return self.ring.dropped
+
+    def _grab(self):
+        try:
+            while not self.stop.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    return
+                self.ring.push((time.perf_counter(), frame))
+        finally:
+            self.ring.close()
+
+    def __iter__(self):
+        if not self.latest_only:
+            while not self.stop.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    return
+                yield time.perf_counter(), frame
+            return
+
+        self.thread = threading.Thread(target=self._grab, name="grab", daemon=True)
+        self.thread.start()
+        while True:
+            closed = self.ring.closed   # read before pop(): a frame pushed just before close() is still returned
+            item = self.ring.pop()
+            if item is None:
+                if closed:
+                    return
+                continue
+            yield item
+
+    def close(self):
+        self.stop.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+
+# 3. Preview
+def draw_predictions(frame, top: list[tuple[str, float]], latency_ms: Optional[float]):
+    for rank, (sign, prob) in enumerate(top):
+        y = 50 + 45 * rank
+        cv2.rectangle(frame, (30, y - 28), (30 + int(300 * prob), y + 8), (0, 200, 0), -1)
+        cv2.putText(frame, f"{sign} {prob:.0%}", (40, y), cv2.FONT_HERSHEY_SIMPLEX, 1,
+                    (255, 255, 255) if rank else (0, 255, 255), 2)
+    if latency_ms is not None:
+        cv2.putText(frame, f"{latency_ms:.0f} ms", (30, frame.shape[0] - 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+    return frame
+
+
+# 4. Loop
+def run_live(cap, recognizer: Recognizer, stride: int = LIVE_STRIDE, headless: bool = False,
+             latest_only: bool = True, max_frames: Optional[int] = None) -> dict:
+    """
+    Recognize until the source ends, `max_frames` frames were processed or 'q' is pressed.
+    Returns the report: predictions (frame index, top-k, latencies) and a latency summary.
+    """
+    row = np.zeros(VECTOR_SIZE, dtype=np.float32)
+    frames = LiveFrames(cap, latest_only)
+    predictions, top, latency, count = [], [], None, 0
+    t_start = time.perf_counter()
+    try:
+        for t_capture, frame in frames:
+            frame_vis, results = detect_landmarks(frame, black_bg=False)
+            extract_vector_into(results, row)
+            t_landmarks = time.perf_counter()
+            recognizer.push(row)
+            count += 1
+
+            if recognizer.full and (count - FRAMES_PER_REP) % stride == 0:
+                top, t_features, t_logits = recognizer.predict()
+                latency = (t_logits - t_capture) * 1e3
+                predictions.append({
+                    "frame": count - 1,
+                    "top": [[sign, round(prob, 4)] for sign, prob in top],
+                    "capture_to_landmarks_ms": (t_landmarks - t_capture) * 1e3,
+                    "features_ms": (t_features - t_landmarks) * 1e3,
+                    "logits_ms": (t_logits - t_features) * 1e3,
+                    "end_to_end_ms": latency,
+                })
+                if headless:
+                    sign, prob = top[0]
+                    print(f"frame {count - 1:>5}: {sign:<20} {prob:>5.0%}   ({latency:.1f} ms)")
+
+            if not headless:
+                frame_vis = cv2.flip(draw_landmarks(frame_vis, results), 1)
+                cv2.imshow("Live recognition - q to quit", draw_predictions(frame_vis, top, latency))
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+            if max_frames and count >= max_frames:
+                break
+    finally:
+        frames.close()
+        if not headless:
+            cv2.destroyAllWindows()
+
+    wall = time.perf_counter() - t_start
+    summary = {}
+    for stage in LATENCY_STAGES:
+        ms = np.array([p[stage] for p in predictions])
+        if ms.size:
+            summary[stage] = {"p50": round(float(np.percentile(ms, 50)), 2),
+                              "p95": round(float(np.percentile(ms, 95)), 2),
+                              "max": round(float(ms.max()), 2)}
+    return {
+        "frames": count,
+        "dropped_frames": frames.dropped,
+        "fps": round(count / wall, 2) if wall > 0 else 0.0,
+        "stride": stride,
+        "latency_ms": summary,
+        "predictions": predictions,
+    }
+
+
+def print_summary(report: dict):
+    print(f"\n{report['frames']} frames at {report['fps']} fps, {report['dropped_frames']} dropped, "
+          f"{len(report['predictions'])} predictions (stride {report['stride']})")
+    for stage, s in report["latency_ms"].items():
+        print(f"  {stage:<25} p50 {s['p50']:>7.2f}  p95 {s['p95']:>7.2f}  max {s['max']:>7.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live sign recognition over a sliding 32-frame window.")
+    parser.add_argument("--model", default=LIVE_MODEL, help="TorchScript / torch.save classifier")
+    parser.add_argument("--source", default=None, help="video file or frame folder instead of the camera")
+    parser.add_argument("--stride", type=int, default=LIVE_STRIDE)
+    parser.add_argument("--top-k", type=int, default=LIVE_TOP_K)
+    parser.add_argument("--headless", action="store_true", help="no window, predictions are printed")
+    parser.add_argument("--realtime", action="store_true", help="--source paced at FPS, stale frames dropped")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--report", default=None, help="write predictions and latencies to this JSON file")
+    args = parser.parse_args()
+
+    recognizer = Recognizer(args.model, args.top_k)
+    if args.source:
+        from mod10_headless import ReplayCapture
+        cap = ReplayCapture(args.source, loop=False, realtime=args.realtime)
+    else:
+        cap = cv2.VideoCapture(VIDEO_DEVICE)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
+        cap.set(cv2.CAP_PROP_FPS, FPS)
+    if not cap.isOpened():
+        print(f"Cannot open {args.source or 'camera'}. Check VIDEO_DEVICE in mod01_config.py")
+        sys.exit(1)
+
+    try:
+        report = run_live(cap, recognizer, args.stride, args.headless,
+                          latest_only=args.source is None or args.realtime, max_frames=args.max_frames)
+    finally:
+        cap.release()
+
+    print_summary(report)
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=1))
+        print(f"Report: {Path(args.report).resolve()}")
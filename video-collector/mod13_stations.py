@@ -0,0 +1,211 @@
+"""
+Multi-station recording: several cameras (booths) recorded at the same time by one workstation.
+
+mod05_main.py records one signer from one camera with one Holistic graph, which leaves most
+CPU cores idle. Here every station of STATIONS (mod01_config.py) runs in its own process:
+
+    station process   own VideoCapture / replayed source, own Holistic (mod03_recorder is
+                      imported per process), own signer -> sign -> rep state, and the usual
+                      recorders writing signerXX/{sign}/... through mod02_storage
+    main process      status table: per station state, sign, rep and the fps read from its camera
+
+All stations write into the same DATA_ROOT, one signer each. manifest.json is shared through a
+lock (mod02_storage.share_manifest), so the reps registered by one station are never lost by
+another one.
+
+Each station goes through its signs in order and records STATION_REPS repetitions of each.
+With a display, every station has its own window: 's' starts the next repetition, 'n' skips to
+the next sign, 'q' stops the station. With --headless the stations record without pause (e.g.
+from video files, to test a workstation).
+
+Run from video-collector/:
+    python mod13_stations.py                                           # STATIONS from mod01_config.py
+    python mod13_stations.py --station 0 signer11 --station 2 signer12 --signs bahor birga --reps 3
+    python mod13_stations.py --station a.mp4 signer98 --station b.mp4 signer99 --headless
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from mod01_config import (
+    FRAME_WIDTH, FRAME_HEIGHT, FPS, FRAMES_PER_REP, PIPELINED_RECORDING,
+    STATIONS, STATION_REPS, STATION_STATUS_SECONDS
+)
+
+
+# 1. Camera of a station
+def open_source(source):
+    """Device index ("0" too), or a stream URL, or a video file / frame folder replayed like a camera."""
+    import cv2
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    if isinstance(source, str) and Path(source).exists():
+        from mod10_headless import ReplayCapture
+        return ReplayCapture(source, loop=True, realtime=True)
+    cap = cv2.VideoCapture(source)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
+    cap.set(cv2.CAP_PROP_FPS, FPS)
+    return cap
+
+
+class StatusCapture:
+    """Wraps a capture and posts the station's fps (frames read per second) to the status queue."""
+    def __init__(self, cap, station: int, status_q, period: float = STATION_STATUS_SECONDS):
+        self.cap, self.station, self.status_q, self.period = cap, station, status_q, period
+        self.frames, self.t0 = 0, time.perf_counter()
+
+    def read(self):
+        ret, frame = self.cap.read()
+        self.frames += 1
+        dt = time.perf_counter() - self.t0
+        if dt >= self.period:
+            self.status_q.put((self.station, {"fps": round(self.frames / dt, 1)}))
+            self.frames, self.t0 = 0, time.perf_counter()
+        return ret, frame
+
+    def __getattr__(self, name):   # isOpened, set, get, release
+        return getattr(self.cap, name)
+
+
+# 2. Station process
+def run_station(station: int, source, signer_id: str, signs: Optional[list[str]], reps: int,
+                headless: bool, pipelined: bool, status_q, manifest_lock):
+    """Record `reps` repetitions of every sign for `signer_id` from `source`, in this process."""
+    def status(**fields):
+        status_q.put((station, fields))
+
+    try:
+        import cv2
+        import mod02_storage
+        mod02_storage.share_manifest(manifest_lock)
+        from mod02_storage import add_signer, count_repetitions, load_sign_list
+        from mod03_recorder import record_one_repetition
+        from mod07_capture_pipeline import record_one_repetition_pipelined
+
+        record = record_one_repetition_pipelined if pipelined else record_one_repetition
+        cap = open_source(source)
+        if not cap.isOpened():
+            status(state=f"error: cannot open {source}")
+            return
+        cap = StatusCapture(cap, station, status_q)
+        window = f"Station {station + 1} ({signer_id})"
+        add_signer(signer_id)
+
+        try:
+            for sign in signs or load_sign_list(signer_id):
+                rep_idx = count_repetitions(signer_id, sign)
+                for n in range(reps):
+                    status(sign=sign, rep=f"{n + 1}/{reps}", state="waiting")
+                    key = ord('s') if headless else _wait_for_start(cap, window, sign, rep_idx)
+                    if key == ord('q'):
+                        status(state="stopped")
+                        return
+                    if key == ord('n'):
+                        break
+                    status(state="recording")
+                    rep_idx = record(cap, signer_id, sign, rep_idx, headless=headless, window=window)
+                    status(recorded=1)
+            status(state="done")
+        finally:
+            cap.release()
+            if not headless:
+                cv2.destroyAllWindows()
+    except KeyboardInterrupt:
+        status(state="stopped")
+    except Exception as e:
+        status(state=f"error: {type(e).__name__}: {e}")
+
+
+def _wait_for_start(cap, window: str, sign: str, rep_idx: int) -> int:
+    """Preview until 's' (start), 'n' (next sign) or 'q' (stop station) is pressed in `window`."""
+    import cv2
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            return ord('q')
+        frame = cv2.flip(frame, 1)
+        cv2.putText(frame, "s: start  n: next sign  q: stop", (30, 110),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 3)
+        cv2.putText(frame, f"{window} | Sign: {sign} | Next rep: {rep_idx + 1}",
+                    (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        cv2.imshow(window, frame)
+        key = cv2.waitKey(10) & 0xFF
+        if key in (ord('s'), ord('n'), ord('q')):
+            return key
+
+
+# 3. Main process: start the stations, show their status
+def print_status(stations: list[dict], rows: list[dict], clear: bool):
+    if clear:
+        os.system('cls' if os.name == 'nt' else 'clear')
+    print(f"{'station':<8} {'source':<24} {'signer':<10} {'sign':<20} {'rep':>6} {'fps':>6} {'recorded':>9}  state")
+    for i, (station, row) in enumerate(zip(stations, rows)):
+        print(f"{i + 1:<8} {str(station['source'])[-24:]:<24} {station['signer']:<10} {row.get('sign', ''):<20} "
+              f"{row.get('rep', ''):>6} {row.get('fps', ''):>6} {row.get('recorded', 0):>9}  {row.get('state', 'starting')}")
+
+
+def run_stations(stations: list[dict], signs: Optional[list[str]] = None, reps: int = STATION_REPS,
+                 headless: bool = False, pipelined: bool = PIPELINED_RECORDING) -> list[dict]:
+    """Record all stations concurrently; returns the last status row of every station."""
+    signers = [s["signer"] for s in stations]
+    if len(set(signers)) != len(signers):
+        raise ValueError(f"Every station needs its own signer, got {signers}")
+
+    ctx = multiprocessing.get_context("spawn")   # a fresh MediaPipe graph per station process
+    status_q, manifest_lock = ctx.Queue(), ctx.Lock()
+    procs = [ctx.Process(target=run_station, name=f"station-{i + 1}",
+                         args=(i, s["source"], s["signer"], signs, reps, headless, pipelined,
+                               status_q, manifest_lock))
+             for i, s in enumerate(stations)]
+    for p in procs:
+        p.start()
+
+    rows = [{} for _ in stations]
+    next_print = time.perf_counter()
+    try:
+        while any(p.is_alive() for p in procs) or not status_q.empty():
+            try:
+                station, fields = status_q.get(timeout=0.2)
+                if "recorded" in fields:
+                    fields["recorded"] += rows[station].get("recorded", 0)
+                rows[station].update(fields)
+            except queue.Empty:
+                pass
+            if time.perf_counter() >= next_print:
+                print_status(stations, rows, clear=not headless)
+                next_print = time.perf_counter() + STATION_STATUS_SECONDS
+    except KeyboardInterrupt:
+        print("\nStopping all stations...")
+        for p in procs:
+            p.terminate()
+    for p in procs:
+        p.join()
+    print_status(stations, rows, clear=False)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record several stations (cameras) at the same time.")
+    parser.add_argument("--station", nargs=2, action="append", metavar=("SOURCE", "SIGNER"),
+                        help="camera index / stream URL / video file and its signer (default: STATIONS)")
+    parser.add_argument("--signs", nargs="+", default=None, help="signs to record (default: the whole sign list)")
+    parser.add_argument("--reps", type=int, default=STATION_REPS, help="repetitions per sign")
+    parser.add_argument("--headless", action="store_true", help="no windows, record without waiting for 's'")
+    parser.add_argument("--sync", action="store_true", help="use record_one_repetition instead of the pipelined recorder")
+    args = parser.parse_args()
+
+    stations = [{"source": src, "signer": signer} for src, signer in args.station] if args.station else STATIONS
+    for s in stations:
+        if not s["signer"].startswith("signer") or not s["signer"][6:].isdigit():
+            print(f"Invalid signer {s['signer']!r}: must be signerXX where XX is a number.")
+            sys.exit(1)
+
+    rows = run_stations(stations, args.signs, args.reps, args.headless, pipelined=not args.sync)
+    sys.exit(1 if any(r.get("state", "").startswith("error") for r in rows) else 0)
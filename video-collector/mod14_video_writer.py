@@ -0,0 +1,177 @@
+"""
+Video encoding of the recorders, on a background thread.
+
+cv2.VideoWriter.write() encodes inside the capture loop, and mp4v files of raw 1280x720 frames
+are large. AsyncVideoWriter is a drop-in replacement for cv2.VideoWriter (write / release /
+isOpened) used by both recorders:
+
+    capture loop     write(frame)  -> bounded queue (VIDEO_QUEUE_SIZE frames), returns at once
+    encoder thread   queue -> backend.write(frame)  [+ resized copy -> proxy backend]
+
+Backends (VIDEO_ENCODER in mod01_config.py):
+    "cv2"      cv2.VideoWriter with VIDEO_FOURCC, as before
+    "ffmpeg"   an ffmpeg process fed raw BGR frames through a pipe, encoding with VIDEO_CODEC,
+               VIDEO_CRF and VIDEO_PRESET (e.g. libx264: several times smaller than mp4v)
+
+With VIDEO_PROXY_WIDTH set, a reduced-resolution video_proxy.mp4 is written next to video.mp4
+for quick review. release() waits for the queue to drain and returns the report saved as
+videos/rep-N/encode.json: encode time, time the recorder waited at the end, file sizes.
+
+Frames are encoded after write() returns: they must not be modified afterwards (draw the
+preview on a copy).
+"""
+
+import contextlib
+import queue
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from mod01_config import (
+    FPS, FRAME_WIDTH, FRAME_HEIGHT, VIDEO_ENCODER, VIDEO_FOURCC, VIDEO_CODEC, VIDEO_CRF,
+    VIDEO_PRESET, VIDEO_QUEUE_SIZE, VIDEO_PROXY_WIDTH, FFMPEG_BIN
+)
+
+ENCODE_INFO = "encode.json"
+PROXY_FILE = "video_proxy.mp4"
+
+
+# 1. Backends
+class Cv2Backend:
+    def __init__(self, path: Path, fps: float, size: tuple[int, int]):
+        self.writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*VIDEO_FOURCC), fps, size)
+
+    def isOpened(self) -> bool:
+        return self.writer.isOpened()
+
+    def write(self, frame: np.ndarray):
+        self.writer.write(frame)
+
+    def close(self):
+        self.writer.release()
+
+
+class FfmpegBackend:
+    def __init__(self, path: Path, fps: float, size: tuple[int, int]):
+        cmd = [FFMPEG_BIN, "-y", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{size[0]}x{size[1]}", "-r", str(fps), "-i", "-",
+               "-c:v", VIDEO_CODEC, "-crf", str(VIDEO_CRF), "-preset", VIDEO_PRESET, "-pix_fmt", "yuv420p",
+               str(path)]
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    def isOpened(self) -> bool:
+        return self.proc.poll() is None
+
+    def write(self, frame: np.ndarray):
+        try:
+            self.proc.stdin.write(np.ascontiguousarray(frame).data)
+        except BrokenPipeError:
+            self.close()
+
+    def close(self):
+        if not self.proc.stdin.closed:
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with {self.proc.returncode}: "
+                               f"{self.proc.stderr.read().decode(errors='replace').strip()}")
+
+
+BACKENDS = {"cv2": Cv2Backend, "ffmpeg": FfmpegBackend}
+
+
+# 2. Writer
+class AsyncVideoWriter:
+    """cv2.VideoWriter-like writer; the frames are encoded by a background thread."""
+    def __init__(self, path, fps: float = FPS, size: tuple[int, int] = (FRAME_WIDTH, FRAME_HEIGHT),
+                 backend: str = VIDEO_ENCODER, proxy_width=VIDEO_PROXY_WIDTH, queue_size: int = VIDEO_QUEUE_SIZE):
+        self.path = Path(path)
+        self.backend_name = backend
+        self.encoder = BACKENDS[backend](self.path, fps, size)
+        self.proxy, self.proxy_size = None, None
+        if proxy_width and proxy_width < size[0]:
+            self.proxy_size = (proxy_width, round(size[1] * proxy_width / size[0]) // 2 * 2)   # yuv420p needs even sizes
+            self.proxy = BACKENDS[backend](self.path.with_name(PROXY_FILE), fps, self.proxy_size)
+
+        self.q = queue.Queue(maxsize=queue_size)
+        self.frames, self.max_queued, self.encode_seconds = 0, 0, 0.0
+        self.error = None
+        self.report = None
+        self.thread = threading.Thread(target=self._work, name="encoder", daemon=True)
+        self.thread.start()
+
+    def isOpened(self) -> bool:
+        return self.encoder.isOpened()
+
+    def write(self, frame: np.ndarray):
+        if self.error is not None:
+            with contextlib.suppress(Exception):   # close the files, the caller gets the encoder error
+                self.release()
+            raise self.error
+        self.q.put(frame)
+        self.frames += 1
+        self.max_queued = max(self.max_queued, self.q.qsize())
+
+    def _work(self):
+        while True:
+            frame = self.q.get()
+            if frame is None:
+                return
+            if self.error is not None:
+                continue   # keep draining, so write() never blocks on a dead encoder
+            try:
+                t = time.perf_counter()
+                self.encoder.write(frame)
+                if self.proxy is not None:
+                    self.proxy.write(cv2.resize(frame, self.proxy_size, interpolation=cv2.INTER_AREA))
+                self.encode_seconds += time.perf_counter() - t
+            except Exception as e:
+                self.error = e
+
+    def abort(self):
+        """release() for error paths: an encoder error is printed, not raised, so it never
+        replaces the exception being handled."""
+        try:
+            self.release()
+        except Exception as e:
+            print(f"Video encoder error while closing {self.path}: {type(e).__name__}: {e}")
+
+    def release(self) -> dict:
+        """Encode what is queued, close the files and return the report (once)."""
+        if self.report is not None:
+            return self.report
+        t = time.perf_counter()
+        self.q.put(None)
+        self.thread.join()
+        t_close = time.perf_counter()
+        for encoder in (self.encoder, self.proxy):
+            if encoder is not None:
+                try:
+                    encoder.close()
+                except Exception as e:
+                    self.error = self.error or e
+        done = time.perf_counter()
+        self.encode_seconds += done - t_close   # ffmpeg finishing the file
+
+        proxy_path = self.path.with_name(PROXY_FILE)
+        self.report = {
+            "backend": self.backend_name,
+            "codec": VIDEO_CODEC if self.backend_name == "ffmpeg" else VIDEO_FOURCC,
+            "crf": VIDEO_CRF if self.backend_name == "ffmpeg" else None,
+            "preset": VIDEO_PRESET if self.backend_name == "ffmpeg" else None,
+            "frames": self.frames,
+            "encode_seconds": round(self.encode_seconds, 4),
+            "flush_seconds": round(done - t, 4),    # how long the recorder waited after the last frame
+            "max_queued": self.max_queued,
+            "bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "proxy_bytes": proxy_path.stat().st_size if self.proxy is not None and proxy_path.exists() else None,
+        }
+        if self.error is not None:
+            raise self.error
+        return self.report